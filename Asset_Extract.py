@@ -1,9 +1,14 @@
 import os
+import io
 import argparse
 import errno
 import json
 from UnityPy import AssetsManager
 
+from loader.AssetFilter import WantedObjects
+from loader.AssetStore import AssetStore, detach
+from loader.TextureEncoder import TextureEncoder, add_texture_arguments, texture_encoder_from_args
+
 def check_target_path(target):
     if not os.path.exists(os.path.dirname(target)):
         try:
@@ -40,15 +45,24 @@ def write_json(f, data):
 
 write = write_json
 mono_ext = '.json'
+texture_encoder = TextureEncoder()
+asset_store = None
+
+def write_output(dest, write_func, data):
+    if asset_store is None:
+        detach(dest)
+        with open(dest, 'w', encoding='utf8', newline='') as f:
+            write_func(f, data)
+    else:
+        buffer = io.StringIO()
+        write_func(buffer, data)
+        asset_store.put(dest, buffer.getvalue().encode('utf8'))
 
 def unpack_Texture2D(data, dest):
     print('Texture2D', dest, flush=True)
-    dest, _ = os.path.splitext(dest)
-    dest = dest + '.png'
     check_target_path(dest)
 
-    img = data.image
-    img.save(dest)
+    texture_encoder.save(data.image, dest)
 
 def unpack_MonoBehaviour(data, dest):
     print('MonoBehaviour', dest, flush=True)
@@ -56,8 +70,7 @@ def unpack_MonoBehaviour(data, dest):
     dest = dest + mono_ext
     check_target_path(dest)
 
-    with open(dest, 'w', encoding='utf8', newline='') as f:
-        write(f, data)
+    write_output(dest, write, data)
 
 def unpack_GameObject(data, destination_folder):
     dest = os.path.join(destination_folder, os.path.splitext(data.name)[0])
@@ -79,13 +92,15 @@ def unpack_GameObject(data, destination_folder):
     if len(mono_list) > 0:
         dest += mono_ext
         check_target_path(dest)
-        with open(dest, 'w', encoding='utf8', newline='') as f:
-            if mono_ext == '.json':
-                json.dump(mono_list, f, indent=2)
-            else:
-                for m in mono_list:
-                    f.write(m)
-                    f.write('\n')
+        write_output(dest, write_mono_list, mono_list)
+
+def write_mono_list(f, mono_list):
+    if mono_ext == '.json':
+        json.dump(mono_list, f, indent=2)
+    else:
+        for m in mono_list:
+            f.write(m)
+            f.write('\n')
 
 unpack_dict = {
     'Texture2D': unpack_Texture2D, 
@@ -95,7 +110,7 @@ unpack_dict = {
     'AnimatorOverrideController': unpack_MonoBehaviour
 }
 
-def unpack_asset(file_path, destination_folder, root=None, source_folder=None):
+def unpack_asset(file_path, destination_folder, root=None, source_folder=None, wanted=None):
     # load that file via AssetsManager
     am = AssetsManager(file_path)
 
@@ -106,8 +121,13 @@ def unpack_asset(file_path, destination_folder, root=None, source_folder=None):
             # print(obj.type, obj.container)
             obj_type_str = str(obj.type)
             if obj_type_str in unpack_dict:
+                # skip unwanted objects on their type and container, before paying for the read
+                if wanted and not wanted.before_read(obj):
+                    continue
                 # parse the object data
                 data = obj.read()
+                if wanted and not wanted.after_read(obj, data):
+                    continue
 
                 # create destination path
                 if root and source_folder:
@@ -124,13 +144,13 @@ def unpack_asset(file_path, destination_folder, root=None, source_folder=None):
                     unpack_dict[obj_type_str](data, dest)
                 
 
-def unpack_all_assets(source_folder, destination_folder):
+def unpack_all_assets(source_folder, destination_folder, wanted=None):
     # iterate over all files in source folder
     for root, _, files in os.walk(source_folder):
         for file_name in files:
             # generate file_path
             file_path = os.path.join(root, file_name)
-            unpack_asset(file_path, destination_folder, root=root, source_folder=source_folder)
+            unpack_asset(file_path, destination_folder, root=root, source_folder=source_folder, wanted=wanted)
     
 
 if __name__ == '__main__':
@@ -138,11 +158,21 @@ if __name__ == '__main__':
     parser.add_argument('-i', type=str, help='input dir', default='./download')
     parser.add_argument('-o', type=str, help='output dir', default='./extract')
     parser.add_argument('-mode', type=str, help='export format, default json, can also use mono', default='json')
+    parser.add_argument('-w', type=str, help='wanted objects spec, json list of {type, container glob, name regex}', default=None)
+    parser.add_argument('-store', type=str, help='dedup outputs into this content addressed store dir, hardlinked into the output dir', default=None)
+    add_texture_arguments(parser)
     args = parser.parse_args()
+    asset_store = AssetStore(args.store) if args.store else None
+    texture_encoder = texture_encoder_from_args(args, store=asset_store)
+    wanted = WantedObjects.load(args.w) if args.w else None
     if args.mode == 'mono':
         write = write_mono
         mono_ext = '.mono'
     if os.path.isdir(args.i):
-        unpack_all_assets(args.i, args.o)
+        unpack_all_assets(args.i, args.o, wanted=wanted)
     else:
-        unpack_asset(args.i, args.o)
\ No newline at end of file
+        unpack_asset(args.i, args.o, wanted=wanted)
+    texture_encoder.close()
+    if asset_store is not None:
+        asset_store.close()
+        print(asset_store.summary())
\ No newline at end of file
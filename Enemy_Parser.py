@@ -1,11 +1,14 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-from collections import OrderedDict, defaultdict
+from collections import defaultdict
+from functools import lru_cache
 import argparse
-import csv
 import os
 import re
 
+from Table_Cache import TABLES
+from loader.TextLabel import load_csv_labels
+
 BOOK_ID_NAME_OVERRIDES = {
     '320000801': (lambda data: '{} ({})'.format(data['Name'], data['ElementalType']))
 }
@@ -113,81 +116,202 @@ ELEMENTAL_TYPES = {
     '99': '', # None
 }
 
+# Output fields in order, taken from EnemyParam (ep) or EnemyData (ed) columns,
+# or computed per enemy in build_enemies (None)
+ENEMY_FIELDS = [
+    ('Id', 'ep', '_Id'),
+    ('DataId', 'ep', '_DataId'),
+    ('Name', None, None),
+    ('RareStayTime', 'ep', '_RareStayTime'),
+    ('HP', 'ep', '_HP'),
+    ('Atk', 'ep', '_Atk'),
+    ('Def', 'ep', '_Def'),
+    ('Overwhelm', 'ep', '_Overwhelm'),
+    ('BaseOD', 'ep', '_BaseOD'),
+    ('BaseBreak', 'ep', '_BaseBreak'),
+    ('CounterRate', 'ep', '_CounterRate'),
+    ('BarrierRate', 'ep', '_BarrierRate'),
+    ('GetupActionRate', 'ep', '_GetupActionRate'),
+    ('Poison', 'ep', '_RegistAbnormalRate01'),
+    ('Burn', 'ep', '_RegistAbnormalRate02'),
+    ('Freeze', 'ep', '_RegistAbnormalRate03'),
+    ('Paralysis', 'ep', '_RegistAbnormalRate04'),
+    ('Blind', 'ep', '_RegistAbnormalRate05'),
+    ('Stun', 'ep', '_RegistAbnormalRate06'),
+    ('Bog', 'ep', '_RegistAbnormalRate07'),
+    ('Sleep', 'ep', '_RegistAbnormalRate08'),
+    ('Curse', 'ep', '_RegistAbnormalRate09'),
+    ('Frostbite', 'ep', '_RegistAbnormalRate10'),
+    ('PartsA', 'ep', '_PartsA'),
+    ('PartsB', 'ep', '_PartsB'),
+    ('PartsC', 'ep', '_PartsC'),
+    ('PartsD', 'ep', '_PartsD'),
+    ('PartsNode', 'ep', '_PartsNode'),
+    # ('CrashedHPRate', 'ep', '_CrashedHPRate'), # Currently unused
+    ('MissionType', None, None),
+    ('MissionDifficulty', None, None), # Currently unused
+    ('Tribe', None, None),
+    ('Weapon', None, None),
+    ('ElementalType', None, None),
+    ('BreakDuration', 'ed', '_BreakDuration'),
+    ('MoveSpeed', 'ed', '_MoveSpeed'),
+    ('TurnSpeed', 'ed', '_TurnSpeed'),
+    ('SuperArmor', 'ed', '_SuperArmor'),
+    ('BreakAtkRate', 'ed', '_BreakAtkRate'),
+    ('BreakDefRate', 'ed', '_BreakDefRate'),
+    ('ODAtkRate', 'ed', '_ObAtkRate'),
+    ('ODDefRate', 'ed', '_ObDefRate'),
+    ('Ability01', 'ep', '_Ability01'),
+    ('Ability02', 'ep', '_Ability02'),
+    ('Ability03', 'ep', '_Ability03'),
+    ('Ability04', 'ep', '_Ability04'),
+]
+ENEMY_FIELD_NAMES = [name for name, _, _ in ENEMY_FIELDS]
+
 class Enemy:
-    def __init__(self, enemy_param, enemy_data, enemy_list, weapon_data):
-        ep = enemy_param
-        ed = enemy_data[ep['_DataId']]
-        el = enemy_list[ed['_BookId']]
-
-        data = OrderedDict()
-        data['Id'] = ep['_Id']
-        data['DataId'] = ep['_DataId']
-        data['Name'] = get_label(el['_Name']) or DATA_ID_NAME_OVERRIDES.get(data['DataId'], '')
-        data['RareStayTime'] = ep['_RareStayTime']
-        data['HP'] = ep['_HP']
-        data['Atk'] = ep['_Atk']
-        data['Def'] = ep['_Def']
-        data['Overwhelm'] = ep['_Overwhelm']
-        data['BaseOD'] = ep['_BaseOD']
-        data['BaseBreak'] = ep['_BaseBreak']
-        data['CounterRate'] = ep['_CounterRate']
-        data['BarrierRate'] = ep['_BarrierRate']
-        data['GetupActionRate'] = ep['_GetupActionRate']
-        data['Poison'] = ep['_RegistAbnormalRate01']
-        data['Burn'] = ep['_RegistAbnormalRate02']
-        data['Freeze'] = ep['_RegistAbnormalRate03']
-        data['Paralysis'] = ep['_RegistAbnormalRate04']
-        data['Blind'] = ep['_RegistAbnormalRate05']
-        data['Stun'] = ep['_RegistAbnormalRate06']
-        data['Bog'] = ep['_RegistAbnormalRate07']
-        data['Sleep'] = ep['_RegistAbnormalRate08']
-        data['Curse'] = ep['_RegistAbnormalRate09']
-        data['Frostbite'] = ep['_RegistAbnormalRate10']
-        data['PartsA'] = ep['_PartsA']
-        data['PartsB'] = ep['_PartsB']
-        data['PartsC'] = ep['_PartsC']
-        data['PartsD'] = ep['_PartsD']
-        data['PartsNode'] = ep['_PartsNode']
-        # data['CrashedHPRate'] = ep['_CrashedHPRate'] # Currently unused
-        data['MissionType'] = get_enemy_quest_name(ep['_ParamGroupName'])
-        data['MissionDifficulty'] = ''    # Currently unused
-        data['Tribe'] = TRIBES.get(el['_TribeType'], el['_TribeType'])
-        data['Weapon'] = get_label(weapon_data.get(ed['_WeaponId'], ''))
-        data['ElementalType'] = ELEMENTAL_TYPES.get(ed['_ElementalType'])
-        data['BreakDuration'] = ed['_BreakDuration']
-        data['MoveSpeed'] = ed['_MoveSpeed']
-        data['TurnSpeed'] = ed['_TurnSpeed']
-        data['SuperArmor'] = ed['_SuperArmor']
-        data['BreakAtkRate'] = ed['_BreakAtkRate']
-        data['BreakDefRate'] = ed['_BreakDefRate']
-        data['ODAtkRate'] = ed['_ObAtkRate']
-        data['ODDefRate'] = ed['_ObDefRate']
-        data['Ability01'] = ep['_Ability01']
-        data['Ability02'] = ep['_Ability02']
-        data['Ability03'] = ep['_Ability03']
-        data['Ability04'] = ep['_Ability04']
+    def __init__(self, data, group_name=None):
         self.data = data
-
-        # Name overrides that take precedence over a known name
-        if ed['_BookId'] in BOOK_ID_NAME_OVERRIDES:
-            data['Name'] = BOOK_ID_NAME_OVERRIDES[ed['_BookId']](data)
+        self.group_name = group_name
 
     def __repr__(self):
         return ''.join([
                 '{{EnemyData|',
-                '|'.join('='.join(item) for item in self.data.items()),
+                '|'.join(map('='.join, self.data.items())),
                 '}}',
             ])
 
+def row_index(table, key='_Id'):
+    # row number by key, keeping the csv_to_dict order and duplicate handling
+    index = {}
+    for idx, value in enumerate(table.column(key)):
+        if value != '0':
+            index[value] = idx
+    return index
+
+def build_enemies(enemy_param, enemy_data, enemy_list, weapon_data):
+    """Join the EnemyParam, EnemyData and EnemyList tables column by column into Enemy records."""
+    param_rows = list(row_index(enemy_param).values())
+    data_index = row_index(enemy_data)
+    list_index = row_index(enemy_list)
+
+    def take(table, key, rows):
+        column = table.column(key)
+        return [column[i] for i in rows]
+
+    data_ids = take(enemy_param, '_DataId', param_rows)
+    data_rows = [data_index[data_id] for data_id in data_ids]
+    book_ids = take(enemy_data, '_BookId', data_rows)
+    list_rows = [list_index[book_id] for book_id in book_ids]
+
+    group_names = take(enemy_param, '_ParamGroupName', param_rows)
+    list_names = take(enemy_list, '_Name', list_rows)
+    tribe_types = take(enemy_list, '_TribeType', list_rows)
+    computed = {
+        'Name': [get_label(name) or DATA_ID_NAME_OVERRIDES.get(data_id, '')
+                 for name, data_id in zip(list_names, data_ids)],
+        'MissionType': [get_enemy_quest_name(group_name) for group_name in group_names],
+        'MissionDifficulty': [''] * len(param_rows),
+        'Tribe': [TRIBES.get(tribe, tribe) for tribe in tribe_types],
+        'Weapon': [get_label(weapon_data.get(weapon_id, ''))
+                   for weapon_id in take(enemy_data, '_WeaponId', data_rows)],
+        'ElementalType': [ELEMENTAL_TYPES.get(element)
+                          for element in take(enemy_data, '_ElementalType', data_rows)],
+    }
+    sources = {'ep': (enemy_param, param_rows), 'ed': (enemy_data, data_rows)}
+    columns = []
+    for name, source, key in ENEMY_FIELDS:
+        if source is None:
+            columns.append(computed[name])
+        else:
+            table, rows = sources[source]
+            columns.append(take(table, key, rows))
+
+    enemies = []
+    for book_id, group_name, values in zip(book_ids, group_names, zip(*columns)):
+        data = dict(zip(ENEMY_FIELD_NAMES, values))
+        # Name overrides that take precedence over a known name
+        if book_id in BOOK_ID_NAME_OVERRIDES:
+            data['Name'] = BOOK_ID_NAME_OVERRIDES[book_id](data)
+        enemies.append(Enemy(data, group_name))
+    return enemies
+
 def get_label(label, default=''):
     return TEXT_LABEL.get(label, default) or default
 
-def get_enemy_quest_name(group_name):
-    for pattern in QUEST_NAME_REGEX:
-        match = pattern.match(group_name)
+class QuestNameResolver:
+    """Maps group names to quest names through an ordered set of patterns, then a fallback.
+
+    The patterns are tried as one alternation in order, each wrapped in a named group so the
+    match tells which handler applies and where its own groups start. Results are kept in a
+    bounded cache since many enemy params share a group name.
+    """
+    def __init__(self, patterns, fallback=None, maxsize=4096):
+        alternatives = []
+        handlers = {}
+        for idx, (pattern, func) in enumerate(patterns.items()):
+            name = 'p{}'.format(idx)
+            alternatives.append('(?P<{}>{})'.format(name, pattern.pattern))
+            handlers[name] = (pattern.groups, func)
+        self.pattern = re.compile('|'.join(alternatives))
+        self.handlers = {name: (self.pattern.groupindex[name], count, func) for name, (count, func) in handlers.items()}
+        self.fallback = fallback or (lambda name: '')
+        self.resolve = lru_cache(maxsize=maxsize)(self.match)
+
+    def match(self, name):
+        match = self.pattern.match(name)
         if match:
-            return QUEST_NAME_REGEX[pattern](*match.groups())
-    return MANUAL_QUEST_MAP.get(group_name, '')
+            start, count, func = self.handlers[match.lastgroup]
+            return func(*[match.group(idx) for idx in range(start + 1, start + count + 1)])
+        return self.fallback(name)
+
+    def matches_pattern(self, name):
+        return self.pattern.match(name) is not None
+
+    def stats(self):
+        info = self.resolve.cache_info()
+        lookups = info.hits + info.misses
+        return {
+            'hits': info.hits,
+            'misses': info.misses,
+            'hit_rate': info.hits / lookups if lookups else 0.0,
+            'size': info.currsize,
+            'maxsize': info.maxsize,
+        }
+
+    def clear(self):
+        self.resolve.cache_clear()
+
+QUEST_NAMES = QuestNameResolver(QUEST_NAME_REGEX, fallback=lambda group_name: MANUAL_QUEST_MAP.get(group_name, ''))
+
+def get_enemy_quest_name(group_name):
+    return QUEST_NAMES.resolve(group_name)
+
+def read_manual_quest_map(path, resolver=QUEST_NAMES):
+    """Load ManualMapRelations.txt, reporting entries that are malformed or can never be used."""
+    table = TABLES.get(path, tabs=True)
+    if len(table.fieldnames) != 2:
+        raise ValueError('{}: expected group name and quest name columns, found {}'.format(path, table.fieldnames))
+    id_key, name_key = table.fieldnames
+    problems = []
+    quest_map = {}
+    for entry, row in enumerate(table.rows(), start=1):
+        group_name, quest_name = row[id_key], row[name_key]
+        if None in row:
+            problems.append('row {}: extra columns {}'.format(entry, row[None]))
+        if not group_name or not quest_name:
+            problems.append('row {}: missing group name or quest name'.format(entry))
+            continue
+        if group_name != group_name.strip() or quest_name != quest_name.strip():
+            problems.append('row {}: surrounding whitespace in {}'.format(entry, group_name))
+        if group_name in quest_map and quest_map[group_name] != quest_name:
+            problems.append('row {}: {} remapped from {} to {}'.format(entry, group_name, quest_map[group_name], quest_name))
+        if resolver.matches_pattern(group_name):
+            problems.append('row {}: {} is already named by a pattern, the mapping is never used'.format(entry, group_name))
+        if group_name != '0':
+            quest_map[group_name] = quest_name
+    for problem in problems:
+        print('{}: {}'.format(path, problem))
+    return quest_map
 
 def get_rare_enemy_quest_name(x, y):
     x = int(x)
@@ -197,52 +321,42 @@ def get_rare_enemy_quest_name(x, y):
         return RARE_ENEMY_QUESTS[y] + str(x)
 
 def csv_to_dict(path, index=None, value_key=None, tabs=False):
-    with open(path, 'r', newline='', encoding='utf-8') as csvfile:
-        if tabs:
-            reader = csv.DictReader(csvfile, dialect='excel-tab')
-        else:
-            reader = csv.DictReader(csvfile)
-        keys = reader.fieldnames
-
-        if not index:
-            index = keys[0] # get first key as index
-        if not value_key and len(keys) == 2:
-            # If not otherwise specified, load 2 column files as dict[string] = string
-            value_key = keys[1] # get second key
-        if value_key:
-            return {row[index]: row[value_key] for row in reader if row[index] != '0'}
-        else:
-            # load >2 column files as a dict[string] = OrderedDict
-            return {row[index]: row for row in reader if row[index] != '0'}
+    return TABLES.get(path, tabs=tabs).as_index(index=index, value_key=value_key)
+
+# the tables parse reads through TABLES, Process_DL_Data schedules it with the parsers that read them too
+INPUT_TABLES = ('EnemyParam', 'EnemyData', 'EnemyList', 'WeaponData')
 
 def parse(input_dir, output_dir='EnemyData',
           manual_map_file_path='./ManualMapRelations.txt', text_label_dict=None):
     global MANUAL_QUEST_MAP, TEXT_LABEL 
-    enemy_param = csv_to_dict(os.path.join(input_dir, 'EnemyParam.txt'), index='_Id')
-    enemy_data = csv_to_dict(os.path.join(input_dir, 'EnemyData.txt'), index='_Id')
-    enemy_list = csv_to_dict(os.path.join(input_dir, 'EnemyList.txt'), index='_Id')
+    enemy_param = TABLES.get(os.path.join(input_dir, 'EnemyParam.txt'))
+    enemy_data = TABLES.get(os.path.join(input_dir, 'EnemyData.txt'))
+    enemy_list = TABLES.get(os.path.join(input_dir, 'EnemyList.txt'))
     weapon_data = csv_to_dict(os.path.join(input_dir, 'WeaponData.txt'), index='_Id', value_key='_Name')
-    MANUAL_QUEST_MAP = csv_to_dict(manual_map_file_path, tabs=True)
+    MANUAL_QUEST_MAP = read_manual_quest_map(manual_map_file_path)
     if text_label_dict:
         TEXT_LABEL = text_label_dict
     else:
-        TEXT_LABEL = csv_to_dict(os.path.join(input_dir, 'TextLabel.txt'), tabs=True)
+        TEXT_LABEL = load_csv_labels(os.path.join(input_dir, 'TextLabel.txt'), tabs=True)
+    QUEST_NAMES.clear()
 
     tribes = defaultdict(list)
     nameless = []
     questless = []
-    for enemy_param in enemy_param.values():
-        enemy = Enemy(enemy_param, enemy_data, enemy_list, weapon_data)
+    for enemy in build_enemies(enemy_param, enemy_data, enemy_list, weapon_data):
         add = True
         if not enemy.data['Name']:
             nameless.append(enemy)
             add = False
         if not enemy.data['MissionType']:
-            questless.append('{}: {}'.format(enemy_param['_ParamGroupName'], enemy))
+            questless.append('{}: {}'.format(enemy.group_name, enemy))
             add = False
         if add:
             tribes[enemy.data['Tribe']].append(enemy)
 
+    stats = QUEST_NAMES.stats()
+    print('Quest names: {} groups resolved, {:.1%} of lookups cached'.format(stats['misses'], stats['hit_rate']))
+
     os.makedirs(output_dir, exist_ok=True)
 
     for tribe, enemies in tribes.items():
@@ -2,11 +2,21 @@ import os
 import argparse
 
 from loader.AssetExtractor import Extractor
+from loader.AssetStore import AssetStore
 from loader.Database import DBManager
+from loader.Profile import add_profile_argument
 
 from loader.Master import load_master, load_json
 from loader.Actions import load_actions
 from loader.Motion import load_character_motion, load_dragon_motion
+from loader.FrameData import load_frame_data
+
+from exporter.Shared import ActionCondition, AbilityData, SkillData
+from exporter.Adventurers import CharaData, ExAbilityData
+from exporter.Dragons import DragonData
+from exporter.Weapons import WeaponData
+from exporter.Wyrmprints import AmuletData
+from exporter.Enemy import EnemyList, EnemyAbility, EnemyAction
 
 EN = 'en'
 JP = 'jp'
@@ -30,22 +40,42 @@ LABEL_PATTERNS_JP = {
     r'characters/motion/animationclips$': 'characters_motion',
     r'^dragon/motion': 'dragon_motion',
 }
+# objects each extract is loaded from, anything else in those bundles is skipped before it is read
+WANTED_OBJECTS = {
+    'master': [{'type': 'MonoBehaviour'}],
+    'characters_motion': [{'type': 'AnimationClip'}],
+    'dragon_motion': [{'type': 'AnimationClip'}],
+}
+# views whose labeled fields go in the reverse index of label search
+LABELED_VIEWS = (CharaData, DragonData, WeaponData, AmuletData, AbilityData, ExAbilityData, SkillData,
+                 ActionCondition, EnemyList, EnemyAbility, EnemyAction)
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description='Import data to database.')
     parser.add_argument('--do_prep', help='Do downloading and extracting of assets', action='store_true')
+    parser.add_argument('--store', type=str, help='with --do_prep, dedup extracted files into this store dir', default=None)
     parser.add_argument('-o', type=str, help='output file', default='dl.sqlite')
+    parser.add_argument('--fts', help='Build full text search over the labels, see DBManager.search_labels', action='store_true')
+    parser.add_argument('--wal', help='Switch the output to WAL so a Query_Server can read it during the load', action='store_true')
+    add_profile_argument(parser)
     args = parser.parse_args()
 
     if args.do_prep:
-        ex = Extractor(MANIFEST_JP, MANIFEST_EN, stdout_log=True)
-        ex.download_and_extract_all(LABEL_PATTERNS_JP, region='jp')
-        ex.download_and_extract_all(LABEL_PATTERNS_EN, region='en')
+        store = AssetStore(args.store) if args.store else None
+        ex = Extractor(MANIFEST_JP, MANIFEST_EN, stdout_log=True, store=store)
+        ex.download_and_extract_all(LABEL_PATTERNS_JP, region='jp', wanted=WANTED_OBJECTS)
+        ex.download_and_extract_all(LABEL_PATTERNS_EN, region='en', wanted=WANTED_OBJECTS)
     in_dir = '_extract'
 
-    db = DBManager(args.o)
+    db = DBManager(args.o, profile=args.profile)
+    if args.wal:
+        db.use_wal()
     load_master(db, os.path.join(in_dir, EN, MASTER))
     load_json(db, os.path.join(in_dir, JP, MASTER, TEXT_LABEL), 'TextLabelJP')
     load_actions(db, os.path.join(in_dir, JP, ACTIONS))
     load_character_motion(db, os.path.join(in_dir, JP, CHARACTERS_MOTION))
-    load_dragon_motion(db, os.path.join(in_dir, JP, DRAGON_MOTION))
\ No newline at end of file
+    load_dragon_motion(db, os.path.join(in_dir, JP, DRAGON_MOTION))
+    load_frame_data(db)
+    db.build_text_labels()
+    if args.fts:
+        db.build_label_search([view(db) for view in LABELED_VIEWS])
\ No newline at end of file
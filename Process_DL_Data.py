@@ -3,18 +3,21 @@
 
 import Enemy_Parser
 import argparse
-import csv
 import json
 import os
 import re
 import string
 
 from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
 from shutil import copyfile, rmtree
+from Table_Cache import TABLES
+from loader.TextLabel import load_csv_labels
 
 import pdb
 
 EXT = '.txt'
+WRITE_BUFFER = 1 << 16
 DEFAULT_TEXT_LABEL = ''
 ENTRY_LINE_BREAK = '\n=============================\n'
 EDIT_THIS = '<EDIT_THIS>'
@@ -67,60 +70,172 @@ FACILITY_EFFECT_TYPE_DICT = {
 }
 
 MATERIAL_NAME_LABEL = 'MATERIAL_NAME_'
+MISSING_SHOWN = 10
+
+def accumulate(func):
+    # Marks a process function that looks up or rewrites rows added earlier,
+    # its parser keeps all rows in memory and writes them out once processing is done
+    func.accumulate = True
+    return func
+
+class RowData(list):
+    """row_data of an accumulating parser, (display_name, row) entries in output order.
+
+    find looks rows up by a field through an index built on first use and kept up to date
+    by append. Fields used as keys must not change after the row is added.
+    """
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.indexes = {}
+        self.missing = {}
+
+    def index_entry(self, index, key, position, entry):
+        try:
+            index.setdefault(entry[1][key], position)
+        except (KeyError, TypeError, IndexError):
+            pass
+
+    def append(self, entry):
+        super().append(entry)
+        for key, index in self.indexes.items():
+            self.index_entry(index, key, len(self) - 1, entry)
+
+    def find(self, key, value, required=True):
+        # first row whose key field is value, None if there is none
+        try:
+            index = self.indexes[key]
+        except KeyError:
+            index = self.indexes[key] = {}
+            for position, entry in enumerate(self):
+                self.index_entry(index, key, position, entry)
+        try:
+            return self[index[value]][1]
+        except KeyError:
+            if required:
+                self.missing.setdefault(key, []).append(value)
+            return None
+
+class RowLookup:
+    """Stands in for the process function of a table whose rows are added to the rows of a
+    later table of the same parser, so that parser can still stream.
+
+    The rows are kept as row numbers into the cached table by id, in extra_data, see take_rows.
+    Rows never taken are reported like RowData.find misses, unless required is False.
+    """
+    def __init__(self, match_key, required=True):
+        self.match_key = match_key
+        self.required = required
+
+    def index(self, table):
+        index = {}
+        for position, value in enumerate(table.column(ROW_INDEX)):
+            if value != '0':
+                index.setdefault(value, []).append(position)
+        return index
+
+class RowWriter:
+    """Stands in for row_data when streaming, formats and writes each row as it is added."""
+    def __init__(self, out_file, formatter, template):
+        self.out_file = out_file
+        self.formatter = formatter
+        self.template = template
+
+    def append(self, entry):
+        display_name, row = entry
+        self.out_file.write(self.formatter(row, self.template, display_name))
 
 class DataParser:
     def __init__(self, _data_name, _template, _formatter, _process_info):
         self.data_name = _data_name
         self.template = _template
-        self.formatter = _formatter
+        self.formatter = compile_formatter(_formatter, _template)
         self.process_info = _process_info
-        self.row_data = []
+        self.row_data = RowData()
         self.extra_data = {}
 
+    @property
+    def accumulates(self):
+        try:
+            return any(getattr(func, 'accumulate', False) for _, func in self.process_info)
+        except TypeError:
+            return getattr(self.process_info, 'accumulate', False)
+
     def process_csv(self, file_name, func):
-        with open(in_dir+file_name+EXT, 'r', newline='', encoding='utf-8') as in_file:
-            reader = csv.DictReader(in_file)
-            for row in reader:
-                if row[ROW_INDEX] == '0':
-                    continue
-                try:
-                    func(row, self.row_data)
-                except TypeError:
-                    func(row, self.row_data, self.extra_data)
-                # except Exception as e:
-                #     print('Error processing {}: {}'.format(file_name, str(e)))
+        table = TABLES.get(table_path(file_name))
+        if isinstance(func, RowLookup):
+            self.extra_data[file_name] = (table, func.index(table))
+            return
+        for row in table.rows():
+            if row[ROW_INDEX] == '0':
+                continue
+            try:
+                func(row, self.row_data)
+            except TypeError:
+                func(row, self.row_data, self.extra_data)
+            # except Exception as e:
+            #     print('Error processing {}: {}'.format(file_name, str(e)))
+        self.report_missing(file_name)
+
+    def report_missing(self, file_name):
+        missing = getattr(self.row_data, 'missing', None)
+        for key, values in (missing or {}).items():
+            shown = ', '.join(values[:MISSING_SHOWN]) + (', ...' if len(values) > MISSING_SHOWN else '')
+            print('{}: {} {} rows have no {} row with a matching {}: {}'.format(self.data_name, len(values), file_name, self.data_name, key, shown))
+        if missing:
+            missing.clear()
+
+    def report_unused(self, file_name, lookup):
+        _, index = self.extra_data.pop(file_name)
+        if not lookup.required or not index:
+            return
+        values = [value for value, positions in index.items() for _ in positions]
+        shown = ', '.join(values[:MISSING_SHOWN]) + (', ...' if len(values) > MISSING_SHOWN else '')
+        print('{}: {} {} rows have no {} row with a matching {}: {}'.format(self.data_name, len(values), file_name, self.data_name, lookup.match_key, shown))
 
     def process(self):
         try: # process_info is an iteratable of (file_name, process_function)
             for file_name, func in self.process_info:
                 self.process_csv(file_name, func)
+            for file_name, func in self.process_info:
+                if isinstance(func, RowLookup):
+                    self.report_unused(file_name, func)
         except TypeError: # process_info is the process_function
             self.process_csv(self.data_name, self.process_info)
 
     def emit(self, out_dir):
-        with open(out_dir+self.data_name+EXT, 'w', newline='', encoding='utf-8') as out_file:
+        with open(out_dir+self.data_name+EXT, 'w', newline='', encoding='utf-8', buffering=WRITE_BUFFER) as out_file:
             for display_name, row in self.row_data:
                 out_file.write(self.formatter(row, self.template, display_name))
 
-def csv_as_index(path, index=None, value_key=None, tabs=False):
-    with open(path, 'r', newline='', encoding='utf-8') as csvfile:
-        if tabs:
-            reader = csv.DictReader(csvfile, dialect='excel-tab')
+    def stream(self, out_dir):
+        with open(out_dir+self.data_name+EXT, 'w', newline='', encoding='utf-8', buffering=WRITE_BUFFER) as out_file:
+            self.row_data = RowWriter(out_file, self.formatter, self.template)
+            try:
+                self.process()
+            finally:
+                self.row_data = RowData()
+
+    def run(self, out_dir):
+        if self.accumulates:
+            self.process()
+            self.emit(out_dir)
+            self.row_data = RowData()
         else:
-            reader = csv.DictReader(csvfile)
+            self.stream(out_dir)
 
-        keys = reader.fieldnames
+def table_path(file_name):
+    return in_dir+file_name+EXT
 
-        if not index:
-            index = keys[0] # get first key as index
-        if not value_key and len(keys) == 2:
-            # If not otherwise specified, load 2 column files as dict[string] = string
-            value_key = keys[1] # get second key
-        if value_key:
-            return {row[index]: row[value_key] for row in reader if row[index] != '0'}
-        else:
-            # load >2 column files as a dict[string] = OrderedDict
-            return {row[index]: row for row in reader if row[index] != '0'}
+def take_rows(extra_data, file_name, value):
+    # rows of a RowLookup table with the id value, each is handed out once
+    try:
+        table, index = extra_data[file_name]
+    except KeyError:
+        return []
+    return [table.row(position) for position in index.pop(value, ())]
+
+def csv_as_index(path, index=None, value_key=None, tabs=False):
+    return TABLES.get(path, tabs=tabs).as_index(index=index, value_key=value_key)
 
 def get_label(key, lang='en'):
     try:
@@ -394,6 +509,7 @@ def process_CharaData(row, existing_data):
     new_row['MaxLimitBreakCount'] = row['_MaxLimitBreakCount']
     existing_data.append((new_row['Name'] + ' - ' + new_row['FullName'], new_row))
 
+@accumulate
 def process_SkillDataNames(row, existing_data):
     for idx, (name, chara) in enumerate(existing_data):
         for i in (1, 2):
@@ -660,7 +776,7 @@ def process_MissionData(row, existing_data):
 
     existing_data.append((new_row[0], new_row))
 
-def process_QuestData(row, existing_data):
+def process_QuestData(row, existing_data, extra_data):
     pay_entity_type_dict = {
         "20" : get_raid_item_label(row['_PayEntityId']),
         "26" : 'Astral Piece',
@@ -732,21 +848,19 @@ def process_QuestData(row, existing_data):
     new_row['ShowEnemies'] = 1
     new_row['AutoPlayType'] = row['_AutoPlayType']
 
+    # rewards and bonuses go to the first quest with the id, so QuestData streams
+    for reward_row in take_rows(extra_data, 'QuestRewardData', new_row['Id']):
+        add_QuestRewardData(reward_row, new_row)
+    for bonus_row in take_rows(extra_data, 'QuestEvent', new_row.get('_Gid')):
+        add_QuestBonusData(bonus_row, new_row)
+
     existing_data.append((new_row['QuestViewName'], new_row))
 
-def process_QuestRewardData(row, existing_data):
+def add_QuestRewardData(row, curr_row):
     QUEST_FIRST_CLEAR_COUNT = 5
     QUEST_COMPLETE_COUNT = 3
     reward_template = '\n{{{{DropReward|droptype=First|itemtype={}|item={}|exact={}}}}}'
 
-    found = False
-    for index,existing_row in enumerate(existing_data):
-        if existing_row[1]['Id'] == row[ROW_INDEX]:
-            found = True
-            break
-    assert(found)
-
-    curr_row = existing_row[1]
     first_clear_dict = {
         '4': (lambda x: reward_template.format('Resource', 'Rupies', row['_FirstClearSetEntityQuantity' + x])),
         '8': (lambda x: reward_template.format(
@@ -793,22 +907,7 @@ def process_QuestRewardData(row, existing_data):
     except KeyError:
         pass
 
-    existing_data[index] = (existing_row[0], curr_row)
-
-def process_QuestBonusData(row, existing_data):
-
-    found = False
-    for index, existing_row in enumerate(existing_data):
-        if '_Gid' not in existing_row[1]:
-            found = False
-            break
-        if existing_row[1]['_Gid'] == row['_Id']:
-            found = True
-            break
-    if not found:
-        return
-
-    curr_row = existing_row[1]
+def add_QuestBonusData(row, curr_row):
     if row['_QuestBonusType'] == '1':
         curr_row['DailyDropQuantity'] = row['_QuestBonusCount']
         curr_row['DailyDropReward'] = ''
@@ -816,8 +915,6 @@ def process_QuestBonusData(row, existing_data):
         curr_row['WeeklyDropQuantity'] = row['_QuestBonusCount']
         curr_row['WeeklyDropReward'] = ''
 
-    existing_data[index] = (existing_row[0], curr_row)
-
 def process_WeaponData(row, existing_data):
     new_row = OrderedDict()
 
@@ -865,17 +962,14 @@ def process_WeaponData(row, existing_data):
 
     existing_data.append((new_row['WeaponName'], new_row))
 
+@accumulate
 def process_WeaponCraftData(row, existing_data):
     WEAPON_CRAFT_DATA_MATERIAL_COUNT = 5
 
-    found = False
-    for index,existing_row in enumerate(existing_data):
-        if existing_row[1]['Id'] == row[ROW_INDEX]:
-            found = True
-            break
-    assert(found)
+    curr_row = existing_data.find('Id', row[ROW_INDEX])
+    if curr_row is None:
+        return
 
-    curr_row = existing_row[1]
     curr_row['FortCraftLevel'] = row['_FortCraftLevel']
     curr_row['AssembleCoin'] = row['_AssembleCoin']
     curr_row['DisassembleCoin'] = row['_DisassembleCoin']
@@ -886,21 +980,16 @@ def process_WeaponCraftData(row, existing_data):
         curr_row['CraftMaterialType{}'.format(i)] = row['_CraftEntityType{}'.format(i)]
         curr_row['CraftMaterial{}'.format(i)] = get_label('{}{}'.format(MATERIAL_NAME_LABEL, row['_CraftEntityId{}'.format(i)]))
         curr_row['CraftMaterialQuantity{}'.format(i)] = row['_CraftEntityQuantity{}'.format(i)]
-    existing_data[index] = (existing_row[0], curr_row)
 
+@accumulate
 def process_WeaponCraftTree(row, existing_data):
-    found = False
-    for index,existing_row in enumerate(existing_data):
-        if existing_row[1]['Id'] == row['_CraftWeaponId']:
-            found = True
-            break
-    assert(found)
+    curr_row = existing_data.find('Id', row['_CraftWeaponId'])
+    if curr_row is None:
+        return
 
-    curr_row = existing_row[1]
     curr_row['CraftNodeId'] = row['_CraftNodeId']
     curr_row['ParentCraftNodeId'] = row['_ParentCraftNodeId']
     curr_row['CraftGroupId'] = row['_CraftGroupId']
-    existing_data[index] = (existing_row[0], curr_row)
 
 def prcoess_QuestWallMonthlyReward(row, existing_data, reward_sum):
     new_row = OrderedDict()
@@ -980,10 +1069,61 @@ def row_as_wikirow(row, template_name=None, display_name=None, delim='|'):
 def row_as_kv_pairs(row, template_name=None, display_name=None, delim=': '):
     return '\n\t'.join([k+delim+v for k, v in row.items()]) + '\n'
 
+# Compiled formatters give the same output as the row_as_* functions above,
+# with the template prefix and ordered key list built once per template instead of per row
+def compile_wikitext(template_name):
+    ordering = ORDERING_DATA.get(template_name)
+    inline_start = '{{' + template_name + '|'
+    block_start = ENTRY_LINE_BREAK + '{{' + template_name + '\n|'
+    block_end = '\n}}' + ENTRY_LINE_BREAK
+    if ordering is not None:
+        keys = [(k, k + '=') for k in ordering]
+        def pairs(row):
+            return [prefix + str(row[k]) for k, prefix in keys if k in row]
+    else:
+        def pairs(row):
+            return [k + '=' + str(v) for k, v in row.items()]
+    def format_row(row, template_name=None, display_name=None):
+        if display_name is not None:
+            return display_name + block_start + '\n|'.join(pairs(row)) + block_end
+        return inline_start + '|'.join(pairs(row)) + '}}\n'
+    return format_row
+
+def compile_wikitable(template_name, delim='|'):
+    start = delim + '-\n' + delim + ' '
+    sep = delim * 2
+    def format_row(row, template_name=None, display_name=None):
+        return start + sep.join(row.values()) + '\n'
+    return format_row
+
+def compile_wikirow(template_name, delim='|'):
+    start = '{{' + template_name + '|'
+    def format_row(row, template_name=None, display_name=None):
+        return start + delim.join(row) + '}}\n'
+    return format_row
+
+def compile_kv_pairs(template_name, delim=': '):
+    def format_row(row, template_name=None, display_name=None):
+        return '\n\t'.join(map(delim.join, row.items())) + '\n'
+    return format_row
+
+FORMATTER_COMPILERS = {
+    row_as_wikitext: compile_wikitext,
+    row_as_wikitable: compile_wikitable,
+    row_as_wikirow: compile_wikirow,
+    row_as_kv_pairs: compile_kv_pairs,
+}
+
+def compile_formatter(formatter, template_name):
+    try:
+        return FORMATTER_COMPILERS[formatter](template_name)
+    except KeyError:
+        return formatter
+
 DATA_PARSER_PROCESSING = {
     'AbilityLimitedGroup': ('AbilityLimitedGroup', row_as_wikitext, process_AbilityLimitedGroup),
     'CharaData': ('Adventurer', row_as_wikitext, process_CharaData),
-    # Must come after CharaData processing
+    # Reads CHAIN_COAB_SET from CharaData, see PARSER_DEPENDENCIES
     'AbilityData': ('Ability', row_as_wikitext,
         [('AbilityShiftGroup', process_AbilityShiftGroup),
          ('AbilityData', process_AbilityData)]),
@@ -1005,9 +1145,10 @@ DATA_PARSER_PROCESSING = {
     'MissionMemoryEventData': ('EndeavorRow', row_as_wikirow, process_MissionData),
     'MissionNormalData': ('EndeavorRow', row_as_wikirow, process_MissionData),
     'QuestData': ('QuestDisplay', row_as_wikitext,
-        [('QuestData', process_QuestData),
-            ('QuestRewardData', process_QuestRewardData),
-            ('QuestEvent', process_QuestBonusData),
+        [('QuestRewardData', RowLookup('Id')),
+            # quests without a bonus are expected, so unused rows are not reported
+            ('QuestEvent', RowLookup('_Gid', required=False)),
+            ('QuestData', process_QuestData),
         ]),
     'WeaponData': ('Weapon', row_as_wikitext,
         [('WeaponData', process_WeaponData),
@@ -1040,6 +1181,124 @@ KV_PROCESSING = {
     'RaidEventReward': ('RaidEventReward', row_as_kv_pairs, process_KeyValues)
 }
 
+# Parsers that read module state filled in by other parsers, by output label
+PARSER_DEPENDENCIES = {
+    'AbilityData': ('CharaData',),
+    'ChainCoAbility': ('CharaData',),
+}
+# Module state each parser fills in, handed to the parsers that depend on it
+PARSER_EXPORTS = {
+    'CharaData': ('CHAIN_COAB_SET',),
+}
+WORKER_GLOBALS = ('in_dir', 'TEXT_LABEL_DICT', 'SKILL_DATA_NAMES', 'EPITHET_RANKS', 'RAID_ITEM_LABELS', 'ORDERING_DATA')
+
+def init_worker(state, tables):
+    globals().update(state)
+    # tables read in the parent before the pool started, shared instead of read again
+    TABLES.tables.update(tables)
+
+def run_parser(data_name, process_params, out_dir):
+    template, formatter, process_info = process_params
+    parser = DataParser(data_name, template, formatter, process_info)
+    parser.run(out_dir)
+
+def run_enemy_parser(in_dir):
+    Enemy_Parser.parse(in_dir, text_label_dict=TEXT_LABEL_DICT['en'])
+
+def parser_task(label, data_name, process_params, out_dir):
+    # (label, input tables, function, args) of a DataParser
+    _, _, process_info = process_params
+    try:
+        tables = [file_name for file_name, _ in process_info]
+    except TypeError:
+        tables = [data_name]
+    return (label, tables, run_parser, (data_name, process_params, out_dir))
+
+def group_tasks(tasks):
+    # tasks that read a common input table form one group, run in order in one process so the table is read once
+    groups = []
+    for position, (_, tables, *_) in enumerate(tasks):
+        positions, group_tables = [position], set(tables)
+        for group in [group for group in groups if group[1] & group_tables]:
+            groups.remove(group)
+            positions += group[0]
+            group_tables |= group[1]
+        groups.append((positions, group_tables))
+    ordered_groups = []
+    for positions, _ in sorted(groups, key=lambda group: min(group[0])):
+        # task order, except that a dependency in the same group goes first
+        members = [tasks[position] for position in sorted(positions)]
+        labels = {task[0] for task in members}
+        ordered, done = [], set()
+        while members:
+            task = next((task for task in members
+                         if all(dep in done or dep not in labels for dep in PARSER_DEPENDENCIES.get(task[0], ()))), None)
+            if task is None:
+                raise ValueError('Circular parser dependencies: {}'.format(', '.join(task[0] for task in members)))
+            members.remove(task)
+            ordered.append(task)
+            done.add(task[0])
+        ordered_groups.append(ordered)
+    return ordered_groups
+
+def run_group(group, state):
+    globals().update(state)
+    exports = {}
+    # no other group reads the tables of this one, so each is dropped after its last task here
+    last_reader = {table: label for label, tables, _, _ in group for table in tables}
+    for label, tables, func, args in group:
+        func(*args)
+        exports.update((name, globals()[name]) for name in PARSER_EXPORTS.get(label, ()))
+        for table in tables:
+            if last_reader[table] == label:
+                TABLES.discard(table_path(table))
+    return exports
+
+def run_parsers(tasks, workers=None):
+    # tasks is a list of (label, input tables, function, args), see parser_task
+    # groups of tasks run as soon as the groups they depend on are done, results are reported in task order
+    labels = {task[0] for task in tasks}
+    for label, deps in PARSER_DEPENDENCIES.items():
+        for dep in deps:
+            if label in labels and dep not in labels:
+                raise ValueError('{} depends on unknown parser {}'.format(label, dep))
+    groups = group_tasks(tasks)
+    group_of = {task[0]: idx for idx, group in enumerate(groups) for task in group}
+    pending = {idx: {group_of[dep] for task in group for dep in PARSER_DEPENDENCIES.get(task[0], ())} - {idx}
+               for idx, group in enumerate(groups)}
+    state = {}
+    done = set()
+
+    def ready(running):
+        ready_groups = [idx for idx, deps in pending.items() if deps <= done]
+        if not ready_groups and not running:
+            raise ValueError('Circular parser dependencies: {}'.format(
+                ', '.join(task[0] for idx in pending for task in groups[idx])))
+        for idx in ready_groups:
+            del pending[idx]
+        return ready_groups
+
+    if workers == 1:
+        while pending:
+            for idx in ready(None):
+                state.update(run_group(groups[idx], state))
+                done.add(idx)
+    else:
+        worker_state = {name: globals()[name] for name in WORKER_GLOBALS if name in globals()}
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                 initargs=(worker_state, dict(TABLES.tables))) as executor:
+            running = {}
+            while pending or running:
+                for idx in (ready(running) if pending else []):
+                    running[executor.submit(run_group, groups[idx], dict(state))] = idx
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    state.update(future.result())
+                    done.add(running.pop(future))
+    for label, _, func, _ in tasks:
+        if func is run_parser:
+            print('Saved {}{}'.format(label, EXT))
+
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description='Process CSV data into Wikitext.')
     parser.add_argument('-i', type=str, help='directory of input text files', default='./')
@@ -1047,6 +1306,7 @@ if __name__ == '__main__':
     parser.add_argument('-j', type=str, help='path to json file with ordering', default='')
     # parser.add_argument('-data', type=list)
     parser.add_argument('--delete_old', help='delete older output files', dest='delete_old', action='store_true')
+    parser.add_argument('-p', type=int, help='number of parser processes, 1 runs them in order in this process (default: cpu count)', default=None)
 
     args = parser.parse_args()
     if args.delete_old:
@@ -1065,9 +1325,9 @@ if __name__ == '__main__':
     in_dir = args.i if args.i[-1] == '/' else args.i+'/'
     out_dir = args.o if args.o[-1] == '/' else args.o+'/'
 
-    TEXT_LABEL_DICT['en'] = csv_as_index(in_dir+TEXT_LABEL+EXT, tabs=True)
+    TEXT_LABEL_DICT['en'] = load_csv_labels(in_dir+TEXT_LABEL+EXT, tabs=True)
     try:
-        TEXT_LABEL_DICT['jp'] = csv_as_index(in_dir+TEXT_LABEL_JP+EXT, tabs=True)
+        TEXT_LABEL_DICT['jp'] = load_csv_labels(in_dir+TEXT_LABEL_JP+EXT, tabs=True)
     except:
         pass
     SKILL_DATA_NAMES = csv_as_index(in_dir+SKILL_DATA_NAME+EXT, index='_Id', value_key='_Name')
@@ -1075,25 +1335,14 @@ if __name__ == '__main__':
     RAID_ITEM_LABELS = csv_as_index(in_dir+RAID_EVENT_ITEM_DATA_NAME+EXT, index='_Id', value_key='_Name')
     # find_fmt_params(in_dir, out_dir)
 
-    for data_name, process_params in DATA_PARSER_PROCESSING.items():
-        template, formatter, process_info = process_params
-        parser = DataParser(data_name, template, formatter, process_info)
-        parser.process()
-        parser.emit(out_dir)
-        print('Saved {}{}'.format(data_name, EXT))
-
     kv_out = out_dir+'/kv/'
     if not os.path.exists(kv_out):
         os.makedirs(kv_out)
-    for data_name, process_params in KV_PROCESSING.items():
-        template, formatter, process_info = process_params
-        parser = DataParser(data_name, template, formatter, process_info)
-        parser.process()
-        parser.emit(kv_out)
-        print('Saved kv/{}{}'.format(data_name, EXT))
-
-    # Outsource enemy parsing
-    Enemy_Parser.parse(in_dir, text_label_dict=TEXT_LABEL_DICT['en'])
+    tasks = [parser_task(data_name, data_name, process_params, out_dir) for data_name, process_params in DATA_PARSER_PROCESSING.items()]
+    tasks += [parser_task('kv/'+data_name, data_name, process_params, kv_out) for data_name, process_params in KV_PROCESSING.items()]
+    # Outsource enemy parsing, scheduled with the parsers since it reads EnemyParam and WeaponData too
+    tasks.append(('Enemy_Parser', Enemy_Parser.INPUT_TABLES, run_enemy_parser, (in_dir,)))
+    run_parsers(tasks, workers=args.p)
 
     # with open('chaincoabs.json', 'w', newline='') as f:
     #     json.dump(CHAIN_COAB_DICT, f, sort_keys=True, indent=2)
@@ -8,9 +8,13 @@ import copy
 from shutil import copyfile, rmtree
 import argparse
 
+from loader.TextureEncoder import TEXTURE_EXTS, open_texture
+
 ALPHA_TYPES = ('A', 'alpha', 'alphaA8')
 YCbCr_TYPES = ('Y', 'Cb', 'Cr')
 EXT = '.png'
+# extension of the extracted images, see Asset_Extract -tex
+IN_EXT = EXT
 PORTRAIT_SUFFIX = '_portrait'
 WYRMPRINT_ALPHA = 'Wyrmprint_Alpha.png'
 CATEGORY_REGEX = {
@@ -62,13 +66,13 @@ def split_image_name(file_name):
     else:
         return file_name, 'base', 0
 
-def merge_image_name(base_name, channel, hash_tag):
+def merge_image_name(base_name, channel, hash_tag, ext=EXT):
     image_name = base_name
     if channel != 'base':
         image_name += '_' + channel
     if hash_tag != 0:
         image_name += ' #' + str(hash_tag)
-    image_name += EXT
+    image_name += ext
     return image_name
 
 def build_image_dict(current_dir, images={}):
@@ -81,7 +85,7 @@ def build_image_dict(current_dir, images={}):
             build_image_dict(fp, images)
         else:
             file_name, file_ext = os.path.splitext(f)
-            if file_ext != EXT:
+            if file_ext != IN_EXT:
                 continue
             base_name, channel, hash_tag = split_image_name(file_name)
             if current_dir not in images:
@@ -112,7 +116,7 @@ def print_image_dict(images, paths=True):
             if paths:
                 for c in images[d][i]:
                     for h in images[d][i][c]:
-                        print('\t', merge_image_name(i, c, h))
+                        print('\t', merge_image_name(i, c, h, IN_EXT))
             else:
                 print(i, '\n\t', images[d][i])
 
@@ -140,11 +144,11 @@ def merge_alpha(directory, base_name, alpha_type, base_tags, alpha_tags):
 
     for bh, ah in nearest_pair.items():
         try:
-            base_img = Image.open('{}/{}'.format(directory, merge_image_name(base_name, 'base', bh)))
-            alph_img = Image.open('{}/{}'.format(directory, merge_image_name(base_name, alpha_type, ah)))
+            base_img = open_texture('{}/{}'.format(directory, merge_image_name(base_name, 'base', bh, IN_EXT)))
+            alph_img = open_texture('{}/{}'.format(directory, merge_image_name(base_name, alpha_type, ah, IN_EXT)))
         except Exception:
             print(bh, ah)
-            print('ERR: {}/{}'.format(directory, merge_image_name(base_name, alpha_type, ah)))
+            print('ERR: {}/{}'.format(directory, merge_image_name(base_name, alpha_type, ah, IN_EXT)))
         if base_img.size != alph_img.size:
             continue
         try:
@@ -160,12 +164,12 @@ def merge_alpha(directory, base_name, alpha_type, base_tags, alpha_tags):
     return merged
 
 def merge_YCbCr(directory, base_name, unique_alpha=False):
-    Y_img = Image.open('{}/{}'.format(directory, merge_image_name(base_name, 'Y', 0)))
+    Y_img = open_texture('{}/{}'.format(directory, merge_image_name(base_name, 'Y', 0, IN_EXT)))
     _, _, _, Y = Y_img.convert('RGBA').split()
-    Cb = Image.open('{}/{}'.format(directory, merge_image_name(base_name, 'Cb', 0))).convert('L').resize(Y_img.size, Image.ANTIALIAS)
-    Cr = Image.open('{}/{}'.format(directory, merge_image_name(base_name, 'Cr', 0))).convert('L').resize(Y_img.size, Image.ANTIALIAS)
+    Cb = open_texture('{}/{}'.format(directory, merge_image_name(base_name, 'Cb', 0, IN_EXT))).convert('L').resize(Y_img.size, Image.ANTIALIAS)
+    Cr = open_texture('{}/{}'.format(directory, merge_image_name(base_name, 'Cr', 0, IN_EXT))).convert('L').resize(Y_img.size, Image.ANTIALIAS)
     if unique_alpha:
-        a = Image.open('{}/{}'.format(directory, merge_image_name(base_name, 'alpha', 0))).convert('L')
+        a = open_texture('{}/{}'.format(directory, merge_image_name(base_name, 'alpha', 0, IN_EXT))).convert('L')
     elif Y_img.size == (1024, 1024):
         a = Image.open(WYRMPRINT_ALPHA).convert('L')
     else:
@@ -277,7 +281,12 @@ def copy_Not_Merged_images(Not_Merged, in_dir, out_dir):
                     else:
                         category = ''
                         img_name = merge_image_name(i, c, h)
-                    copyfile(d + '/' + merge_image_name(i, c, h), out_sub_dir + '/' + category + '/' + img_name)
+                    in_path = d + '/' + merge_image_name(i, c, h, IN_EXT)
+                    out_path = out_sub_dir + '/' + category + '/' + img_name
+                    if IN_EXT == EXT:
+                        copyfile(in_path, out_path)
+                    else:
+                        open_texture(in_path).save(out_path)
         delete_empty_subdirectories(out_sub_dir)
 
 if __name__ == '__main__':
@@ -286,6 +295,7 @@ if __name__ == '__main__':
     parser.add_argument('-o', type=str, help='directory of output images  (default: ./output-img)', default='./output-img')
     parser.add_argument('--delete_old', help='delete older output files', dest='delete_old', action='store_true')
     parser.add_argument('-wpa', type=str, help='path to Wyrmprint_Alpha.png.', default='Wyrmprint_Alpha.png')
+    parser.add_argument('-ext', type=str, help='extension of the input images (default: .png)', choices=TEXTURE_EXTS, default=EXT)
 
     args = parser.parse_args()
     if args.delete_old:
@@ -299,6 +309,7 @@ if __name__ == '__main__':
         os.makedirs(args.o)
 
     WYRMPRINT_ALPHA = args.wpa
+    IN_EXT = args.ext
     images = build_image_dict(args.i)
     images, Not_Merged = filter_image_dict(images)
 
@@ -0,0 +1,178 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import inspect
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from aiohttp import web
+
+from loader.Database import DBManager, expand_deferred
+from loader.Profile import add_profile_argument
+from exporter.Shared import SkillData, PlayerAction
+from exporter.Adventurers import CharaData
+from exporter.Dragons import DragonData
+from exporter.Weapons import WeaponData
+from exporter.Wyrmprints import AmuletData
+from exporter.Enemy import EnemyParam
+
+VIEWS = (CharaData, DragonData, WeaponData, AmuletData, EnemyParam, SkillData, PlayerAction)
+# boolean get options that may be set from the query string, when the view's get takes them
+GET_OPTIONS = ('exclude_falsy', 'full_query', 'full_abilities', 'full_actions', 'full_hitattr')
+TRUE_VALUES = ('1', 'true', 'yes')
+JSON_TYPE = 'application/json'
+
+def parse_pk(pk):
+    try:
+        return int(pk)
+    except ValueError:
+        return pk
+
+def build_id(db_file):
+    # changes whenever the database or its label stores are rebuilt,
+    # in WAL mode commits land in the -wal file and leave the database file untouched until a checkpoint
+    digest = hashlib.sha1()
+    for path in (db_file, f'{db_file}-wal', f'{db_file}.TextLabel.lbl', f'{db_file}.TextLabelJP.lbl'):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        digest.update(f'{path}:{stat.st_mtime_ns}:{stat.st_size};'.encode())
+    return digest.hexdigest()[:16]
+
+class ResponseCache:
+    """LRU cache of encoded responses by build and lookup, dropped whenever the database build changes."""
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        try:
+            body = self.entries[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return body
+
+    def put(self, key, body):
+        self.entries[key] = body
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+class QueryServer:
+    def __init__(self, db, workers=4, cache_size=4096):
+        self.db = db
+        self.views = {view.__name__: view(db) for view in VIEWS}
+        self.options = {name: [k for k in GET_OPTIONS if k in inspect.signature(view.get).parameters]
+                        for name, view in self.views.items()}
+        self.executor = ThreadPoolExecutor(workers)
+        self.cache = ResponseCache(cache_size)
+        # concurrent misses for the same key wait on one lookup
+        self.inflight = {}
+        self.build = build_id(db.db_file)
+        self.reload_lock = asyncio.Lock()
+
+    async def check_build(self):
+        if build_id(self.db.db_file) == self.build:
+            return
+        async with self.reload_lock:
+            build = build_id(self.db.db_file)
+            if build == self.build:
+                return
+            # label stores, views and table metadata of the old build, reopened once no lookup runs;
+            # lookups still running put their responses under the old build, which is never asked for again
+            await asyncio.get_running_loop().run_in_executor(None, self.db.reload)
+            self.build = build
+            self.cache.clear()
+
+    def exists(self, view, pk):
+        table = view.base_table
+        by = self.db.check_table(table).pk
+        return self.db.query_one(f'SELECT 1 FROM {table} WHERE {by}=?', (pk,), tuple) is not None
+
+    def lookup(self, name, pk, options):
+        # runs in a worker thread on a leased read connection
+        view = self.views[name]
+        with self.db.reading(), self.db.memoized_subtrees():
+            # the full queries process their result without checking it was found
+            if not self.exists(view, pk):
+                return None
+            res = view.get(pk, **options)
+            if res is None:
+                return None
+            return json.dumps(res, ensure_ascii=False, default=expand_deferred).encode('utf-8')
+
+    async def index(self, request):
+        return web.json_response({
+            'build': self.build,
+            'views': self.options,
+            'cache': {'size': len(self.cache.entries), 'hits': self.cache.hits, 'misses': self.cache.misses}
+        })
+
+    async def get(self, request):
+        name = request.match_info['view']
+        if name not in self.views:
+            raise web.HTTPNotFound(text=f'unknown view {name}')
+        await self.check_build()
+        build = self.build
+        etag = f'"{build}"'
+        headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+        # a response of this build is still current, whatever the url asked for
+        if etag in request.headers.get('If-None-Match', ''):
+            raise web.HTTPNotModified(headers=headers)
+        pk = parse_pk(request.match_info['pk'])
+        # falsy fields are left out like in the exported files unless asked for
+        options = {'exclude_falsy': True}
+        options.update((k, request.query[k].lower() in TRUE_VALUES) for k in self.options[name] if k in request.query)
+        key = (build, name, pk, tuple(sorted(options.items())))
+        body = self.cache.get(key)
+        if body is None:
+            future = self.inflight.get(key)
+            if future is None:
+                loop = asyncio.get_running_loop()
+                future = self.inflight[key] = loop.run_in_executor(self.executor, self.lookup, name, pk, options)
+                try:
+                    body = await future
+                finally:
+                    del self.inflight[key]
+                if body is not None:
+                    self.cache.put(key, body)
+            else:
+                body = await future
+        if body is None:
+            raise web.HTTPNotFound(text=f'{name} {pk} not found')
+        return web.Response(body=body, content_type=JSON_TYPE, charset='utf-8', headers=headers)
+
+    async def on_cleanup(self, app):
+        self.executor.shutdown(wait=True)
+        self.db.close()
+
+    def make_app(self):
+        app = web.Application()
+        app.router.add_get('/', self.index)
+        app.router.add_get('/{view}/{pk}', self.get)
+        app.on_cleanup.append(self.on_cleanup)
+        return app
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Serve view lookups as JSON over HTTP.')
+    parser.add_argument('-i', type=str, help='database file', default='dl.sqlite')
+    parser.add_argument('--host', type=str, help='host to listen on', default='127.0.0.1')
+    parser.add_argument('--port', type=int, help='port to listen on', default=8080)
+    parser.add_argument('-w', type=int, help='lookup threads, each with its own read connection', default=4)
+    parser.add_argument('-c', type=int, help='number of responses kept in the cache', default=4096)
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    db = DBManager(args.i, profile=args.profile, readers=args.w)
+    server = QueryServer(db, workers=args.w, cache_size=args.c)
+    web.run_app(server.make_app(), host=args.host, port=args.port)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import csv
+import os
+import sys
+
+# with $DL_TABLE_READS set, the path of every table read from disk is appended to that file,
+# across all the processes of a run, see benchmark.pipeline
+READS_LOG = os.environ.get('DL_TABLE_READS')
+
+def log_read(path):
+    if READS_LOG:
+        with open(READS_LOG, 'a', encoding='utf-8') as f:
+            f.write(path + '\n')
+
+class Table:
+    """A CSV file held as one list per column, with values interned."""
+    def __init__(self, fieldnames, columns, extras=None):
+        self.fieldnames = fieldnames
+        self.columns = columns
+        self.extras = extras
+
+    @classmethod
+    def read(cls, path, tabs=False):
+        with open(path, 'r', newline='', encoding='utf-8') as csvfile:
+            if tabs:
+                reader = csv.reader(csvfile, dialect='excel-tab')
+            else:
+                reader = csv.reader(csvfile)
+            fieldnames = next(reader, [])
+            width = len(fieldnames)
+            columns = [[] for _ in fieldnames]
+            extras = None
+            count = 0
+            for values in reader:
+                if not values:
+                    continue
+                count += 1
+                for column, value in zip(columns, values):
+                    column.append(sys.intern(value))
+                if len(values) < width:
+                    for column in columns[len(values):]:
+                        column.append(None)
+                elif len(values) > width:
+                    if extras is None:
+                        extras = {}
+                    extras[count - 1] = values[width:]
+        return cls(fieldnames, columns, extras)
+
+    def __len__(self):
+        return len(self.columns[0]) if self.columns else 0
+
+    def column(self, key):
+        try:
+            return self.columns[self.fieldnames.index(key)]
+        except ValueError:
+            raise KeyError(key)
+
+    def rows(self):
+        # each row is a fresh dict, so callers can modify it like a csv.DictReader row
+        fieldnames = self.fieldnames
+        for idx, values in enumerate(zip(*self.columns)):
+            row = dict(zip(fieldnames, values))
+            if self.extras and idx in self.extras:
+                row[None] = list(self.extras[idx])
+            yield row
+
+    def row(self, idx):
+        row = dict(zip(self.fieldnames, (column[idx] for column in self.columns)))
+        if self.extras and idx in self.extras:
+            row[None] = list(self.extras[idx])
+        return row
+
+    def as_index(self, index=None, value_key=None):
+        keys = self.fieldnames
+        if not index:
+            index = keys[0] # get first key as index
+        if not value_key and len(keys) == 2:
+            # If not otherwise specified, load 2 column files as dict[string] = string
+            value_key = keys[1] # get second key
+        index_column = self.column(index)
+        if value_key:
+            value_column = self.column(value_key)
+            return {k: v for k, v in zip(index_column, value_column) if k != '0'}
+        else:
+            # load >2 column files as a dict[string] = dict
+            return {row[index]: row for row in self.rows() if row[index] != '0'}
+
+class TableCache:
+    def __init__(self):
+        self.tables = {}
+
+    def get(self, path, tabs=False):
+        # the same file reached through in_dir+name and os.path.join is one table
+        key = (os.path.normpath(path), tabs)
+        if key not in self.tables:
+            self.tables[key] = Table.read(path, tabs=tabs)
+            log_read(key[0])
+        return self.tables[key]
+
+    def discard(self, path):
+        # drop a table nothing reads anymore, read with or without tabs
+        path = os.path.normpath(path)
+        for tabs in (False, True):
+            self.tables.pop((path, tabs), None)
+
+    def clear(self):
+        self.tables.clear()
+
+TABLES = TableCache()
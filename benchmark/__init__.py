@@ -0,0 +1,30 @@
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MISC_DIR = os.path.join(ROOT_DIR, 'misc')
+
+
+def use_misc():
+    if MISC_DIR not in sys.path:
+        sys.path.insert(0, MISC_DIR)
+
+
+def timed(func, *args, repeat=3, **kargs):
+    best = None
+    res = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        res = func(*args, **kargs)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best, res
+
+
+def report(title, timings):
+    print(title)
+    baseline = next(iter(timings.values()))
+    for name, elapsed in timings.items():
+        print(f'  {name:<24}{elapsed * 1000:>12.2f} ms{baseline / elapsed:>8.2f}x')
@@ -0,0 +1,42 @@
+import argparse
+from collections import OrderedDict
+
+from benchmark import timed, report
+
+import Process_DL_Data
+from Process_DL_Data import compile_formatter, row_as_wikitext, row_as_wikitable, row_as_wikirow, row_as_kv_pairs
+
+
+def make_rows(count, width):
+    return [OrderedDict((f'Field{k}', f'value {i}-{k}') for k in range(width)) for i in range(count)]
+
+
+def format_all(formatter, rows, template_name, display_name):
+    return [formatter(row, template_name, display_name) for row in rows]
+
+
+def bench(name, formatter, rows, template_name, display_name=None):
+    compiled = compile_formatter(formatter, template_name)
+    legacy_time, legacy = timed(format_all, formatter, rows, template_name, display_name)
+    compiled_time, result = timed(format_all, compiled, rows, template_name, display_name)
+    assert legacy == result
+    count = len(rows)
+    print(f'{name}: {legacy_time / count * 1e6:.2f} us/row -> {compiled_time / count * 1e6:.2f} us/row')
+    report(f'{name} over {count} rows', {'row_as_*': legacy_time, 'compiled': compiled_time})
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark per row wikitext formatting.')
+    parser.add_argument('-n', type=int, help='number of rows', default=20000)
+    parser.add_argument('-w', type=int, help='number of fields per row', default=40)
+    args = parser.parse_args()
+    rows = make_rows(args.n, args.w)
+    list_rows = [list(row.values()) for row in rows]
+    # ordering that skips some fields and names some the rows do not have, like the -j files
+    Process_DL_Data.ORDERING_DATA['Ordered'] = [f'Field{k}' for k in range(args.w + 5, -1, -1) if k % 7]
+    bench('row_as_wikitext', row_as_wikitext, rows, 'Plain')
+    bench('row_as_wikitext with display name', row_as_wikitext, rows, 'Plain', 'Display')
+    bench('row_as_wikitext with ordering', row_as_wikitext, rows, 'Ordered', 'Display')
+    bench('row_as_wikitable', row_as_wikitable, rows, 'Table')
+    bench('row_as_wikirow', row_as_wikirow, list_rows, 'Row')
+    bench('row_as_kv_pairs', row_as_kv_pairs, rows, 'KV')
@@ -0,0 +1,96 @@
+import argparse
+import os
+import re
+
+from benchmark import use_misc, timed, report
+
+from loader.Actions import CommandType
+from loader.Database import DBManager
+from exporter.Shared import ActionParts, PlayerAction
+
+
+def legacy_attributes_for_label(label, attributes):
+    if re.compile('.*LV0[1-4]').match(label):
+        suffixes = ['LV01', 'LV02', 'LV03', 'LV04']
+        base_name = label[0:-4]
+        return [attributes[base_name + suffix] for suffix in suffixes if base_name + suffix in attributes.keys()]
+    else:
+        return [attributes[label]] if label in attributes.keys() else []
+
+
+def bench_misc(in_dir):
+    use_misc()
+    import Action
+    from Session import Session
+    session = Session(in_dir)
+    attributes = session.get_hit_attribute_data()
+    action_conditions = session.get_action_condition_data()
+    metadata = session.get_action_metadata()
+    actions = Action.ActionStore(in_dir, attributes, action_conditions, metadata)
+    labels = [event.label for action in actions.values() for event in action.timeline if hasattr(event, 'label')]
+
+    def resolve_all(attributes_for_label):
+        return [attributes_for_label(label, attributes) for label in labels]
+
+    legacy_time, legacy = timed(resolve_all, legacy_attributes_for_label)
+    index_time, indexed = timed(resolve_all, Action.attributes_for_label)
+    assert legacy == indexed
+    report(f'misc attributes_for_label over {len(actions)} actions ({len(labels)} labels)',
+           {'regex + suffix probe': legacy_time, 'level index': index_time})
+
+
+def legacy_process_result(self, action_parts, exclude_falsy=False, hide_ref=True, full_hitattr=False):
+    for r in action_parts:
+        if 'commandType' in r:
+            r['commandType'] = CommandType(r['commandType']).name
+        if hide_ref:
+            del r['_Id']
+            del r['_ref']
+        for label in self.HIT_LABELS:
+            if label not in r:
+                continue
+            res = self.LV_SUFFIX.match(r[label])
+            if res:
+                base_label, _ = res.groups()
+                hit_attrs = self.attrs.get(base_label, by='_Id', order='_Id DESC', mode=DBManager.LIKE,
+                                           exclude_falsy=exclude_falsy)
+                if hit_attrs:
+                    if isinstance(hit_attrs, dict) or full_hitattr:
+                        r[label] = hit_attrs
+                    elif len(hit_attrs) > 0:
+                        r[label] = hit_attrs[0]
+            else:
+                hit_attr = self.attrs.get(r[label], by='_Id', exclude_falsy=exclude_falsy)
+                if hit_attr:
+                    r[label] = hit_attr
+    return action_parts
+
+
+def bench_db(db_file):
+    db = DBManager(db_file)
+    view = PlayerAction(db)
+    action_ids = [r['_Id'] for r in db.query_many('SELECT _Id FROM PlayerAction', (), dict)]
+
+    def get_all():
+        return [view.get(pa_id, full_hitattr=True) for pa_id in action_ids]
+
+    current = ActionParts.process_result
+    ActionParts.process_result = legacy_process_result
+    try:
+        legacy_time, _ = timed(get_all)
+    finally:
+        ActionParts.process_result = current
+    index_time, _ = timed(get_all)
+    report(f'exporter PlayerAction.get over {len(action_ids)} actions', {'LIKE query': legacy_time,
+                                                                         'level index': index_time})
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark hit attribute level lookup.')
+    parser.add_argument('-i', type=str, help='input dir (from extracting master and actions)', default=None)
+    parser.add_argument('-db', type=str, help='database file', default=None)
+    args = parser.parse_args()
+    if args.i and os.path.exists(args.i):
+        bench_misc(args.i)
+    if args.db and os.path.exists(args.db):
+        bench_db(args.db)
@@ -0,0 +1,58 @@
+import argparse
+import json
+import os
+import tempfile
+import tracemalloc
+
+from benchmark import timed, report
+from benchmark.synthetic import Generator
+
+from loader.Motion import load_clip_summary, CHARACTER_REF, build_motion
+
+
+def write_clips(out_dir, count, frames):
+    generator = Generator(clip_frames=frames)
+    paths = []
+    for i in range(count):
+        name = f'SWD_CMB_01_01_{100001 + i}01'
+        path = os.path.join(out_dir, f'{name}.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(generator.clip(name), f, indent=2)
+        paths.append(path)
+    return paths
+
+
+def load_full(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def load_motions(paths, load):
+    return [build_motion(load(path), CHARACTER_REF) for path in paths]
+
+
+def peak_memory(paths, load):
+    tracemalloc.start()
+    for path in paths:
+        load(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare full and projected parsing of AnimationClip dumps.')
+    parser.add_argument('-n', type=int, help='number of synthetic clips', default=1000)
+    parser.add_argument('-f', type=int, help='frames per clip', default=1200)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = write_clips(tmp_dir, args.n, args.f)
+        size = sum(os.path.getsize(path) for path in paths)
+        full_time, full = timed(load_motions, paths, load_full)
+        summary_time, summary = timed(load_motions, paths, load_clip_summary)
+        assert full == summary
+        report(f'Motion rows from {args.n} clips, {size / 2**20:.1f} MiB, identical rows',
+               {'json.load': full_time, 'load_clip_summary': summary_time})
+        print('Peak memory per clip')
+        for name, load in (('json.load', load_full), ('load_clip_summary', load_clip_summary)):
+            print(f'  {name:<24}{peak_memory(paths[:10], load) / 1024:>12.1f} KiB')
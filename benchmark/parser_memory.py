@@ -0,0 +1,62 @@
+import argparse
+import csv
+import os
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmark import report
+
+import Process_DL_Data
+from Process_DL_Data import DataParser, KV_PROCESSING
+
+QUEST_COLUMNS = ['_Id', '_Gid', '_QuestType', '_VariationType', '_EntryType', '_QuestViewName', '_SectionName',
+                 '_Elemental', '_DungeonName', '_RequiredPlayerLevel', '_PayStaminaSingle', '_PayStaminaMulti',
+                 '_FailedTermsType', '_FailedTermsTimeElapsed', '_ContinueLimit', '_RebornLimit', '_Difficulty']
+
+
+def write_quest_data(in_dir, count):
+    with open(os.path.join(in_dir, 'QuestData.txt'), 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(QUEST_COLUMNS)
+        for i in range(1, count + 1):
+            quest_id = str(200000000 + i)
+            writer.writerow([quest_id, str(i // 10), str(i % 5), str(i % 3 + 1), '1', 'QUEST_NAME_' + quest_id,
+                             'QUEST_SECTION_' + str(i % 100), str(i % 6), 'DUNGEON_' + str(i % 50), str(i % 80),
+                             str(i % 30), str(i % 2), '1', '300', '3', '0', str(i % 10000)])
+
+
+def run(in_dir, out_dir, streaming):
+    # runs in a fresh process so ru_maxrss is the peak of this mode alone
+    Process_DL_Data.in_dir = in_dir
+    Process_DL_Data.TEXT_LABEL_DICT['en'] = {}
+    template, formatter, process_info = KV_PROCESSING['QuestData']
+    parser = DataParser('QuestData', template, formatter, process_info)
+    start = time.perf_counter()
+    if streaming:
+        parser.stream(out_dir)
+    else:
+        parser.process()
+        parser.emit(out_dir)
+    elapsed = time.perf_counter() - start
+    return elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare peak memory of accumulated and streamed DataParser output.')
+    parser.add_argument('-n', type=int, help='number of synthetic QuestData rows', default=1000000)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        in_dir = os.path.join(tmp_dir, 'in') + '/'
+        out_dir = os.path.join(tmp_dir, 'out') + '/'
+        os.makedirs(in_dir)
+        os.makedirs(out_dir)
+        write_quest_data(in_dir, args.n)
+        timings = {}
+        for name, streaming in (('accumulate', False), ('stream', True)):
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                elapsed, peak = executor.submit(run, in_dir, out_dir, streaming).result()
+            timings[name] = elapsed
+            print(f'{name:<12} peak {peak / 2**20:>10.1f} MB')
+        report(f'QuestData key/value output over {args.n} rows', timings)
@@ -0,0 +1,134 @@
+import argparse
+import json
+from collections import Counter
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+
+from benchmark import ROOT_DIR, timed, use_misc
+from benchmark.synthetic import Generator, process_tables, MASTER_DIR, ACTIONS_DIR, CHARACTER_MOTION_DIR, \
+    DRAGON_MOTION_DIR, MISC_DIR, CSV_DIR
+
+from loader.Database import DBManager
+from loader.Master import load_master, load_json
+from loader.Actions import load_actions
+from loader.Motion import load_character_motion, load_dragon_motion
+from loader.FrameData import load_frame_data
+
+from exporter.Adventurers import CharaData
+from exporter.Dragons import DragonData
+from exporter.Enemy import EnemyParam
+from exporter.Weapons import WeaponData
+from exporter.Wyrmprints import AmuletData
+
+EXPORTERS = (
+    ('export adventurers', CharaData, 'adventurers'),
+    ('export dragons', DragonData, 'dragons'),
+    ('export enemies', EnemyParam, 'enemies'),
+    ('export weapons', WeaponData, 'weapons'),
+    ('export wyrmprints', AmuletData, 'wyrmprints'),
+)
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT_DIR, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_database(db_file, paths, text_label_jp):
+    if os.path.exists(db_file):
+        os.remove(db_file)
+    db = DBManager(db_file)
+    stages = {}
+    stages['load_master'], _ = timed(load_master, db, paths[MASTER_DIR], repeat=1)
+    stages['load_json TextLabelJP'], _ = timed(load_json, db, text_label_jp, 'TextLabelJP', repeat=1)
+    stages['load_actions'], _ = timed(load_actions, db, paths[ACTIONS_DIR], repeat=1)
+    stages['load_character_motion'], _ = timed(load_character_motion, db, paths[CHARACTER_MOTION_DIR], repeat=1)
+    stages['load_dragon_motion'], _ = timed(load_dragon_motion, db, paths[DRAGON_MOTION_DIR], repeat=1)
+    stages['load_frame_data'], _ = timed(load_frame_data, db, repeat=1)
+    stages['build_text_labels'], _ = timed(db.build_text_labels, repeat=1)
+    return db, stages
+
+
+def run_misc(paths, out_dir):
+    use_misc()
+    import Adventurers
+    from Common import run_common
+    from Session import Session
+    # a fresh session each time, the misc loaders memoize on it
+    session = Session(paths[MISC_DIR], os.path.join(paths[MISC_DIR], CHARACTER_MOTION_DIR))
+    adventurers = Adventurers.run(paths[MISC_DIR], session)
+    run_common(out_dir, [(f'{adv.id}_{adv.name}', adv) for adv in adventurers.values()])
+    return len(adventurers)
+
+
+def run_wikitext(data_dir, paths, out_dir, processes):
+    # returns the number of times each input table was read from disk, over all the parser processes
+    reads_log = os.path.join(data_dir, 'table_reads.txt')
+    if os.path.exists(reads_log):
+        os.remove(reads_log)
+    subprocess.run([sys.executable, os.path.join(ROOT_DIR, 'Process_DL_Data.py'), '-i', paths[CSV_DIR], '-o', out_dir,
+                    '-p', str(processes)], cwd=data_dir, check=True, stdout=subprocess.DEVNULL,
+                   env=dict(os.environ, DL_TABLE_READS=reads_log))
+    with open(reads_log, encoding='utf-8') as f:
+        return Counter(os.path.basename(line.rstrip('\n')) for line in f)
+
+
+def run(data_dir, scale, seed, repeat, processes):
+    results = {}
+    generator = Generator(scale, seed)
+    results['generate'], paths = timed(lambda: generator.build(process_tables()).write(data_dir), repeat=1)
+    text_label_jp = os.path.join(data_dir, 'TextLabelJP.json')
+    with open(text_label_jp, 'w', encoding='utf-8') as f:
+        json.dump([{'_Id': k, '_Text': v + ' JP'} for k, v in generator.labels.items()], f, ensure_ascii=False)
+
+    db, stages = load_database(os.path.join(data_dir, 'dl.sqlite'), paths, text_label_jp)
+    results.update(stages)
+    out_dir = os.path.join(data_dir, 'out')
+    for name, view, folder in EXPORTERS:
+        results[name], _ = timed(view(db).export_all_to_folder, os.path.join(out_dir, folder), repeat=repeat)
+    db.conn.close()
+
+    results['misc adventurers'], _ = timed(run_misc, paths, os.path.join(out_dir, 'misc'), repeat=repeat)
+    results['wikitext'], reads = timed(run_wikitext, data_dir, paths, os.path.join(out_dir, 'wikitext'), processes,
+                                       repeat=repeat)
+    return results, reads
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Time every pipeline stage on synthetic data.')
+    parser.add_argument('-n', type=int, help='scale, number of synthetic adventurers', default=100)
+    parser.add_argument('-s', type=int, help='random seed', default=1)
+    parser.add_argument('-r', type=int, help='repeats of the export stages, best time is kept', default=1)
+    parser.add_argument('-p', type=int, help='wikitext parser processes', default=1)
+    parser.add_argument('-d', type=str, help='data dir to keep the synthetic data and outputs (default: temporary)', default=None)
+    parser.add_argument('-o', type=str, help='results json', default='pipeline.json')
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_dir = args.d or tmp_dir
+        os.makedirs(data_dir, exist_ok=True)
+        results, reads = run(data_dir, args.n, args.s, args.r, args.p)
+    # stages do unrelated work, so there is no baseline to compare them against
+    print(f'Pipeline stages at scale {args.n}, seed {args.s}')
+    for name, elapsed in results.items():
+        print(f'  {name:<24}{elapsed * 1000:>12.2f} ms')
+    reread = {table: count for table, count in reads.items() if count > 1}
+    print(f'Wikitext table reads with {args.p} processes: {sum(reads.values())} reads of {len(reads)} tables')
+    for table, count in sorted(reread.items()):
+        print(f'  {table:<24}{count:>12} reads')
+    with open(args.o, 'w', encoding='utf-8') as f:
+        json.dump({
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'scale': args.n,
+            'seed': args.s,
+            'repeat': args.r,
+            'processes': args.p,
+            'stages': results,
+            'table_reads': dict(sorted(reads.items()))
+        }, f, indent=2)
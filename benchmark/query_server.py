@@ -0,0 +1,94 @@
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+
+from aiohttp.test_utils import TestClient, TestServer
+
+from benchmark import report
+from benchmark.pipeline import load_database
+from benchmark.synthetic import Generator, process_tables, MASTER_DIR
+
+from loader.Database import DBManager
+from loader.Master import load_json
+from Query_Server import QueryServer
+
+
+def relabel(db_file, master_dir, key, text):
+    # what Load_Database does to a served database, from its own manager
+    text_label = os.path.join(master_dir, 'TextLabel.json')
+    with open(text_label, encoding='utf-8') as f:
+        labels = json.load(f)
+    for row in labels:
+        if row['_Id'] == key:
+            row['_Text'] = text
+    with open(text_label, 'w', encoding='utf-8') as f:
+        json.dump(labels, f, ensure_ascii=False)
+    db = DBManager(db_file)
+    load_json(db, text_label, 'TextLabel')
+    db.build_text_labels()
+    db.close()
+
+
+async def serve(db_file, master_dir, workers, requests):
+    db = DBManager(db_file, readers=workers)
+    server = QueryServer(db, workers=workers)
+    skill_id, name_key = db.query_one('SELECT _Id, _Name FROM SkillData WHERE _Name!=\'\' ORDER BY _Id', (), tuple)
+    url = f'/SkillData/{skill_id}'
+    async with TestClient(TestServer(server.make_app())) as client:
+        async def fetch(path=url, headers=None):
+            async with client.get(path, headers=headers) as resp:
+                return resp.status, resp.headers.get('ETag'), await resp.read()
+
+        status, etag, body = await fetch()
+        assert status == 200, status
+        old_name = json.loads(body)['_Name']
+        assert await fetch(headers={'If-None-Match': etag}) == (304, etag, b'')
+
+        relabel(db_file, master_dir, name_key, f'{old_name} Renamed')
+        status, new_etag, body = await fetch()
+        assert status == 200, status
+        assert new_etag != etag, 'the build did not change with the labels'
+        assert json.loads(body)['_Name'] == f'{old_name} Renamed', json.loads(body)['_Name']
+        assert (await fetch(headers={'If-None-Match': etag}))[0] == 200
+
+        paths = [f'/SkillData/{pk}' for pk, in db.query_many('SELECT _Id FROM SkillData', (), tuple)][:requests]
+        for _ in range(2):
+            server.cache.clear()
+            start = asyncio.get_running_loop().time()
+            uncached = await asyncio.gather(*map(fetch, paths))
+            uncached_time = asyncio.get_running_loop().time() - start
+            start = asyncio.get_running_loop().time()
+            cached = await asyncio.gather(*map(fetch, paths))
+            cached_time = asyncio.get_running_loop().time() - start
+            assert cached == uncached
+    return len(paths), uncached_time, cached_time
+
+
+def run(data_dir, scale, seed, workers, requests):
+    generator = Generator(scale, seed)
+    paths = generator.build(process_tables()).write(data_dir)
+    text_label_jp = os.path.join(data_dir, 'TextLabelJP.json')
+    with open(text_label_jp, 'w', encoding='utf-8') as f:
+        json.dump([{'_Id': k, '_Text': v + ' JP'} for k, v in generator.labels.items()], f, ensure_ascii=False)
+    db_file = os.path.join(data_dir, 'dl.sqlite')
+    db, _ = load_database(db_file, paths, text_label_jp)
+    # served while it is reloaded, as with Load_Database --wal
+    db.use_wal()
+    db.close()
+    return asyncio.run(serve(db_file, paths[MASTER_DIR], workers, requests))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Rebuild the labels under a running query server and time its cache.')
+    parser.add_argument('-n', type=int, help='scale, number of synthetic adventurers', default=20)
+    parser.add_argument('-s', type=int, help='random seed', default=1)
+    parser.add_argument('-w', type=int, help='lookup threads', default=4)
+    parser.add_argument('-r', type=int, help='number of skills requested', default=200)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        count, uncached_time, cached_time = run(tmp_dir, args.n, args.s, args.w, args.r)
+    print('Labels rebuilt under a running server are served with a new ETag')
+    report(f'Query server, {count} SkillData lookups with {args.w} threads',
+           {'uncached': uncached_time, 'cached': cached_time})
@@ -0,0 +1,90 @@
+import argparse
+import csv
+import os
+import tempfile
+
+from benchmark import timed, report
+
+import Process_DL_Data
+from Process_DL_Data import DataParser, DATA_PARSER_PROCESSING
+
+QUEST_COLUMNS = ['_Id', '_Gid', '_QuestViewName', '_GroupType', '_SectionName', '_Elemental', '_DifficultyLimit',
+                 '_Difficulty', '_SkipTicketCount', '_PayStaminaSingle', '_CampaignStaminaSingle', '_PayStaminaMulti',
+                 '_CampaignStaminaMulti', '_PayEntityType', '_PayEntityId', '_PayEntityQuantity', '_ClearTermsType',
+                 '_FailedTermsType', '_FailedTermsTimeElapsed', '_ContinueLimit', '_RebornLimit', '_ThumbnailImage',
+                 '_AutoPlayType']
+REWARD_COLUMNS = ['_Id'] + [f'_FirstClearSetEntity{k}{i}' for i in range(1, 6) for k in ('Type', 'Id', 'Quantity')] + \
+                 [f'_Mission{k}{i}' for i in range(1, 4) for k in ('CompleteType', 'CompleteValues', 'sClearSetEntityType',
+                                                                   'sClearSetEntityQuantity')] + \
+                 ['_MissionCompleteEntityType', '_MissionCompleteEntityQuantity']
+BONUS_COLUMNS = ['_Id', '_QuestBonusType', '_QuestBonusCount']
+
+
+def quest_id(i):
+    return str(200000000 + i)
+
+
+def write_csv(path, columns, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        writer.writerows(rows)
+
+
+def write_quests(in_dir, count, missing):
+    write_csv(os.path.join(in_dir, 'QuestData.txt'), QUEST_COLUMNS, (
+        [quest_id(i), str(i // 10), f'QUEST_NAME_{i}', str(i % 3), f'QUEST_SECTION_{i % 100}', str(i % 6), str(i % 2),
+         str(i % 10000), str(i % 3 - 1), str(i % 30), str(i % 15), str(i % 2), '1', str(i % 33 if i % 7 == 0 else 0),
+         str(i % 5), '1', str(i % 4), str(i % 7), str(i % 2 * 300), '3', '0', f'thumb_{i}', str(i % 2)]
+        for i in range(1, count + 1)))
+    # rewards arrive in a different order than the quests, plus some for quests that do not exist
+    write_csv(os.path.join(in_dir, 'QuestRewardData.txt'), REWARD_COLUMNS, (
+        [quest_id(i)] + [v for k in range(1, 6) for v in (('4', '8', '23')[(i + k) % 3], str(100 + k), str(k * 10))] +
+        [v for k in range(1, 4) for v in (('1', '15', '18')[(i + k) % 3], str(k), '8', str(k))] + ['8', '5']
+        for i in list(range(count, 0, -2)) + list(range(1, count + 1, 2)) + [count + k for k in range(1, missing + 1)]))
+    write_csv(os.path.join(in_dir, 'QuestEvent.txt'), BONUS_COLUMNS, (
+        [str(i), str(i % 2 + 1), '3'] for i in range(1, count // 10 + 1)))
+
+
+def run(in_dir, out_dir, streaming):
+    Process_DL_Data.in_dir = in_dir
+    Process_DL_Data.TABLES.clear()
+    template, formatter, process_info = DATA_PARSER_PROCESSING['QuestData']
+    parser = DataParser('QuestData', template, formatter, process_info)
+    if streaming:
+        # rewards and bonuses are taken by quest id as each quest is written
+        parser.stream(out_dir)
+    else:
+        parser.process()
+        parser.emit(out_dir)
+    with open(os.path.join(out_dir, 'QuestData.txt'), encoding='utf-8') as f:
+        return f.read()
+
+
+def compare(in_dir, out_dir, count):
+    write_quests(in_dir, count, missing=3)
+    accumulate_time, accumulated = timed(run, in_dir, out_dir, False, repeat=1)
+    stream_time, streamed = timed(run, in_dir, out_dir, True, repeat=1)
+    assert accumulated == streamed
+    report(f'QuestData wikitext over {count} quests, identical output', {'accumulate': accumulate_time, 'stream': stream_time})
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the QuestData parser, rewards and bonuses looked up by quest id.')
+    parser.add_argument('-n', type=int, help='number of synthetic quests for the streamed run', default=200000)
+    parser.add_argument('-s', type=int, help='number of quests to compare against the accumulated output', default=5000)
+    args = parser.parse_args()
+    Process_DL_Data.TEXT_LABEL_DICT['en'] = {}
+    Process_DL_Data.RAID_ITEM_LABELS = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        in_dir = os.path.join(tmp_dir, 'in') + '/'
+        out_dir = os.path.join(tmp_dir, 'out') + '/'
+        os.makedirs(in_dir)
+        os.makedirs(out_dir)
+        compare(in_dir, out_dir, args.s)
+        write_quests(in_dir, args.n, missing=0)
+        stream_time, output = timed(run, in_dir, out_dir, True, repeat=1)
+        ids = [line.split('=', 1)[1] for line in output.splitlines() if line.startswith('|Id=')]
+        assert ids == [quest_id(i) for i in range(1, args.n + 1)]
+        assert output.count('|FirstClearRewards=') == args.n
+        report(f'QuestData wikitext over {args.n} quests, output in QuestData order', {'stream': stream_time})
@@ -0,0 +1,523 @@
+"""Synthetic game data for the benchmarks, at a configurable scale.
+
+Master tables carry every field the pipeline reads (collected from the sources, like the real
+tables carry hundreds of columns) with ids that link across tables the way the real data does.
+The same rows are written as master JSON for loader/exporter/misc and as CSV for Process_DL_Data.
+"""
+import csv
+import glob
+import itertools
+import json
+import os
+import random
+import re
+
+from benchmark import ROOT_DIR
+
+SOURCES = ['Process_DL_Data.py', 'Enemy_Parser.py', 'exporter/*.py', 'misc/*.py']
+FIELD = re.compile(r'''['"](_[A-Z][A-Za-z0-9]*(?:\{[^}'"]*\}[A-Za-z0-9]*)*)['"]''')
+PLACEHOLDER = re.compile(r'\{([^}]*)\}')
+# built from pieces the scan cannot see, e.g. row['_' + 'Min{}{}'.format(stat, i)]
+EXTRA_FIELDS = ['_Min{s}{i}', '_Max{s}', '_AddMax{s}1', '_Plus{s}{i}', '_McFullBonus{s}5', '_Text{i}',
+                '_FirstClearSetEntityId{i}', '_FirstClearSetEntityQuantity{i}', '_CraftEntityType{i}',
+                '_MaterialsId{i}', '_MaterialsNum{i}', '_CharaType']
+STAT_NAMES = ('Hp', 'Atk')
+TEXT_FIELD = re.compile(r'(Name|Text|Label|Str|Icon|Info|Details?|Description\d?|Profile|Image|Voice|Effect)$')
+
+# values of the generic Process_DL_Data tables that are looked up in fixed mappings
+GENERIC_VALUES = {
+    '_TotalWallLevel': lambda i: i,
+    '_RewardEntityType': lambda i: 18,
+    '_RewardEntityId': lambda i: 0,
+    '_Level': lambda i: i % 3,
+    '_Odds': lambda i: 'FortFruitOdds_1',
+    '_PayEntityId': lambda i: 2200131,
+    '_Elemental': lambda i: i % 7,
+    '_AbilityType1UpValue': lambda i: i % 2,
+    '_TribeType': lambda i: i % 9,
+    '_EntityType': lambda i: i % 32,
+    '_QuestBonusType': lambda i: i % 3,
+}
+
+MASTER_DIR = 'master'
+ACTIONS_DIR = 'actions'
+CHARACTER_MOTION_DIR = 'characters_motion'
+DRAGON_MOTION_DIR = 'dragon_motion'
+MISC_DIR = 'misc'
+CSV_DIR = 'csv'
+
+# loader.Actions CommandType values
+PARTS_MOTION = 2
+MARKER = 8
+BULLET = 9
+HIT = 10
+EFFECT = 11
+SOUND = 12
+SEND_SIGNAL = 14
+ACTIVE_CANCEL = 15
+MULTI_BULLET = 24
+ANIMATION = 25
+
+
+def expand_field(template):
+    placeholders = PLACEHOLDER.findall(template)
+    if not placeholders:
+        return [template]
+    choices = []
+    for name in placeholders:
+        if name == 's':
+            choices.append(STAT_NAMES)
+        elif name.endswith(':02'):
+            choices.append([f'{i:02}' for i in range(1, 13)])
+        elif name == 'a':
+            choices.append('abc')
+        else:
+            choices.append([str(i) for i in range(0, 6)])
+    parts = PLACEHOLDER.split(template)
+    fields = []
+    for values in itertools.product(*choices):
+        field = parts[0]
+        for value, rest in zip(values, parts[2::2]):
+            field += value + rest
+        fields.append(field)
+    return fields
+
+
+def source_fields():
+    templates = set(EXTRA_FIELDS)
+    for pattern in SOURCES:
+        for path in glob.glob(os.path.join(ROOT_DIR, pattern)):
+            with open(path, encoding='utf-8') as f:
+                templates.update(FIELD.findall(f.read()))
+    fields = {field for template in templates for field in expand_field(template)}
+    fields.discard('_Id')
+    return ['_Id'] + sorted(fields)
+
+
+class Generator:
+    """Builds linked master rows for `scale` adventurers, the rest of the data scales with it."""
+    def __init__(self, scale=100, seed=1, clip_frames=600):
+        self.scale = scale
+        self.rng = random.Random(seed)
+        self.clip_frames = clip_frames
+        self.fields = source_fields()
+        self.labels = {}
+        self.tables = {}
+        self.actions = {}
+        self.hit_labels = []
+
+    def label(self, key, text=None):
+        self.labels[key] = text or key.replace('_', ' ').title()
+        return key
+
+    def blank(self, row_id, fill=0):
+        row = {}
+        for field in self.fields:
+            row[field] = '' if TEXT_FIELD.search(field) else fill
+        row['_Id'] = row_id
+        return row
+
+    def row(self, table, row_id, fill=0, **values):
+        row = self.blank(row_id, fill)
+        row.update(values)
+        self.tables.setdefault(table, []).append(row)
+        return row
+
+    # player actions and their hit attributes
+    def hit_attribute(self, label, levels=False):
+        ids = [f'{label}_LV0{lv}' for lv in range(1, 5)] if levels else [label]
+        for hit_id in ids:
+            self.row('PlayerActionHitAttribute', hit_id,
+                     _DamageAdjustment=round(self.rng.uniform(0.5, 12), 2),
+                     _ToBreakDmgRate=1, _ToOdDmgRate=1, _TargetGroup=6, _HitExecType=1,
+                     _ActionCondition1=self.rng.choice(self.action_conditions) if self.rng.random() < 0.3 else 0,
+                     _KillerState1=self.rng.choice((0, 0, 1, 4)), _KillerStateDamageRate=1.2,
+                     _AdditionRecoverySp=self.rng.randint(0, 300))
+        return ids[0]
+
+    def command(self, command_type, seconds, **data):
+        base = {'commandType': command_type, '_seconds': round(seconds, 3), '_speed': 1.0,
+                '_duration': round(self.rng.uniform(0, 1), 3), '_activateId': 0}
+        base.update(data)
+        return {'_data': base, 'm_Name': f'Command{command_type}'}
+
+    def action(self, action_id, hits=3, next_action=0, levels=False):
+        label_base = f'ACT_{action_id}'
+        commands = [self.command(PARTS_MOTION, 0, _motionState=f'combo{action_id % 5}', _motionFrame=0,
+                                 _blendDuration=0.1, _isBlend=1, _isEndSyncMotion=0, _isIgnoreFinishCondition=0,
+                                 _isIdleAfterCancel=0)]
+        seconds = 0.1
+        for i in range(hits):
+            label = self.hit_attribute(f'{label_base}_H{i:02}', levels=levels)
+            self.hit_labels.append(label)
+            kind = self.rng.choice((HIT, HIT, BULLET, MULTI_BULLET))
+            # sped up and slowed down parts, hit timing divides by _speed
+            speed = self.rng.choice((1.0, 0.8, 1.25))
+            if kind == HIT:
+                commands.append(self.command(HIT, seconds, _speed=speed, _hitLabel=label, _collisionHitInterval=0.1,
+                                             _isHitDelete=1))
+            else:
+                commands.append(self.command(kind, seconds, _speed=speed, _hitAttrLabel=label, _delayTime=0.05,
+                                             _delayVisible=1, _collisionHitInterval=0.1, _isHitDelete=1,
+                                             _bulletSpeed=20.0, _generateNum=3, _generateDelay=0.1,
+                                             _arrangeBullet={'_abHitAttrLabel': ''}))
+            commands.append(self.command(EFFECT, seconds, _effectName=f'EFF_{action_id}_{i}', _isAttach=1))
+            commands.append(self.command(SOUND, seconds, _soundName=f'SE_{action_id}_{i}', _isLoop=0))
+            seconds += self.rng.uniform(0.1, 0.4)
+        commands.append(self.command(MARKER, 0, _chargeSec=0.5, _chargeLvSec=[0.0, 0.0]))
+        commands.append(self.command(SEND_SIGNAL, seconds, _signalType=1, _motionEnd=0, _actionId=0, _decoId=0,
+                                     _keepActionEnd=0, _keepActionId1=0, _keepActionId2=0))
+        commands.append(self.command(ACTIVE_CANCEL, seconds, _actionId=next_action, _actionType=0, _motionEnd=1))
+        commands.append(self.command(ANIMATION, 0, _name=f'anim_{action_id}', _isVisible=1, _isActionClear=0))
+        commands.append({'m_Name': 'PartsRoot'})
+        self.actions[action_id] = commands
+        self.row('PlayerAction', action_id, _ActionName=self.label(f'ACTION_NAME_{action_id}'),
+                 _NextAction=next_action, _BurstMarkerId=0, _MaxAdditionalInput=0)
+        return action_id
+
+    def combo(self, base_id, length):
+        for i in range(length):
+            self.action(base_id + i, hits=1 + i % 3, next_action=base_id + i + 1 if i + 1 < length else 0)
+        return base_id
+
+    # master tables
+    def action_condition_rows(self):
+        self.action_conditions = []
+        for i in range(1, self.scale + 1):
+            self.row('ActionCondition', i, _Type=self.rng.choice((0, 1, 2, 3)), _Text=self.label(f'ACTION_CONDITION_{i}'),
+                     _DurationSec=self.rng.choice((0, 10, 15)), _RateAttack=0.1, _EnhancedSkill1=0)
+            self.action_conditions.append(i)
+
+    def ability(self, ability_id, ref=0):
+        a_type, various = (43, ref) if ref else self.rng.choice(((1, 2), (2, 5), (14, self.action_conditions[0]), (20, 4)))
+        return self.row('AbilityData', ability_id, _Name=self.label(f'ABILITY_NAME_{ability_id}'),
+                        _Details=self.label(f'ABILITY_DETAIL_{ability_id}'), _AbilityType1=a_type,
+                        _VariousId1a=various, _AbilityType1UpValue=self.rng.choice((5, 10, 15)),
+                        _ConditionType=self.rng.choice((0, 1, 2)))['_Id']
+
+    def skill(self, skill_id, action_id, trans=0):
+        ability = self.ability(skill_id * 10)
+        return self.row('SkillData', skill_id, _Name=self.label(f'SKILL_NAME_{skill_id}'),
+                        **{f'_Description{i}': self.label(f'SKILL_DETAIL_{skill_id}_{i}') for i in range(1, 5)},
+                        **{f'_ActionId{i}': action_id for i in range(1, 5)}, _Ability1=ability,
+                        _TransSkill=trans, _Sp=self.rng.randint(2000, 9000), _SpLv2=self.rng.randint(2000, 9000),
+                        **{f'_SkillLv{i}IconName': f'Icon_Skill_{skill_id}_{i}' for i in range(1, 5)})['_Id']
+
+    def adventurers(self):
+        for i in range(self.scale):
+            base_id = 100001 + i
+            chara_id = 10000000 + base_id
+            action_base = 100000000 + i * 1000
+            combo = self.combo(action_base, 5)
+            skills = []
+            for s in (1, 2):
+                skill_id = base_id * 10 + s
+                trans = skill_id + 2 if i % 6 == 0 else 0
+                skills.append(self.skill(skill_id, self.action(action_base + 100 + s, hits=4, levels=True), trans))
+                if trans:
+                    self.skill(trans, self.action(action_base + 110 + s, hits=4, levels=True), skill_id)
+            abilities = {}
+            for a in range(1, 4):
+                for b in range(1, 5):
+                    ability_id = base_id * 100 + a * 10 + b
+                    ref = self.ability(ability_id + 50) if (a + b + i) % 5 == 0 else 0
+                    abilities[f'_Abilities{a}{b}'] = self.ability(ability_id, ref)
+            ex_abilities = {}
+            for e in range(1, 6):
+                ex_id = base_id * 10 + e
+                self.row('ExAbilityData', ex_id, _Name=self.label(f'EX_ABILITY_NAME_{ex_id}'),
+                         _Details=self.label(f'EX_ABILITY_DETAIL_{ex_id}'), _AbilityType1=1, _VariousId1a=2)
+                ex_abilities[f'_ExAbilityData{e}'] = ex_id
+                ex_abilities[f'_ExAbility2Data{e}'] = self.ability(base_id * 100 + 90 + e)
+            modes = {}
+            if i % 5 == 0:
+                for m in (1, 2):
+                    mode_id = base_id * 10 + m
+                    unique_combo = self.combo(action_base + 200 + m * 10, 4)
+                    self.row('CharaUniqueCombo', mode_id, _ActionId=unique_combo, _MaxComboNum=4)
+                    self.row('CharaModeData', mode_id, _ActionId=self.action(action_base + 300 + m),
+                             _Skill1Id=skills[0], _Skill2Id=skills[1], _UniqueComboId=mode_id)
+                    modes[f'_ModeId{m}'] = mode_id
+            stats = {f'_{kind}{stat}{n}': self.rng.randint(100, 900)
+                     for stat in STAT_NAMES for kind, n_range in (('Min', range(3, 6)), ('Plus', range(0, 6)))
+                     for n in n_range}
+            stats.update({f'_{kind}{stat}{n}': self.rng.randint(100, 900) for stat in STAT_NAMES
+                          for kind, n in (('Max', ''), ('AddMax', '1'), ('McFullBonus', '5'))})
+            self.row('CharaData', chara_id, _BaseId=base_id, _VariationId=1,
+                     _Name=self.label(f'CHARA_NAME_{chara_id}'), _SecondName=self.label(f'CHARA_NAME_COMMENT_{chara_id}'),
+                     _CvInfo=self.label(f'CV_INFO_{chara_id}'), _CvInfoEn=self.label(f'CV_INFO_EN_{chara_id}'),
+                     _ProfileText=self.label(f'CHARA_PROFILE_{chara_id}'), _WeaponType=1 + i % 8,
+                     _ElementalType=1 + i % 5, _CharaType=1 + i % 4, _Rarity=3 + i % 3, _MaxLimitBreakCount=4 + i % 2,
+                     _Skill1=skills[0], _Skill2=skills[1], _ModeChangeType=1 if modes else 0, _IsPlayable=1,
+                     _DefaultAbility=0, _BurstAttack=self.action(action_base + 400), _EmblemId=chara_id,
+                     _MinDef=10, _DefCoef=8, _DefaultSkill=combo, _ComboMax=5,
+                     **stats, **abilities, **ex_abilities, **modes)
+
+    def dragons(self):
+        for i in range(max(1, self.scale // 2)):
+            base_id = 210001 + i
+            dragon_id = 20000000 + base_id
+            action_base = 200000000 + i * 1000
+            skill = self.skill(base_id * 10 + 1, self.action(action_base + 100, hits=3))
+            self.row('DragonData', dragon_id, _BaseId=base_id, _VariationId=1,
+                     _Name=self.label(f'DRAGON_NAME_{dragon_id}'), _SecondName=self.label(f'DRAGON_NAME_COMMENT_{dragon_id}'),
+                     _Profile=self.label(f'DRAGON_PROFILE_{dragon_id}'), _CvInfo=self.label(f'CV_INFO_{dragon_id}'),
+                     _CvInfoEn=self.label(f'CV_INFO_EN_{dragon_id}'), _ElementalType=1 + i % 5, _Rarity=3 + i % 3,
+                     _Skill1=skill, _DefaultSkill=self.combo(action_base, 3), _ComboMax=3,
+                     _AvoidActionFront=self.action(action_base + 200), _AvoidActionBack=self.action(action_base + 201),
+                     _Transform=self.action(action_base + 202), _AnimFileName='',
+                     **{f'_Abilities{a}{b}': self.ability(base_id * 100 + a * 10 + b) for a in (1, 2) for b in (1, 2)})
+
+    def weapons(self):
+        for i in range(self.scale):
+            weapon_id = 30000000 + i
+            skill = self.skill(300000 + i, self.action(300000000 + i * 10, hits=2)) if i % 3 == 0 else 0
+            self.row('WeaponData', weapon_id, _BaseId=301001 + i, _VariationId=1, _FormId=60000 + i,
+                     _Name=self.label(f'WEAPON_NAME_{weapon_id}'), _Text=self.label(f'WEAPON_TEXT_{weapon_id}'),
+                     _Type=1 + i % 8, _ElementalType=i % 6, _Rarity=1 + i % 6, _CraftSeriesId=i % 5, _Skill=skill,
+                     _Abilities11=self.ability(weapon_id * 10 + 1), _Abilities21=self.ability(weapon_id * 10 + 2),
+                     _MinHp=10, _MaxHp=100, _MinAtk=20, _MaxAtk=200, _SellCoin=500, _SellDewPoint=10)
+            self.row('WeaponCraftData', weapon_id, _FortCraftLevel=1 + i % 9, _AssembleCoin=1000,
+                     _DisassembleCoin=100, _MainWeaponId=weapon_id - 1 if i else 0, _MainWeaponQuantity=1,
+                     **{f'_CraftEntityType{k}': 8 for k in range(1, 6)},
+                     **{f'_CraftEntityId{k}': 104001001 + k for k in range(1, 6)},
+                     **{f'_CraftEntityQuantity{k}': k * 5 for k in range(1, 6)})
+            self.row('WeaponCraftTree', i + 1, _CraftWeaponId=weapon_id, _CraftNodeId=i + 1, _ParentCraftNodeId=i,
+                     _CraftGroupId=1 + i % 12)
+
+    def wyrmprints(self):
+        for i in range(self.scale):
+            amulet_id = 40000000 + i
+            self.row('AmuletData', amulet_id, _BaseId=400001 + i, _VariationId=1,
+                     _Name=self.label(f'AMULET_NAME_{amulet_id}'), _AmuletType=1 + i % 4, _Rarity=2 + i % 4,
+                     **{f'_Text{k}': self.label(f'AMULET_TEXT_{amulet_id}_{k}') for k in range(1, 6)},
+                     **{f'_Abilities{a}{b}': self.ability(amulet_id * 10 + a * 3 + b) for a in (1, 2, 3) for b in (1, 2, 3)})
+
+    def enemies(self):
+        groups = ('MAIN_01_0{}_E_0{}', 'WALL_01_0{}_0{}_E_', 'EXP_01_0{}_E_0{}', 'EVENT_{}_BOSS_{}')
+        for i in range(1, self.scale + 1):
+            self.row('EnemyList', i, _Name=self.label(f'ENEMY_NAME_{i}'), _TribeType=i % 9)
+            self.row('EnemyData', i, _BookId=i, _WeaponId=30000000 + i % self.scale, _ElementalType=1 + i % 5,
+                     _BreakDuration=10, _MoveSpeed=1.5, _TurnSpeed=2.0, _SuperArmor=100)
+            self.row('EnemyAbility', i, _Name=self.label(f'ENEMY_ABILITY_{i}'))
+            self.row('EnemyActionHitAttribute', f'ENM_{i}', _DamageAdjustment=2.0, _ActionCondition=0)
+            self.row('EnemyHitDifficulty', i, _Easy=f'ENM_{i}', _Normal=f'ENM_{i}')
+            self.row('EnemyAction', i, _ActionGroupName=i, **{f'_Name{e}': self.label(f'ENEMY_ACTION_{e}_{i}')
+                                                                for e in ('Fire', 'Water', 'Wind', 'Light', 'Dark')})
+            self.row('EnemyActionSet', i, _Action1=i)
+        for i in range(1, self.scale * 5 + 1):
+            group = groups[i % len(groups)].format(1 + i % 7, 1 + i % 3)
+            self.row('EnemyParam', 500000000 + i, _DataId=1 + i % self.scale, _ParamGroupName=group,
+                     _HP=self.rng.randint(1000, 900000), _Atk=self.rng.randint(100, 9000), _Def=10,
+                     _Ability01=1 + i % self.scale, _ActionSet=1 + i % self.scale, _DropDpPattern=1 + i % 2,
+                     **{f'_RegistAbnormalRate{k:02}': self.rng.choice((0, 50, 100)) for k in range(1, 13)})
+
+    def quests(self):
+        for i in range(1, self.scale * 10 + 1):
+            quest_id = 200000000 + i
+            self.row('QuestData', quest_id, _Gid=20000 + i // 10, _QuestViewName=self.label(f'QUEST_NAME_{quest_id}'),
+                     _SectionName=self.label(f'QUEST_SECTION_{i % 100}'), _Elemental=i % 6, _GroupType=1 + i % 2,
+                     _DifficultyLimit=i % 2 * 5000, _Difficulty=self.rng.randint(1000, 30000),
+                     _SkipTicketCount=(-1, 0, 1)[i % 3], _PayStaminaSingle=i % 30, _PayStaminaMulti=1,
+                     _FailedTermsType=i % 7, _FailedTermsTimeElapsed=i % 2 * 300, _ContinueLimit=3,
+                     _ThumbnailImage=f'thumb_{quest_id}')
+            self.row('QuestRewardData', quest_id,
+                     **{f'_FirstClearSetEntityType{k}': (4, 8, 23)[(i + k) % 3] for k in range(1, 6)},
+                     **{f'_FirstClearSetEntityId{k}': 104001001 + k for k in range(1, 6)},
+                     **{f'_FirstClearSetEntityQuantity{k}': k * 10 for k in range(1, 6)},
+                     **{f'_MissionCompleteType{k}': (1, 15, 18)[(i + k) % 3] for k in range(1, 4)},
+                     **{f'_MissionsClearSetEntityType{k}': 8 for k in range(1, 4)})
+        for i in range(1, self.scale + 1):
+            self.row('QuestEvent', 20000 + i, _QuestBonusType=1 + i % 2, _QuestBonusCount=3)
+
+    def facilities(self):
+        for i in range(1, self.scale + 1):
+            plant_id = 100000 + i
+            self.row('FortPlantData', plant_id, _Name=self.label(f'FORT_PLANT_NAME_{plant_id}'),
+                     _Description=self.label(f'FORT_PLANT_DETAIL_{plant_id}'), _PlantSize=1 + i % 3)
+            for level in range(0, 6):
+                self.row('FortPlantDetail', plant_id * 100 + level, _AssetGroup=plant_id, _Level=level,
+                         _ImageUiName=f'Fort_{plant_id}_{level // 2}', _EffectId=1 + i % 2, _EffArgs1=level * 2,
+                         _EffArgs2=level, _Cost=level * 1000, _NeedLevel=level, _Time=level * 60,
+                         **{f'_MaterialsId{k}': 201000000 + k for k in range(1, 6)},
+                         **{f'_MaterialsNum{k}': k for k in range(1, 6)})
+
+    def generic(self, tables):
+        # the remaining Process_DL_Data inputs only need ids and labels
+        for table in tables:
+            for i in range(1, self.scale + 1):
+                row_id = 100000 + i
+                self.row(table, row_id, fill=1 + i % 4, _Name=self.label(f'{table.upper()}_NAME_{row_id}'),
+                         _Details=self.label(f'{table.upper()}_DETAIL_{row_id}'), _Rarity=1 + i % 5,
+                         **{field: value(i) for field, value in GENERIC_VALUES.items()})
+
+    def build(self, generic_tables=()):
+        self.action_condition_rows()
+        self.adventurers()
+        self.dragons()
+        self.weapons()
+        self.wyrmprints()
+        self.enemies()
+        self.quests()
+        self.facilities()
+        self.generic([t for t in generic_tables if t not in self.tables])
+        for key in list(self.labels):
+            if key.startswith(('CHARA_NAME_', 'ABILITY_NAME_', 'SKILL_NAME_')):
+                self.labels.setdefault(key + '_JP', self.labels[key])
+        return self
+
+    # writers
+    def write_master(self, out_dir):
+        os.makedirs(out_dir, exist_ok=True)
+        for table, rows in self.tables.items():
+            with open(os.path.join(out_dir, f'{table}.json'), 'w', encoding='utf-8') as f:
+                json.dump(rows, f)
+        with open(os.path.join(out_dir, 'TextLabel.json'), 'w', encoding='utf-8') as f:
+            json.dump([{'_Id': k, '_Text': v} for k, v in self.labels.items()], f, ensure_ascii=False)
+
+    def write_actions(self, out_dir):
+        os.makedirs(out_dir, exist_ok=True)
+        for action_id, commands in self.actions.items():
+            with open(os.path.join(out_dir, f'PlayerAction_{action_id:08}.json'), 'w', encoding='utf-8') as f:
+                json.dump(commands, f)
+
+    def clip(self, name):
+        # keys in the order the extractor dumps the AnimationClip type tree
+        frames = self.clip_frames
+        xform = {'t': {'x': 0.0, 'y': 0.0, 'z': 0.0, 'w': 0.0}, 'q': {'x': 0.0, 'y': 0.0, 'z': 0.0, 'w': 1.0},
+                 's': {'x': 1.0, 'y': 1.0, 'z': 1.0, 'w': 1.0}}
+        return {
+            'name': name,
+            'm_Legacy': False,
+            'm_Compressed': False,
+            'm_UseHighQualityCurve': True,
+            'm_RotationCurves': [],
+            'm_CompressedRotationCurves': [],
+            'm_EulerCurves': [],
+            'm_PositionCurves': [],
+            'm_ScaleCurves': [],
+            'm_FloatCurves': [],
+            'm_PPtrCurves': [],
+            'm_SampleRate': 60.0,
+            'm_WrapMode': 0,
+            'm_Bounds': {'m_Center': {'x': 0.0, 'y': 0.0, 'z': 0.0}, 'm_Extent': {'x': 0.0, 'y': 0.0, 'z': 0.0}},
+            'm_MuscleClipSize': frames * 64,
+            'm_MuscleClip': {
+                'm_DeltaPose': {'m_RootX': xform, 'm_LookAtPosition': {'x': 0.0, 'y': 0.0, 'z': 0.0, 'w': 0.0},
+                                'm_LookAtWeight': {'x': 0.0, 'y': 0.0, 'z': 0.0, 'w': 0.0}, 'm_GoalArray': [],
+                                'm_LeftHandPose': {}, 'm_RightHandPose': {}, 'm_DoFArray': [],
+                                'm_TDoFArray': []},
+                'm_StartX': xform,
+                'm_StopX': xform,
+                'm_LeftFootStartX': xform,
+                'm_RightFootStartX': xform,
+                'm_AverageSpeed': {'x': 0.0, 'y': 0.0, 'z': 0.0, 'w': 0.0},
+                'm_Clip': {
+                    'm_StreamedClip': {'data': [self.rng.getrandbits(32) for _ in range(frames * 4)], 'curveCount': 40},
+                    'm_DenseClip': {'m_FrameCount': frames, 'm_CurveCount': 8, 'm_SampleRate': 60.0, 'm_BeginTime': 0.0,
+                                    'm_SampleArray': [round(self.rng.random(), 5) for _ in range(frames * 8)]},
+                    'm_ConstantClip': {'data': [0.0] * 32},
+                    'm_Binding': {'m_ValueArray': [{'m_ID': k, 'm_TypeID': 4, 'm_Type': 1, 'm_Index': k}
+                                                   for k in range(48)]},
+                },
+                'm_StartTime': 0.0,
+                'm_StopTime': round(frames / 60, 4),
+                'm_OrientationOffsetY': 0.0,
+                'm_Level': 0.0,
+                'm_CycleOffset': 0.0,
+                'm_AverageAngularSpeed': 0.0,
+                'm_IndexArray': list(range(frames // 2)),
+                'm_ValueArrayDelta': [{'m_Start': 0.0, 'm_Stop': 0.0} for _ in range(48)],
+                'm_ValueArrayReferencePose': [0.0] * 48,
+                'm_Mirror': False,
+                'm_LoopTime': False,
+            },
+            'm_ClipBindingConstant': {'genericBindings': [{'path': self.rng.getrandbits(32), 'attribute': k,
+                                                           'script': {'m_FileID': 0, 'm_PathID': 0},
+                                                           'typeID': 95, 'customType': 8, 'isPPtrCurve': 0}
+                                                          for k in range(40)],
+                                      'pptrCurveMapping': []},
+            'm_HasGenericRootTransform': False,
+            'm_HasMotionFloatCurves': False,
+            'm_Events': [],
+        }
+
+    def write_motions(self, character_dir, dragon_dir):
+        os.makedirs(character_dir, exist_ok=True)
+        os.makedirs(dragon_dir, exist_ok=True)
+        for row in self.tables['CharaData']:
+            for motion in ('CMB_01', 'SKL_01', 'DGE_01'):
+                name = f'SWD_{motion[:3]}_{motion[4:]}_01_{row["_BaseId"]}01'
+                with open(os.path.join(character_dir, f'{name}.json'), 'w', encoding='utf-8') as f:
+                    json.dump(self.clip(name), f, indent=2)
+        for row in self.tables['DragonData']:
+            for motion in range(1, 4):
+                name = f'D{row["_BaseId"]}01_{motion:03}_01'
+                with open(os.path.join(dragon_dir, f'{name}.json'), 'w', encoding='utf-8') as f:
+                    json.dump(self.clip(name), f, indent=2)
+
+    def write_csv(self, out_dir):
+        os.makedirs(out_dir, exist_ok=True)
+        for table, rows in self.tables.items():
+            with open(os.path.join(out_dir, f'{table}.txt'), 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(self.fields)
+                for row in rows:
+                    writer.writerow(row[field] for field in self.fields)
+        for table, suffix in (('TextLabel', ''), ('TextLabelJP', ' JP')):
+            with open(os.path.join(out_dir, f'{table}.txt'), 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f, dialect='excel-tab')
+                writer.writerow(('_Id', '_Text'))
+                writer.writerows((k, v + suffix) for k, v in self.labels.items())
+
+    def write(self, out_dir):
+        """Lays out out_dir like the extract dirs each stage reads, returns the paths by name."""
+        paths = {name: os.path.join(out_dir, name) for name in
+                 (MASTER_DIR, ACTIONS_DIR, CHARACTER_MOTION_DIR, DRAGON_MOTION_DIR, MISC_DIR, CSV_DIR)}
+        self.write_master(paths[MASTER_DIR])
+        self.write_actions(paths[ACTIONS_DIR])
+        self.write_motions(paths[CHARACTER_MOTION_DIR], paths[DRAGON_MOTION_DIR])
+        self.write_csv(paths[CSV_DIR])
+        # misc reads master files, actions and motions from a single extract dir
+        misc_dir = paths[MISC_DIR]
+        os.makedirs(misc_dir, exist_ok=True)
+        for path in glob.glob(os.path.join(paths[MASTER_DIR], '*.json')):
+            link_file(path, os.path.join(misc_dir, os.path.basename(path)))
+        for name in (ACTIONS_DIR, CHARACTER_MOTION_DIR):
+            os.makedirs(os.path.join(misc_dir, name), exist_ok=True)
+            for path in glob.glob(os.path.join(paths[name], '*.json')):
+                link_file(path, os.path.join(misc_dir, name, os.path.basename(path)))
+        with open(os.path.join(out_dir, 'ManualMapRelations.txt'), 'w', newline='', encoding='utf-8') as f:
+            csv.writer(f, dialect='excel-tab').writerows([('_GroupName', '_QuestName'),
+                                                          ('EVENT_1_BOSS_1', 'Event Boss')])
+        return paths
+
+
+def process_tables():
+    """Input tables of Process_DL_Data and Enemy_Parser."""
+    import Process_DL_Data
+    tables = []
+    for processing in (Process_DL_Data.DATA_PARSER_PROCESSING, Process_DL_Data.KV_PROCESSING):
+        for name, (_, _, process_info) in processing.items():
+            for table, _ in (process_info if isinstance(process_info, list) else [(name, process_info)]):
+                tables.append(table)
+    tables.extend(('EnemyParam', 'EnemyData', 'EnemyList', 'FortPlantDetail', 'AbilityShiftGroup'))
+    return list(dict.fromkeys(tables))
+
+
+def link_file(source, target):
+    try:
+        os.link(source, target)
+    except OSError:
+        with open(source, 'rb') as src, open(target, 'wb') as dst:
+            dst.write(src.read())
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Write synthetic game data for the benchmarks.')
+    parser.add_argument('-o', type=str, help='output dir', required=True)
+    parser.add_argument('-n', type=int, help='scale, number of adventurers', default=100)
+    parser.add_argument('-s', type=int, help='random seed', default=1)
+    args = parser.parse_args()
+    Generator(args.n, args.s).build(process_tables()).write(args.o)
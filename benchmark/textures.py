@@ -0,0 +1,62 @@
+import argparse
+import os
+import tempfile
+
+from PIL import Image, ImageDraw
+
+from benchmark import timed
+
+from loader.TextureEncoder import TextureEncoder, PNG, WEBP, RGBA
+
+OPTIONS = (
+    ('png (PIL default)', dict(fmt=PNG)),
+    ('png level 1', dict(fmt=PNG, compress_level=1)),
+    ('png level 9 optimize', dict(fmt=PNG, compress_level=9, optimize=True)),
+    ('webp lossless', dict(fmt=WEBP)),
+    ('webp lossless method 0', dict(fmt=WEBP, method=0)),
+    ('rgba raw', dict(fmt=RGBA)),
+)
+
+
+def make_texture(size, seed):
+    # flat areas, gradients and noise, roughly how icons and portraits compress
+    gradient = Image.linear_gradient('L').resize((size, size))
+    noise = Image.effect_noise((size, size), 32 + seed % 32)
+    img = Image.merge('RGBA', (gradient, noise, gradient.rotate(90), Image.new('L', (size, size), 255)))
+    draw = ImageDraw.Draw(img)
+    for i in range(8):
+        offset = (seed * 37 + i * 61) % (size // 2)
+        draw.ellipse((offset, offset, offset + size // 3, offset + size // 4), fill=(i * 30, 80, 200 - i * 20, 255))
+    return img
+
+
+def encode_all(textures, out_dir, options, workers):
+    encoder = TextureEncoder(workers=workers, **options)
+    for i, img in enumerate(textures):
+        encoder.save(img, os.path.join(out_dir, f'texture_{i}'))
+    encoder.close()
+
+
+def output_bytes(out_dir):
+    return sum(entry.stat().st_size for entry in os.scandir(out_dir))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare texture output formats, bytes against seconds.')
+    parser.add_argument('-n', type=int, help='number of synthetic textures', default=32)
+    parser.add_argument('-s', type=int, help='texture size in pixels', default=512)
+    parser.add_argument('-w', type=int, help='encoding threads for the pooled runs', default=os.cpu_count() or 1)
+    parser.add_argument('-r', type=int, help='repeats, best time is kept', default=3)
+    args = parser.parse_args()
+    textures = [make_texture(args.s, i) for i in range(args.n)]
+    raw = args.n * args.s * args.s * 4
+    print(f'{args.n} textures of {args.s}x{args.s}, {raw / 2**20:.1f} MiB of RGBA')
+    print(f'  {"format":<24}{"MiB":>10}{"ratio":>8}{"inline s":>12}{f"{args.w} threads s":>14}')
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, options in OPTIONS:
+            out_dir = os.path.join(tmp_dir, name.replace(' ', '_'))
+            os.makedirs(out_dir)
+            inline, _ = timed(encode_all, textures, out_dir, options, 0, repeat=args.r)
+            pooled, _ = timed(encode_all, textures, out_dir, options, args.w, repeat=args.r)
+            size = output_bytes(out_dir)
+            print(f'  {name:<24}{size / 2**20:>10.2f}{raw / size:>8.2f}{inline:>12.3f}{pooled:>14.3f}')
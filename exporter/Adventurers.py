@@ -1,7 +1,9 @@
+import argparse
 import json
 import os
 
 from loader.Database import DBManager, DBView
+from loader.Profile import add_profile_argument
 from loader.Actions import CommandType
 from exporter.Shared import AbilityData, SkillData, PlayerAction
 from exporter.Mappings import WEAPON_TYPES, ELEMENTS, CLASS_TYPES
@@ -168,6 +170,9 @@ class CharaData(DBView):
         super().export_all_to_folder(out_dir, ext, exclude_falsy=exclude_falsy, condense=True)
 
 if __name__ == '__main__':
-    db = DBManager()
+    parser = argparse.ArgumentParser(description='Export adventurer data.')
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    db = DBManager(profile=args.profile)
     view = CharaData(db)
     view.export_all_to_folder()
\ No newline at end of file
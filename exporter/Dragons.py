@@ -1,7 +1,9 @@
+import argparse
 import json
 import os
 
 from loader.Database import DBManager, DBView
+from loader.Profile import add_profile_argument
 from exporter.Shared import AbilityData, SkillData, PlayerAction
 
 class DragonMotion(DBView):
@@ -55,6 +57,9 @@ class DragonData(DBView):
         super().export_all_to_folder(out_dir, ext, exclude_falsy=exclude_falsy, full_query=True, full_abilities=False)
 
 if __name__ == '__main__':
-    db = DBManager()
+    parser = argparse.ArgumentParser(description='Export dragon data.')
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    db = DBManager(profile=args.profile)
     view = DragonData(db)
     view.export_all_to_folder()
\ No newline at end of file
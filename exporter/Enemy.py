@@ -1,11 +1,14 @@
+import argparse
 import os
 import json
 import re
 from collections import defaultdict
 
-from loader.Database import DBManager, DBView, DBDict, check_target_path
+from loader.Database import DBManager, DBView, DBDict, check_target_path, expand_deferred
+from loader.Profile import add_profile_argument
 from exporter.Shared import ActionCondition, get_valid_filename
 from exporter.Mappings import AFFLICTION_TYPES, TRIBE_TYPES, ELEMENTS
+from Enemy_Parser import QuestNameResolver
 
 class EnemyAbility(DBView):
     def __init__(self, db):
@@ -171,6 +174,7 @@ class EnemyParam(DBView):
     #     return get_valid_filename(f'{res["_Id"]:02}_{name}{ext}')
 
     PARAM_GROUP = re.compile(r'([^\d]+)_\d{2}_\d{2}_E_?\d{2}')
+    PARAM_GROUPS = QuestNameResolver({PARAM_GROUP: lambda group: group}, fallback=lambda name: name.split('_', 1)[0])
     def export_all_to_folder(self, out_dir='./out/enemies', ext='.json', exclude_falsy=True):
         # super().export_all_to_folder(out_dir, ext, fn_mode='a', exclude_falsy=exclude_falsy, full_actions=False)
         all_res = self.get_all(exclude_falsy=exclude_falsy)
@@ -178,17 +182,18 @@ class EnemyParam(DBView):
         sorted_res = defaultdict(lambda: [])
         for res in all_res:
             if '_ParamGroupName' in res:
-                if (match := self.PARAM_GROUP.match(res['_ParamGroupName'])):
-                    sorted_res[match.group(1)].append(self.process_result(res, exclude_falsy=exclude_falsy))
-                else:
-                    sorted_res[res['_ParamGroupName'].split('_', 1)[0]].append(self.process_result(res, exclude_falsy=exclude_falsy))
+                group_name = self.PARAM_GROUPS.resolve(res['_ParamGroupName'])
+                sorted_res[group_name].append(self.process_result(res, exclude_falsy=exclude_falsy))
         for group_name, res_list in sorted_res.items():
             out_name = get_valid_filename(f'{group_name}{ext}')
             output = os.path.join(out_dir, out_name)
             with open(output, 'w', newline='', encoding='utf-8') as fp:
-                json.dump(res_list, fp, indent=2, ensure_ascii=False)
+                json.dump(res_list, fp, indent=2, ensure_ascii=False, default=expand_deferred)
 
 if __name__ == '__main__':
-    db = DBManager()
+    parser = argparse.ArgumentParser(description='Export enemy data.')
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    db = DBManager(profile=args.profile)
     view = EnemyParam(db)
     view.export_all_to_folder()
\ No newline at end of file
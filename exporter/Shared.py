@@ -3,7 +3,7 @@ import re
 import os
 import errno
 
-from loader.Database import DBManager, DBView, DBDict
+from loader.Database import DBManager, DBView, DBDict, memoized_subtree, or_default
 from loader.Actions import CommandType
 from exporter.Mappings import AFFLICTION_TYPES, ABILITY_CONDITION_TYPES
 
@@ -109,6 +109,7 @@ class AbilityData(DBView):
                         ability_data[ak] = self.attrs.get(ability_data[ak], by='_Id', exclude_falsy=exclude_falsy)
         return ability_data
 
+    @memoized_subtree
     def get(self, key, fields=None, full_query=True, exclude_falsy=True):
         ability_data = super().get(key, fields=fields, exclude_falsy=exclude_falsy)
         if not full_query:
@@ -116,6 +117,7 @@ class AbilityData(DBView):
         return self.process_result(ability_data, fields, full_query, exclude_falsy)
 
 class PlayerActionHitAttribute(DBView):
+    LV_SUFFIX = re.compile(r'(.*LV)(\d{2})')
     def __init__(self, db):
         super().__init__(db, 'PlayerActionHitAttribute')
         self.action_condition = ActionCondition(db)
@@ -124,23 +126,35 @@ class PlayerActionHitAttribute(DBView):
         res_list = [res] if isinstance(res, dict) else res
         for r in res_list:
             if '_ActionCondition1' in r and r['_ActionCondition1']:
+                # the id stays when there is no such condition
                 act_cond = self.action_condition.get(r['_ActionCondition1'], exclude_falsy=exclude_falsy)
-                if act_cond:
-                    r['_ActionCondition1'] = act_cond
+                r['_ActionCondition1'] = or_default(act_cond, r['_ActionCondition1'])
         return res
 
     def get(self, pk, by=None, fields=None, order=None, mode=DBManager.EXACT, exclude_falsy=False):
         res = super().get(pk, by, fields, order, mode, exclude_falsy)
         return self.process_result(res, exclude_falsy=exclude_falsy)
 
+    def build_levels(self):
+        levels = {}
+        for r in self.database.query_many(f'SELECT _Id FROM {self.base_table} ORDER BY _Id DESC', (), tuple):
+            res = self.LV_SUFFIX.match(r[0])
+            if res:
+                levels.setdefault(res.group(1), []).append(r[0])
+        return levels
+
+    def levels(self):
+        return self.database.table_index(self.base_table, 'levels', self.build_levels)
+
 class ActionParts(DBView):
-    LV_SUFFIX = re.compile(r'(.*LV)(\d{2})')
+    LV_SUFFIX = PlayerActionHitAttribute.LV_SUFFIX
     HIT_LABELS = ['_hitLabel', '_hitAttrLabel', '_abHitAttrLabel']
     def __init__(self, db):
         super().__init__(db, 'ActionParts')
         self.attrs = PlayerActionHitAttribute(db)
 
     def process_result(self, action_parts, exclude_falsy=False, hide_ref=True, full_hitattr=False):
+        levels = self.attrs.levels()
         for r in action_parts:
             if 'commandType' in r:
                 r['commandType'] = CommandType(r['commandType']).name
@@ -154,16 +168,15 @@ class ActionParts(DBView):
                 res = self.LV_SUFFIX.match(r[label])
                 if res:
                     base_label, _ = res.groups()
-                    hit_attrs = self.attrs.get(base_label, by='_Id', order='_Id DESC', mode=DBManager.LIKE, exclude_falsy=exclude_falsy)
-                    if hit_attrs:
-                        if isinstance(hit_attrs, dict) or full_hitattr:
-                            r[label] = hit_attrs
-                        elif len(hit_attrs) > 0:
-                            r[label] = hit_attrs[0]
+                    level_ids = levels.get(base_label)
+                    if level_ids:
+                        if full_hitattr and len(level_ids) > 1:
+                            r[label] = [self.attrs.get(hit_id, by='_Id', exclude_falsy=exclude_falsy) for hit_id in level_ids]
+                        else:
+                            r[label] = self.attrs.get(level_ids[0], by='_Id', exclude_falsy=exclude_falsy)
                 else:
                     hit_attr = self.attrs.get(r[label], by='_Id', exclude_falsy=exclude_falsy)
-                    if hit_attr:
-                        r[label] = hit_attr
+                    r[label] = or_default(hit_attr, r[label])
         return action_parts
 
     def get(self, pk, by=None, fields=None, order=None, mode=DBManager.EXACT, exclude_falsy=False, hide_ref=True, full_hitattr=False):
@@ -237,20 +250,22 @@ class SkillData(DBView):
         else:
             skill_data = self.get_last(self.abilities, '_Ability', skill_data, exclude_falsy=exclude_falsy)
         if full_transSkill and '_TransSkill' in skill_data and skill_data['_TransSkill']:
-            next_trans_skill = self.get(skill_data['_TransSkill'], exclude_falsy=exclude_falsy, full_query=full_query, full_abilities=full_abilities, full_transSkill=False)
-            trans_skill_group = {
-                skill_data['_Id']: None,
-                next_trans_skill['_Id']: next_trans_skill
-            }
-            while next_trans_skill['_TransSkill'] != skill_data['_Id']:
-                next_trans_skill = self.get(next_trans_skill['_TransSkill'], exclude_falsy=exclude_falsy, full_query=full_query, full_abilities=full_abilities, full_transSkill=False)
+            trans_skill_group = {skill_data['_Id']: None}
+            next_id = skill_data['_TransSkill']
+            # stops when the chain loops back to any skill already in the group
+            while next_id and next_id not in trans_skill_group:
+                next_trans_skill = self.get(next_id, exclude_falsy=exclude_falsy, full_query=full_query, full_abilities=full_abilities, full_transSkill=False)
+                if not next_trans_skill:
+                    break
                 trans_skill_group[next_trans_skill['_Id']] = next_trans_skill
+                next_id = next_trans_skill.get('_TransSkill')
             skill_data['_TransSkill'] = trans_skill_group
         # ChainGroupId
         if '_ChainGroupId' in skill_data and skill_data['_ChainGroupId']:
             skill_data['_ChainGroupId'] = self.chain_group.get(skill_data['_ChainGroupId'], by='_GroupId', exclude_falsy=exclude_falsy)
         return skill_data
 
+    @memoized_subtree
     def get(self, pk, fields=None, exclude_falsy=True, 
         full_query=True, full_abilities=False, full_transSkill=True,
             full_hitattr=False):
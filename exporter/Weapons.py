@@ -1,8 +1,10 @@
+import argparse
 import json
 import os
 import re
 
 from loader.Database import DBManager, DBView
+from loader.Profile import add_profile_argument
 from exporter.Shared import AbilityData, SkillData, PlayerAction, get_valid_filename
 
 from exporter.Mappings import ELEMENTS, WEAPON_TYPES
@@ -46,6 +48,9 @@ class WeaponData(DBView):
         super().export_all_to_folder(out_dir, ext, exclude_falsy=exclude_falsy, full_query=True)
 
 if __name__ == '__main__':
-    db = DBManager()
+    parser = argparse.ArgumentParser(description='Export weapon data.')
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    db = DBManager(profile=args.profile)
     view = WeaponData(db)
     view.export_all_to_folder()
\ No newline at end of file
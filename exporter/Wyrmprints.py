@@ -1,7 +1,9 @@
+import argparse
 import json
 import os
 
 from loader.Database import DBManager, DBView
+from loader.Profile import add_profile_argument
 from exporter.Shared import AbilityData, SkillData, PlayerAction
 
 from exporter.Mappings import CLASS_TYPES
@@ -38,6 +40,9 @@ class AmuletData(DBView):
         super().export_all_to_folder(out_dir, ext, exclude_falsy=exclude_falsy, full_query=True, full_abilities=False)
 
 if __name__ == '__main__':
-    db = DBManager()
+    parser = argparse.ArgumentParser(description='Export wyrmprint data.')
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    db = DBManager(profile=args.profile)
     view = AmuletData(db)
     view.export_all_to_folder()
\ No newline at end of file
@@ -122,6 +122,7 @@ ACTION_PART = DBTableMetadata(
         # HIT/BULLET
         '_bulletSpeed': DBTableMetadata.REAL,
         '_delayTime': DBTableMetadata.REAL,
+        '_delayVisible': DBTableMetadata.INT,
         '_collisionHitInterval': DBTableMetadata.REAL,
         '_isHitDelete': DBTableMetadata.INT,
         '_hitLabel': DBTableMetadata.TEXT,
@@ -129,6 +130,7 @@ ACTION_PART = DBTableMetadata(
         '_abHitAttrLabel': DBTableMetadata.TEXT,
         '_generateNum': DBTableMetadata.INT,
         '_generateDelay': DBTableMetadata.REAL,
+        '_bulletNum': DBTableMetadata.INT,
 
         # SEND_SIGNAL
         '_signalType': DBTableMetadata.INT,
@@ -1,3 +1,4 @@
+import io
 import json
 import os
 import errno
@@ -8,6 +9,10 @@ import concurrent
 
 from UnityPy import AssetsManager
 
+from loader.AssetFilter import WantedObjects
+from loader.AssetStore import detach
+from loader.TextureEncoder import TextureEncoder
+
 class ParsedManifest(dict):
     def __init__(self, manifest=None):
         super().__init__({})
@@ -50,26 +55,36 @@ def write_json(f, data):
     tree = data.read_type_tree()
     json.dump(process_json(tree), f, indent=2)
 
-def unpack_Texture2D(data, dest, stdout_log=False):
+PNG_ENCODER = TextureEncoder()
+
+def unpack_Texture2D(data, dest, stdout_log=False, encoder=None):
     if stdout_log:
         print('Texture2D', dest, flush=True)
-    dest, _ = os.path.splitext(dest)
-    dest = dest + '.png'
     check_target_path(dest)
-    img = data.image
-    img.save(dest)
+    # decoded here, compressed by the encoder pool when it has one
+    (encoder or PNG_ENCODER).save(data.image, dest)
 
-def unpack_MonoBehaviour(data, dest, stdout_log=False):
+def write_output(dest, write, data, store=None):
+    # through the store the file is deduplicated against every other output
+    if store is None:
+        detach(dest)
+        with open(dest, 'w', encoding='utf8', newline='') as f:
+            write(f, data)
+    else:
+        buffer = io.StringIO()
+        write(buffer, data)
+        store.put(dest, buffer.getvalue().encode('utf8'))
+
+def unpack_MonoBehaviour(data, dest, stdout_log=False, store=None):
     if stdout_log:
         print('MonoBehaviour', dest, flush=True)
     dest, _ = os.path.splitext(dest)
     dest += '.json'
     check_target_path(dest)
 
-    with open(dest, 'w', encoding='utf8', newline='') as f:
-        write_json(f, data)
+    write_output(dest, write_json, data, store)
 
-def unpack_GameObject(data, destination_folder, stdout_log):
+def unpack_GameObject(data, destination_folder, stdout_log, store=None):
     dest = os.path.join(destination_folder, os.path.splitext(data.name)[0])
     if stdout_log:
         print('GameObject', dest, flush=True)
@@ -84,16 +99,19 @@ def unpack_GameObject(data, destination_folder, stdout_log):
                 if json_data:
                     mono_list.append(json_data)
             elif obj_type_str == 'GameObject':
-                UNPACK[obj_type_str](subdata, os.path.join(dest, '{:02}'.format(idx)))
+                UNPACK[obj_type_str](subdata, os.path.join(dest, '{:02}'.format(idx)), stdout_log, store)
     if len(mono_list) > 0:
         check_target_path(dest)
-        with open(dest, 'w', encoding='utf8', newline='') as f:
-            json.dump(mono_list, f, indent=2)
+        write_output(dest, lambda f, data: json.dump(data, f, indent=2), mono_list, store)
 
-def unpack(obj, ex_target, stdout_log=False):
+def unpack(obj, ex_target, stdout_log=False, wanted=None, encoder=None, store=None):
     obj_type_str = str(obj.type)
     if obj_type_str in UNPACK:
+        if wanted and not wanted.before_read(obj):
+            return
         data = obj.read()
+        if wanted and not wanted.after_read(obj, data):
+            return
         method = None
         if obj_type_str == 'GameObject':
             dest = ex_target
@@ -101,8 +119,10 @@ def unpack(obj, ex_target, stdout_log=False):
         elif data.name:
             dest = os.path.join(ex_target, data.name)
             method = UNPACK[obj_type_str]
-        if method:
-            method(data, dest, stdout_log)
+        if method == unpack_Texture2D:
+            method(data, dest, stdout_log, encoder)
+        elif method:
+            method(data, dest, stdout_log, store)
 
 UNPACK = {
     'Texture2D': unpack_Texture2D, 
@@ -113,7 +133,7 @@ UNPACK = {
 }
 
 class Extractor:
-    def __init__(self, jp_manifest, en_manifest, dl_dir='./_download', ex_dir='./_extract', stdout_log=True):
+    def __init__(self, jp_manifest, en_manifest, dl_dir='./_download', ex_dir='./_extract', stdout_log=True, encoder=None, store=None):
         self.pm = {
             'jp': ParsedManifest(jp_manifest),
             'en': ParsedManifest(en_manifest)
@@ -122,8 +142,13 @@ class Extractor:
         self.ex_dir = ex_dir
         self.extract_list = []
         self.stdout_log = stdout_log
+        # a store without an encoder still needs its textures to go through the store
+        if store is not None and encoder is None:
+            encoder = TextureEncoder(store=store)
+        self.encoder = encoder
+        self.store = store
 
-    async def down_ex(self, session, source, region, target, extract):
+    async def down_ex(self, session, source, region, target, extract, wanted=None):
         dl_target = os.path.join(self.dl_dir, region, target)
         check_target_path(dl_target)
         async with session.get(source) as resp:
@@ -137,17 +162,28 @@ class Extractor:
             am = AssetsManager(dl_target)
             for asset in am.assets.values():
                 for obj in asset.objects.values():
-                    unpack(obj, ex_target, self.stdout_log)
+                    unpack(obj, ex_target, self.stdout_log, wanted, self.encoder, self.store)
 
-    async def download_and_extract(self, download_list, extract, region='jp'):
+    async def download_and_extract(self, download_list, extract, region='jp', wanted=None):
         async with aiohttp.ClientSession() as session:
             await asyncio.gather(*[
-                self.down_ex(session, source, region, target, extract)
+                self.down_ex(session, source, region, target, extract, wanted)
                 for target, source in download_list
             ])
 
-    def download_and_extract_all(self, label_patterns, region='jp'):
+    def download_and_extract_all(self, label_patterns, region='jp', wanted=None):
+        # wanted: {extract: WantedObjects or list of rules}, extracts without an entry unpack everything
+        wanted = wanted or {}
         for pat, extract in label_patterns.items():
             download_list = self.pm[region].get_by_pattern(pat)
+            extract_wanted = wanted.get(extract)
+            if extract_wanted is not None and not isinstance(extract_wanted, WantedObjects):
+                extract_wanted = WantedObjects(extract_wanted)
             loop = asyncio.get_event_loop()
-            loop.run_until_complete(self.download_and_extract(download_list, extract, region))
\ No newline at end of file
+            loop.run_until_complete(self.download_and_extract(download_list, extract, region, extract_wanted))
+        if self.encoder is not None:
+            self.encoder.join()
+        if self.store is not None:
+            self.store.close()
+            if self.stdout_log:
+                print(f'Store {self.store.store_dir}: {self.store.summary()}')
\ No newline at end of file
@@ -0,0 +1,93 @@
+import json
+import re
+from fnmatch import translate
+
+def peek_name(obj):
+    # newer UnityPy reads just m_Name off the object, older ones need the full read
+    peek = getattr(obj, 'peek_name', None)
+    if peek is None:
+        return None
+    try:
+        return peek()
+    except Exception:
+        return None
+
+# the container of an object when UnityPy does not give it, container rules let it through
+UNKNOWN_CONTAINER = object()
+
+def read_container(obj):
+    try:
+        return obj.container
+    except Exception:
+        return UNKNOWN_CONTAINER
+
+class WantedRule:
+    """One entry of a wanted objects spec, every field given has to match.
+    type: a type name or list of them
+    container: glob over the container path, e.g. assets/_gluonresources/images/icon/*, skipped when UnityPy does not give containers
+    name: regex searched in the object name
+    """
+    def __init__(self, type=None, container=None, name=None):
+        if isinstance(type, str):
+            type = (type,)
+        self.types = frozenset(type) if type else None
+        self.container = re.compile(translate(container), flags=re.IGNORECASE) if container else None
+        self.name = re.compile(name) if name else None
+
+    def match_meta(self, obj_type_str, container):
+        if self.types is not None and obj_type_str not in self.types:
+            return False
+        if self.container is not None and container is not UNKNOWN_CONTAINER \
+                and not (container and self.container.match(container)):
+            return False
+        return True
+
+    def match_name(self, name):
+        return self.name is None or (name is not None and self.name.search(name) is not None)
+
+class WantedObjects:
+    """Objects to unpack, checked on type and container before read() so the rest is never deserialized.
+    An object is wanted when any rule matches, no rules means everything is wanted.
+    Name rules are checked before read() when the name can be peeked, otherwise right after.
+    """
+    def __init__(self, rules=()):
+        self.rules = [r if isinstance(r, WantedRule) else WantedRule(**r) for r in rules]
+        self.warned = False
+
+    @staticmethod
+    def load(path):
+        with open(path) as f:
+            spec = json.load(f)
+        if isinstance(spec, dict):
+            spec = [spec]
+        return WantedObjects(spec)
+
+    def container(self, obj):
+        container = read_container(obj)
+        if container is UNKNOWN_CONTAINER and not self.warned and any(r.container is not None for r in self.rules):
+            print('Warning: object containers cannot be read with this UnityPy, container rules are skipped')
+            self.warned = True
+        return container
+
+    def candidates(self, obj_type_str, container):
+        return [r for r in self.rules if r.match_meta(obj_type_str, container)]
+
+    def before_read(self, obj):
+        if not self.rules:
+            return True
+        rules = self.candidates(str(obj.type), self.container(obj))
+        if not rules:
+            return False
+        if any(r.name is None for r in rules):
+            return True
+        name = peek_name(obj)
+        return name is None or any(r.match_name(name) for r in rules)
+
+    def after_read(self, obj, data):
+        if not self.rules:
+            return True
+        name = getattr(data, 'name', None)
+        return any(r.match_name(name) for r in self.candidates(str(obj.type), self.container(obj)))
+
+    def __bool__(self):
+        return bool(self.rules)
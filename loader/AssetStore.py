@@ -0,0 +1,84 @@
+import errno
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+
+INDEX_FILE = 'index.tsv'
+# link errors that mean the store dir cannot be linked from the extract dir at all, anything else only fails one file
+NO_LINK_ERRNOS = (errno.EXDEV, errno.EPERM)
+
+def detach(path):
+    # for writers outside the store: a file written in place through a hardlink would change the stored object
+    # and every other path linked to it, so the old file is removed first
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+class AssetStore:
+    """Content addressed store of extracted files, every distinct output is written once under its hash
+    and the extract paths are hardlinks to it, so readers walking the extract dirs see plain files.
+    Where hardlinks are not possible (other filesystem) the object is copied instead.
+    index.tsv in the store dir lists hash and extract path of every file put.
+    Objects are read only and shared between paths, write a new file to change one instead of editing it in place,
+    see detach.
+    """
+    def __init__(self, store_dir='./_store', link=True):
+        self.store_dir = store_dir
+        self.link = link
+        self.lock = threading.Lock()
+        self.index = []
+        self.objects = 0
+        self.duplicates = 0
+        self.saved = 0
+        os.makedirs(store_dir, exist_ok=True)
+
+    def object_path(self, digest, ext):
+        return os.path.join(self.store_dir, digest[:2], digest + ext)
+
+    def put(self, dest, data):
+        """Stores data and makes dest point at it, returns dest."""
+        digest = hashlib.sha1(data).hexdigest()
+        obj_path = self.object_path(digest, os.path.splitext(dest)[1])
+        if os.path.exists(obj_path):
+            with self.lock:
+                self.duplicates += 1
+                self.saved += len(data)
+        else:
+            os.makedirs(os.path.dirname(obj_path), exist_ok=True)
+            # another thread may be writing the same object, the rename keeps it whole either way
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(obj_path))
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.chmod(tmp_path, 0o444)
+            os.replace(tmp_path, obj_path)
+            with self.lock:
+                self.objects += 1
+        self.place(obj_path, dest)
+        with self.lock:
+            self.index.append((digest, dest))
+        return dest
+
+    def place(self, obj_path, dest):
+        detach(dest)
+        if self.link:
+            try:
+                os.link(obj_path, dest)
+                return
+            except OSError as e:
+                # e.g. too many links to one object only copies this file
+                if e.errno in NO_LINK_ERRNOS:
+                    self.link = False
+        shutil.copyfile(obj_path, dest)
+
+    def close(self):
+        with self.lock:
+            index, self.index = self.index, []
+        with open(os.path.join(self.store_dir, INDEX_FILE), 'a', encoding='utf8', newline='') as f:
+            for digest, dest in index:
+                f.write(f'{digest}\t{dest}\n')
+
+    def summary(self):
+        return f'{self.objects} stored, {self.duplicates} duplicates linked, {self.saved} bytes saved'
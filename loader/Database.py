@@ -2,6 +2,20 @@ import sqlite3
 import json
 import os
 import errno
+import queue
+import threading
+from contextlib import contextmanager, nullcontext
+from urllib.request import pathname2url
+from functools import wraps
+from weakref import WeakSet
+
+from loader.TextLabel import TextLabelStore, write_store, STORE_EXT
+from loader.Profile import ProfiledConnection, profile_output, start_profile
+
+TEXT_LABEL_TABLES = ('TextLabel', 'TextLabelJP')
+# fts5 tokenizers of the label search tables, JP text has no word breaks so it is indexed by trigrams
+LABEL_SEARCH_TOKENIZE = {'TextLabel': 'unicode61 remove_diacritics 2', 'TextLabelJP': 'trigram'}
+LABEL_REF = ('TextLabel', '_Id', '_Text')
 
 def check_target_path(target):
     if not os.path.exists(target):
@@ -13,7 +27,257 @@ def check_target_path(target):
 
 class DBDict(dict):
     def __repr__(self):
-        return json.dumps(self, indent=2)
+        return json.dumps(self, indent=2, default=expand_deferred)
+
+class Deferred:
+    """Stands in for the result of a nested DBView.get made during a lazy expansion.
+
+    The get runs on first access to the value. Pending plain pk lookups on the same view
+    are fetched together with one query at that point.
+    Truthiness resolves it, test with is_null or use or_default to keep it deferred.
+    """
+    UNRESOLVED = object()
+
+    def __init__(self, view, fetch, args, kargs):
+        self.view = view
+        self.fetch = fetch
+        self.args = args
+        self.kargs = kargs
+        self.rows = None
+        self.resolving = tuple(view.database.resolving)
+        self.result = Deferred.UNRESOLVED
+        # taken as the result when the get finds nothing, see or_default
+        self.fallback = Deferred.UNRESOLVED
+        if self.is_plain_lookup:
+            view.database.pending.setdefault(view.name, WeakSet()).add(self)
+
+    @property
+    def is_plain_lookup(self):
+        return len(self.args) == 1 and not any(k in self.kargs for k in ('by', 'fields', 'order', 'mode'))
+
+    @property
+    def resolved(self):
+        return self.result is not Deferred.UNRESOLVED
+
+    @property
+    def is_null(self):
+        # a null key has no rows, known without running the get
+        if self.resolved:
+            return not self.result
+        return not self.args[0]
+
+    @property
+    def value(self):
+        if self.result is Deferred.UNRESOLVED:
+            database = self.view.database
+            if self.is_plain_lookup and self.rows is None:
+                database.prefetch_pending(self.view)
+            pending = database.pending.get(self.view.name)
+            if pending is not None:
+                pending.discard(self)
+            # resolve with the ancestry the get was made with, for cycle detection
+            resolving, database.resolving = database.resolving, list(self.resolving)
+            with database.lazy_expansion(self.view):
+                if self.is_plain_lookup:
+                    database.prefetched = (self.view.name, self.args[0], self.rows)
+                try:
+                    self.result = self.fetch(self.view, *self.args, **self.kargs)
+                finally:
+                    database.prefetched = None
+                    database.resolving = resolving
+            if not self.result and self.fallback is not Deferred.UNRESOLVED:
+                self.result = self.fallback
+            self.fallback = None
+            self.view = self.fetch = self.args = self.kargs = self.rows = self.resolving = None
+        return self.result
+
+    def clone(self):
+        # the same get, resolved with the ancestry of whoever holds the clone
+        clone = Deferred(self.view, self.fetch, self.args, self.kargs)
+        clone.fallback = self.fallback
+        return clone
+
+    def __getitem__(self, key):
+        return self.value[key]
+
+    def __setitem__(self, key, value):
+        self.value[key] = value
+
+    def __delitem__(self, key):
+        del self.value[key]
+
+    def __contains__(self, key):
+        return key in self.value
+
+    def __iter__(self):
+        return iter(self.value)
+
+    def __len__(self):
+        return len(self.value)
+
+    def __bool__(self):
+        return bool(self.value)
+
+    def __getattr__(self, name):
+        # dict and list methods of the resolved value, e.g. keys, items, get
+        if name in ('view', 'fetch', 'args', 'kargs', 'rows', 'resolving', 'result', 'fallback'):
+            raise AttributeError(name)
+        return getattr(self.value, name)
+
+    def __repr__(self):
+        if self.resolved:
+            return repr(self.result)
+        return f'<Deferred {self.view.name} {self.args!r} {self.kargs!r}>'
+
+def is_null(res):
+    # falsy test of a get result that leaves a Deferred with a set key unresolved
+    if isinstance(res, Deferred):
+        return res.is_null
+    return not res
+
+def or_default(res, default):
+    """res, or default when res is empty. An unresolved Deferred stays deferred and falls back to default."""
+    if isinstance(res, Deferred):
+        if res.is_null:
+            return default
+        if not res.resolved:
+            res.fallback = default
+            return res
+    return res if res else default
+
+def expand_deferred(obj):
+    # json default hook, serializing a result expands everything left deferred in it
+    if isinstance(obj, Deferred):
+        return obj.value
+    raise TypeError(f'Object of type {obj.__class__.__name__} is not JSON serializable')
+
+def deferrable(get):
+    @wraps(get)
+    def deferrable_get(self, *args, **kargs):
+        database = self.database
+        if database.profile is not None:
+            database.profile.count_view(self.__class__.__name__)
+        if database.lazy and database.expanding and database.expanding[-1] is not self:
+            return Deferred(self, get, args, kargs)
+        database.expanding.append(self)
+        try:
+            return get(self, *args, **kargs)
+        finally:
+            database.expanding.pop()
+    deferrable_get.deferrable = True
+    return deferrable_get
+
+class SharedDict(DBDict):
+    """A memoized subtree every owner shares, see memoized_subtree. Read only, copy_subtree gives a copy to change."""
+    def read_only(self, *args, **kargs):
+        raise TypeError('memoized subtrees are shared by their owners, change a copy_subtree copy instead')
+
+    __setitem__ = __delitem__ = __ior__ = clear = pop = popitem = setdefault = update = read_only
+
+    def __reduce__(self):
+        return (self.__class__, (dict(self),))
+
+class SharedList(list):
+    """List counterpart of SharedDict."""
+    read_only = SharedDict.read_only
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = append = clear = extend = insert = pop = remove = reverse = sort = read_only
+
+    def __reduce__(self):
+        return (self.__class__, (list(self),))
+
+def copy_subtree(obj):
+    # fresh containers for every owner, leaf values are shared and gets left deferred stay deferred
+    if isinstance(obj, Deferred):
+        if not obj.resolved:
+            return obj.clone()
+        obj = obj.result
+    if isinstance(obj, dict):
+        cls = DBDict if isinstance(obj, SharedDict) else obj.__class__
+        return cls((k, copy_subtree(v)) for k, v in obj.items())
+    if isinstance(obj, list):
+        return [copy_subtree(v) for v in obj]
+    return obj
+
+def share_subtree(obj):
+    # the memo copy of a subtree, made of read only containers so owners can share it;
+    # shared subtrees in it are kept as they are and gets left deferred stay deferred
+    if isinstance(obj, (SharedDict, SharedList)):
+        return obj
+    if isinstance(obj, Deferred):
+        if not obj.resolved:
+            return obj.clone()
+        obj = obj.result
+    if isinstance(obj, dict):
+        return SharedDict((k, share_subtree(v)) for k, v in obj.items())
+    if isinstance(obj, list):
+        return SharedList(share_subtree(v) for v in obj)
+    return obj
+
+def holds_deferred(obj):
+    # shared subtrees handed out by the memo never hold a deferred get, see memoized_subtree
+    if isinstance(obj, Deferred):
+        return True
+    if isinstance(obj, (SharedDict, SharedList)):
+        return False
+    if isinstance(obj, dict):
+        return any(holds_deferred(v) for v in obj.values())
+    if isinstance(obj, list):
+        return any(holds_deferred(v) for v in obj)
+    return False
+
+def memoized_subtree(get):
+    """Resolve each (view, pk, options) subtree once per DBManager.memoized_subtrees block.
+
+    The owner that resolves a subtree keeps what it built. Later owners get their own top level
+    container over one read only copy of the rest (SharedDict, SharedList), so they can set
+    their own fields, writing further down raises TypeError and copy_subtree gives a full copy
+    to change. A subtree holding gets left deferred is copied for every owner instead,
+    so each owner resolves them with its own ancestry.
+    A get for a pk that is already being resolved further up is a reference cycle: the pk is
+    left unexpanded and the chain is recorded in database.cycles.
+    Subtrees built across such a cut are truncated for owners outside the cycle, so they are not memoized.
+    """
+    @wraps(get)
+    def memoized_get(self, pk, *args, **kargs):
+        database = self.database
+        node = (self.name, pk)
+        if node in database.resolving:
+            cycle = database.resolving[database.resolving.index(node):] + [node]
+            database.cycles.append(cycle)
+            database.cuts += 1
+            return pk
+        key = None
+        entry = None
+        if database.memo is not None:
+            key = (node, args, tuple(sorted(kargs.items())))
+            try:
+                entry = database.memo[key]
+            except KeyError:
+                pass
+            except TypeError:
+                # unhashable options such as a fields list are not memoized
+                key = None
+        database.resolving.append(node)
+        try:
+            if entry is not None:
+                subtree, deferred = entry
+                if deferred:
+                    return copy_subtree(subtree)
+                if isinstance(subtree, SharedDict):
+                    return DBDict(subtree)
+                if isinstance(subtree, SharedList):
+                    return list(subtree)
+                return subtree
+            cuts = database.cuts
+            res = get(self, pk, *args, **kargs)
+            if key is not None and database.cuts == cuts:
+                subtree = share_subtree(res)
+                database.memo[key] = (subtree, holds_deferred(subtree))
+        finally:
+            database.resolving.pop()
+        return res
+    return memoized_get
 
 class DBTableMetadata:
     PK = ' PRIMARY KEY'
@@ -28,6 +292,8 @@ class DBTableMetadata:
         self.name = name
         self.pk = pk
         self.field_type = field_type
+        # indexes built from the rows, see DBManager.table_index
+        self.indexes = {}
 
     def init_from_row(self, row, auto_pk=False):
         self.field_type = {}
@@ -76,23 +342,314 @@ class DBTableMetadata:
     def __eq__(self, other):
         return self.name == other.name and self.pk == other.pk and self.field_type == other.field_type
 
+# label id to the view rows whose labeled fields use it, see DBManager.build_label_search
+LABEL_OWNER = DBTableMetadata(
+    'LabelOwner', pk=DBTableMetadata.DBID, field_type={
+        DBTableMetadata.DBID: DBTableMetadata.INT+DBTableMetadata.PK+DBTableMetadata.AUTO,
+        '_Label': DBTableMetadata.TEXT,
+        '_View': DBTableMetadata.TEXT,
+        '_Table': DBTableMetadata.TEXT,
+        '_Field': DBTableMetadata.TEXT,
+        # pk of the row in _Table, int or text
+        '_Owner': DBTableMetadata.BLOB,
+    }
+)
+
+
+class ReadPool:
+    """Up to size read only connections, leased per thread or per task.
+
+    A lease is reentrant within a thread, the outermost lease returns the connection to the pool.
+    """
+    def __init__(self, connect, size):
+        self.connect = connect
+        self.size = size
+        self.idle = queue.LifoQueue()
+        self.connections = []
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    def acquire(self):
+        try:
+            return self.idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self.lock:
+            if len(self.connections) < self.size:
+                conn = self.connect()
+                self.connections.append(conn)
+                return conn
+        return self.idle.get()
+
+    @contextmanager
+    def lease(self):
+        conn = getattr(self.local, 'conn', None)
+        if conn is not None:
+            yield conn
+            return
+        conn = self.local.conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.local.conn = None
+            self.idle.put(conn)
+
+    @contextmanager
+    def hold(self):
+        # every connection back in the pool and kept out of use for the block; new ones wait for it too,
+        # leases in the holding thread reuse one of the held connections
+        with self.lock:
+            held = [self.idle.get() for _ in self.connections]
+            self.local.conn = held[0] if held else None
+            try:
+                yield
+            finally:
+                self.local.conn = None
+                for conn in held:
+                    self.idle.put(conn)
+
+    def close(self):
+        with self.lock:
+            for conn in self.connections:
+                conn.close()
+            self.connections = []
+            self.idle = queue.LifoQueue()
+
+class ExpansionState(threading.local):
+    """Lookup state of the gets running in one thread, see DBManager.lazy_expansion and memoized_subtrees."""
+    def __init__(self):
+        self.lazy = False
+        self.expanding = []
+        self.pending = {}
+        self.prefetched = None
+        self.memo = None
+        self.resolving = []
+        # cycles cut in this thread, memoized_subtree does not memoize subtrees built across a cut
+        self.cuts = 0
+
+class ThreadState:
+    # a DBManager attribute read from and written to the calling thread's ExpansionState
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return getattr(obj.state, self.name)
+
+    def __set__(self, obj, value):
+        setattr(obj.state, self.name, value)
 
 class DBManager:
-    def __init__(self, db_file='dl.sqlite', drop_on_reload=False):
+    lazy = ThreadState()
+    expanding = ThreadState()
+    pending = ThreadState()
+    prefetched = ThreadState()
+    memo = ThreadState()
+    resolving = ThreadState()
+    cuts = ThreadState()
+
+    def __init__(self, db_file='dl.sqlite', drop_on_reload=False, profile=None, readers=0):
+        # profile is an output for QueryProfile, see loader.Profile; defaults to $DL_PROFILE
+        # readers > 0 serves reads from a pool of that many read only connections, see open_read_pool
+        output = profile_output(profile)
+        self.profile = start_profile(output) if output else None
         self.conn = None
+        self.pool = None
+        self.write_lock = threading.RLock()
+        self.db_file = None
+        self.text_labels = {}
+        # name: CREATE TEMP VIEW query, run on every connection, see create_view
+        self.temp_views = {}
+        # name: (table, references, join_mode) of the views made by create_view, see reload
+        self.view_specs = {}
+        self.state = ExpansionState()
+        self.cycles = []
+        self.tables = {}
         if db_file is not None:
             self.open(db_file)
-        self.tables = {}
+            if readers:
+                self.open_read_pool(readers)
         self.drop_on_reload = True
 
+    def connect(self, database, uri=False):
+        # every thread may use a connection, the write lock and the pool keep one user at a time
+        if self.profile is None:
+            conn = sqlite3.connect(database, uri=uri, check_same_thread=False)
+        else:
+            conn = sqlite3.connect(database, uri=uri, check_same_thread=False, factory=ProfiledConnection)
+            conn.profile = self.profile
+        conn.row_factory = sqlite3.Row
+        for table, store in self.text_labels.items():
+            conn.create_function(table, 1, store.lookup, deterministic=True)
+        for query in self.temp_views.values():
+            conn.execute(query)
+        return conn
+
+    def connections(self):
+        return [self.conn] + (self.pool.connections if self.pool is not None else [])
+
     def open(self, db_file):
-        self.conn = sqlite3.connect(db_file)
-        self.conn.row_factory = sqlite3.Row
+        self.db_file = db_file
+        # the single writer connection, also used for reads when there is no read pool
+        self.conn = self.connect(db_file)
+        self.open_text_labels()
+
+    def open_text_labels(self):
+        for table in TEXT_LABEL_TABLES:
+            path = self.text_label_path(table)
+            if path and os.path.exists(path):
+                try:
+                    self.use_text_labels(table, TextLabelStore(path))
+                except ValueError:
+                    # an older store layout, the views join the label table until build_text_labels
+                    pass
+
+    def open_read_pool(self, size):
+        if self.db_file is None or self.db_file == ':memory:':
+            raise ValueError('a read pool needs a database file')
+        # the journal mode is left as is, readers share the file with each other either way,
+        # a database loaded with use_wal also lets them read alongside a writer
+        uri = f'file:{pathname2url(os.path.abspath(self.db_file))}?mode=ro'
+        self.pool = ReadPool(lambda: self.connect(uri, uri=True), size)
+
+    def use_wal(self):
+        # persistent in the file, readers of the database then run alongside a reload and see each commit
+        with self.writing() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+
+    def reload(self):
+        """Pick up a database rebuilt under this manager, e.g. by Load_Database while a Query_Server reads it.
+
+        The label stores are reopened, the temp views are made again over them and the new tables,
+        and the table metadata is read again, which drops the indexes kept with it.
+        Waits until no read connection is leased and keeps them all until done.
+        """
+        with self.write_lock, (self.pool.hold() if self.pool is not None else nullcontext()):
+            for table in TEXT_LABEL_TABLES:
+                self.close_text_labels(table)
+            self.tables.clear()
+            self.open_text_labels()
+            if self.text_labels:
+                for name in self.view_specs:
+                    self.create_temp_view(name)
 
     def close(self):
+        for table in TEXT_LABEL_TABLES:
+            self.close_text_labels(table)
+        if self.pool is not None:
+            self.pool.close()
+            self.pool = None
         self.conn.close()
         self.conn = None
 
+    @contextmanager
+    def reading(self):
+        # a leased read connection, held for the whole block so a task can run many queries on it
+        if self.pool is None:
+            with self.write_lock:
+                yield self.conn
+        else:
+            with self.pool.lease() as conn:
+                yield conn
+
+    @contextmanager
+    def writing(self):
+        with self.write_lock:
+            yield self.conn
+
+    def text_label_path(self, table):
+        if self.db_file is None or self.db_file == ':memory:':
+            return None
+        return f'{self.db_file}.{table}{STORE_EXT}'
+
+    def use_text_labels(self, table, store):
+        # temp views select labels through a sqlite function named after the table instead of joining it
+        self.text_labels[table] = store
+        for conn in self.connections():
+            conn.create_function(table, 1, store.lookup, deterministic=True)
+
+    def close_text_labels(self, table):
+        store = self.text_labels.pop(table, None)
+        if store is not None:
+            # back to the stored views, which join the label tables
+            self.drop_temp_views(list(self.temp_views))
+            store.close()
+
+    def build_text_labels(self):
+        for table in TEXT_LABEL_TABLES:
+            path = self.text_label_path(table)
+            if path is None or not self.check_table(table):
+                continue
+            self.close_text_labels(table)
+            write_store(path, self.query_many(f'SELECT _Id, _Text FROM {table}', (), tuple))
+            self.use_text_labels(table, TextLabelStore(path))
+
+    @staticmethod
+    def search_table(table):
+        return f'{table}Search'
+
+    def build_label_search(self, views):
+        """Full text indexes over the label tables, and LabelOwner, the rows of views' labeled fields by label id."""
+        for table, tokenize in LABEL_SEARCH_TOKENIZE.items():
+            search = self.search_table(table)
+            self.drop_table(search)
+            if not self.check_table(table):
+                continue
+            # external content, the index points at the label rows instead of keeping a copy of the text
+            with self.writing() as conn:
+                conn.execute(f'CREATE VIRTUAL TABLE {search} USING fts5(_Text, content={table}, content_rowid=rowid, tokenize=\'{tokenize}\')')
+                conn.execute(f'INSERT INTO {search}({search}) VALUES (\'rebuild\')')
+                conn.commit()
+        self.drop_table(LABEL_OWNER.name)
+        self.create_table(LABEL_OWNER)
+        with self.writing() as conn:
+            for view in views:
+                tbl = self.check_table(view.base_table)
+                if not tbl:
+                    continue
+                labeled = [k for k, ref in view.references.get(view.base_table, {}).items() if ref == LABEL_REF]
+                for field in labeled:
+                    conn.execute(
+                        f'INSERT INTO {LABEL_OWNER.name} ({LABEL_OWNER.fields}) '
+                        f'SELECT {field}, ?, ?, ?, {tbl.pk} FROM {tbl.name} WHERE {field} IS NOT NULL AND {field} != \'\'',
+                        (type(view).__name__, tbl.name, field)
+                    )
+            conn.execute(f'CREATE INDEX {LABEL_OWNER.name}_Label ON {LABEL_OWNER.name} (_Label)')
+            conn.commit()
+
+    def search_labels(self, text, jp=False, limit=20):
+        """Labels whose text matches, best first, each with the view rows (_Owners) that use it.
+        EN matches words by prefix, JP matches substrings; JP text under 3 characters is too short
+        for trigrams and falls back to a scan.
+        """
+        table = 'TextLabelJP' if jp else 'TextLabel'
+        search = self.search_table(table)
+        if not text.strip() or not self.check_table(search):
+            return []
+        if jp and len(text) < 3:
+            query = f'SELECT _Id, _Text FROM {table} WHERE _Text LIKE \'%\' || ? || \'%\' LIMIT ?'
+            param = (text, limit)
+        else:
+            if jp:
+                match = '"' + text.replace('"', '""') + '"'
+            else:
+                match = ' '.join('"' + word.replace('"', '""') + '"*' for word in text.split())
+            # every match is ranked, an unordered cap could drop the best ones before the sort
+            query = f'SELECT {table}._Id, {table}._Text FROM ' \
+                    f'(SELECT rowid, rank FROM {search} WHERE {search} MATCH ? ORDER BY rank LIMIT ?) AS matches ' \
+                    f'JOIN {table} ON {table}.rowid=matches.rowid ORDER BY matches.rank'
+            param = (match, limit)
+        labels = self.query_many(query, param, DBDict)
+        if not labels or not self.check_table(LABEL_OWNER.name):
+            return labels
+        owners = {}
+        for res in self.select_in(LABEL_OWNER.name, [label['_Id'] for label in labels], by='_Label'):
+            owners.setdefault(res['_Label'], []).append(res)
+        for label in labels:
+            label['_Owners'] = owners.get(label['_Id'], [])
+        return labels
+
     @staticmethod
     def list_dict_values(data, tbl):
         for entry in data:
@@ -102,23 +659,68 @@ class DBManager:
                         entry[field] = json.dumps(entry[field])
                 yield tuple(entry.values())
 
+    @contextmanager
+    def lazy_expansion(self, view=None):
+        # nested gets made inside this block (or inside view's get) return Deferred results
+        lazy, expanding = self.lazy, self.expanding
+        self.lazy = True
+        self.expanding = [view] if view is not None else []
+        try:
+            yield self
+        finally:
+            self.lazy, self.expanding = lazy, expanding
+
+    @contextmanager
+    def memoized_subtrees(self):
+        # memoized_subtree gets share resolved subtrees until the outermost block ends
+        if self.memo is not None:
+            yield self.memo
+            return
+        self.memo = {}
+        try:
+            yield self.memo
+        finally:
+            self.memo = None
+
+    def prefetch_pending(self, view, batch_size=500):
+        pending = [d for d in self.pending.pop(view.name, ()) if not d.resolved and d.rows is None]
+        by = self.check_table(view.name).pk
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start+batch_size]
+            rows = {}
+            for res in self.select_in(view.name, list({d.args[0] for d in batch}), by):
+                rows.setdefault(res[by], []).append(res)
+            for d in batch:
+                if d.args[0] in rows:
+                    d.rows = [DBDict(res) for res in rows[d.args[0]]]
+
+    def take_prefetched(self, table, value):
+        if self.prefetched is not None and self.prefetched[0] == table and self.prefetched[1] == value:
+            rows = self.prefetched[2]
+            self.prefetched = None
+            return rows
+        return None
+
     def query_one(self, query, param, d_type):
-        cursor = self.conn.cursor()
-        cursor.execute(query, param)
-        res = cursor.fetchone()
+        with self.reading() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, param)
+            res = cursor.fetchone()
         if res is not None:
             return d_type(res)
         return None
 
     def query_many(self, query, param, d_type, idx_key=None):
-        cursor = self.conn.cursor()
-        cursor.execute(query, param)
-        if cursor.rowcount == 0:
-            return []
+        with self.reading() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, param)
+            if cursor.rowcount == 0:
+                return []
+            rows = cursor.fetchall()
         if idx_key is None:
-            return [d_type(res) for res in cursor.fetchall()]
+            return [d_type(res) for res in rows]
         else:
-            return dict({res[idx_key]: d_type(res) for res in cursor.fetchall()})
+            return dict({res[idx_key]: d_type(res) for res in rows})
 
     def check_table(self, table, update_table_dict=True):
         if table not in self.tables:
@@ -133,10 +735,29 @@ class DBManager:
                 return tbl
         return self.tables[table]
 
+    def table_index(self, table, name, build):
+        # built once from the rows and kept with the table metadata,
+        # so it is rebuilt after the table is dropped, written to or reloaded
+        tbl = self.check_table(table)
+        if not tbl:
+            return build()
+        if name not in tbl.indexes:
+            tbl.indexes[name] = build()
+        return tbl.indexes[name]
+
     def drop_table(self, table):
+        if table in TEXT_LABEL_TABLES:
+            self.close_text_labels(table)
+            path = self.text_label_path(table)
+            if path and os.path.exists(path):
+                os.remove(path)
+            # the search index points at rows of the dropped table
+            self.drop_table(self.search_table(table))
+        self.tables.pop(table, None)
         query = f'DROP TABLE IF EXISTS {table}'
-        self.conn.execute(query)
-        self.conn.commit()
+        with self.writing() as conn:
+            conn.execute(query)
+            conn.commit()
 
     def create_table(self, meta):
         table = meta.name
@@ -144,8 +765,9 @@ class DBManager:
         # self.conn.execute(query)
         # self.tables[table] = meta
         query = f'CREATE TABLE IF NOT EXISTS {table} ({meta.field_types})'
-        self.conn.execute(query)
-        self.conn.commit()
+        with self.writing() as conn:
+            conn.execute(query)
+            conn.commit()
 
     INSERT = 'INSERT'
     REPLACE = 'REPLACE'
@@ -154,16 +776,20 @@ class DBManager:
         values = '('+'?,'*tbl.field_length
         values = values[:-1]+')'
         query = f'{mode} INTO {table} ({tbl.fields}) VALUES {values}'
-        self.conn.execute(query, data)
-        self.conn.commit()
+        with self.writing() as conn:
+            conn.execute(query, data)
+            conn.commit()
+        tbl.indexes.clear()
 
     def insert_many(self, table, data, mode='INSERT'):
         tbl = self.check_table(table)
         values = '('+'?,'*tbl.field_length
         values = values[:-1]+')'
         query = f'{mode} INTO {table} ({tbl.fields}) VALUES {values}'
-        self.conn.executemany(query, self.list_dict_values(data, tbl))
-        self.conn.commit()
+        with self.writing() as conn:
+            conn.executemany(query, self.list_dict_values(data, tbl))
+            conn.commit()
+        tbl.indexes.clear()
 
     def select_all(self, table, d_type=DBDict):
         tbl = self.check_table(table)
@@ -195,15 +821,47 @@ class DBManager:
             d_type=d_type
         )
 
+    def select_in(self, table, values, by=None, d_type=DBDict):
+        tbl = self.check_table(table)
+        by = by or tbl.pk
+        params = ','.join('?' * len(values))
+        query = f'SELECT {tbl.named_fields} FROM {table} WHERE {table}.{by} IN ({params})'
+        return self.query_many(
+            query=query,
+            param=tuple(values),
+            d_type=d_type
+        )
+
     def create_view(self, name, table, references, join_mode='LEFT'):
-        query = f'DROP VIEW IF EXISTS {name}'
-        self.conn.execute(query)
+        self.delete_view(name)
+        # the stored view joins the label tables so any sqlite client can read it,
+        # with label stores open a temp view of the same name shadows it on this manager's connections
+        query = f'CREATE VIEW {name} AS {self.view_select(table, references, join_mode, False)}'
+        with self.writing() as conn:
+            conn.execute(query)
+            conn.commit()
+        self.view_specs[name] = (table, references, join_mode)
+        if self.text_labels:
+            self.create_temp_view(name)
+
+    def create_temp_view(self, name):
+        table, references, join_mode = self.view_specs[name]
+        self.temp_views[name] = f'CREATE TEMP VIEW {name} AS {self.view_select(table, references, join_mode, True)}'
+        for conn in self.connections():
+            conn.execute(self.temp_views[name])
+
+    def view_select(self, table, references, join_mode, use_stores):
         tbl = self.check_table(table)
         fields = []
         joins = []
         for k in tbl.field_type.keys():
             if table in references and k in references[table]:
                 rtbl_tpl = references[table][k]
+                if rtbl_tpl == ('TextLabel', '_Id', '_Text'):
+                    fields.append(self.label_field(tbl.name, 'TextLabel', k, k, join_mode, joins, use_stores))
+                    if not k.endswith('En'): # special case bolb
+                        fields.append(self.label_field(tbl.name, 'TextLabelJP', k, f'{k}JP', join_mode, joins, use_stores))
+                    continue
                 rtbl = rtbl_tpl[0]
                 rk = rtbl_tpl[1]
                 rv = rtbl_tpl[2:]
@@ -214,21 +872,31 @@ class DBManager:
                     for v in rv:
                         fields.append(f'{rtbl.name}{k}.{v} AS {k}{v}')
                 joins.append(f'{join_mode} JOIN {rtbl.name} AS {rtbl.name}{k} ON {tbl.name}.{k}={rtbl.name}{k}.{rk}')
-                if rtbl.name == 'TextLabel' and not k.endswith('En'): # special case bolb
-                    fields.append(f'{rtbl.name}JP{k}.{rv[0]} AS {k}JP')
-                    joins.append(f'{join_mode} JOIN {rtbl.name}JP AS {rtbl.name}JP{k} ON {tbl.name}.{k}={rtbl.name}JP{k}.{rk}')
             else:
                 fields.append(f'{tbl.name}.{k}')
         field_str = ','.join(fields)
         joins_str = '\n'+'\n'.join(joins)
-        query = f'CREATE VIEW {name} AS SELECT {field_str} FROM {tbl.name} {joins_str}'
-        self.conn.execute(query)
-        self.conn.commit()
+        return f'SELECT {field_str} FROM {tbl.name} {joins_str}'
+
+    def label_field(self, table, label_table, k, alias, join_mode, joins, use_stores=False):
+        if use_stores and label_table in self.text_labels:
+            return f'{label_table}({table}.{k}) AS {alias}'
+        joins.append(f'{join_mode} JOIN {label_table} AS {label_table}{k} ON {table}.{k}={label_table}{k}._Id')
+        return f'{label_table}{k}._Text AS {alias}'
+
+    def drop_temp_views(self, names):
+        for name in names:
+            if self.temp_views.pop(name, None) is not None:
+                for conn in self.connections():
+                    conn.execute(f'DROP VIEW IF EXISTS temp.{name}')
 
     def delete_view(self, name):
-        query = f'DROP VIEW IF EXISTS {name}'
-        self.conn.execute(query)
-        self.conn.commit()
+        self.view_specs.pop(name, None)
+        self.drop_temp_views([name])
+        query = f'DROP VIEW IF EXISTS main.{name}'
+        with self.writing() as conn:
+            conn.execute(query)
+            conn.commit()
 
 class DBView:
     def __init__(self, database, table, references=None, labeled_fields=None):
@@ -243,6 +911,11 @@ class DBView:
         if len(self.references) > 0:
             self.open()
 
+    def __init_subclass__(cls, **kargs):
+        super().__init_subclass__(**kargs)
+        if not getattr(cls.get, 'deferrable', False):
+            cls.get = deferrable(cls.get)
+
     def process_result(self, *args, **kargs):
         return args[0]
 
@@ -254,7 +927,11 @@ class DBView:
     def get(self, pk, by=None, fields=None, order=None, mode=DBManager.EXACT, exclude_falsy=False, expand_one=True):
         if order and '.' not in order:
             order = self.name + '.' + order
-        res = self.database.select(self.name, pk, by, fields, order, mode)
+        res = None
+        if by is None and fields is None and order is None and mode == DBManager.EXACT:
+            res = self.database.take_prefetched(self.name, pk)
+        if res is None:
+            res = self.database.select(self.name, pk, by, fields, order, mode)
         if exclude_falsy:
             res = [self.remove_falsy_fields(r) for r in res]
         if expand_one and len(res) == 1:
@@ -282,9 +959,10 @@ class DBView:
     def export_all_to_folder(self, out_dir, ext='.json', exclude_falsy=True, **kargs):
         all_res = self.get_all(exclude_falsy=exclude_falsy)
         check_target_path(out_dir)
-        for res in all_res:
-            res = self.process_result(res, exclude_falsy=exclude_falsy, **kargs)
-            out_name = self.outfile_name(res, ext)
-            output = os.path.join(out_dir, out_name)
-            with open(output, 'w', newline='', encoding='utf-8') as fp:
-                json.dump(res, fp, indent=2, ensure_ascii=False)
+        with self.database.memoized_subtrees():
+            for res in all_res:
+                res = self.process_result(res, exclude_falsy=exclude_falsy, **kargs)
+                out_name = self.outfile_name(res, ext)
+                output = os.path.join(out_dir, out_name)
+                with open(output, 'w', newline='', encoding='utf-8') as fp:
+                    json.dump(res, fp, indent=2, ensure_ascii=False, default=expand_deferred)
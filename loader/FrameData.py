@@ -0,0 +1,119 @@
+from loader.Database import DBManager, DBTableMetadata
+from loader.Actions import CommandType
+from loader.Motion import CHARACTER_MOTION, DRAGON_MOTION
+
+FPS = 60
+
+ACTION_FRAME_DATA = DBTableMetadata(
+    'ActionFrameData', pk='_Id', field_type={
+        '_Id': DBTableMetadata.INT+DBTableMetadata.PK,
+        # [frame, hit label] of every hit in frame order
+        '_hits': DBTableMetadata.BLOB,
+        '_hitCount': DBTableMetadata.INT,
+        '_firstHit': DBTableMetadata.INT,
+        '_lastHit': DBTableMetadata.INT,
+        '_cancelFrame': DBTableMetadata.INT,
+        '_motion': DBTableMetadata.TEXT,
+        '_motionFrames': DBTableMetadata.INT,
+    }
+)
+
+# hits start at _seconds/_speed plus a delay, which only some commands apply (same as misc/Action.py)
+HIT_DELAY = {
+    CommandType.HIT: lambda part: 0.0,
+    CommandType.BULLET: lambda part: part['_delayTime'] if part['_delayVisible'] else 0.0,
+    CommandType.MULTI_BULLET: lambda part: part['_delayTime'] if part['_delayVisible'] else 0.0,
+    CommandType.FIRE_STOCK_BULLET: lambda part: part['_delayTime'] if part['_delayVisible'] else 0.0,
+    CommandType.PARABOLA_BULLET: lambda part: 0.0,
+    CommandType.PIVOT_BULLET: lambda part: 0.0,
+    CommandType.SETTING_HIT: lambda part: part['_delayTime'],
+}
+# the labels each command hits with (same as misc/Action.py), bullets add the arrange bullet label
+BULLET_LABELS = ('_hitAttrLabel', '_abHitAttrLabel')
+HIT_LABELS = {
+    CommandType.HIT: ('_hitLabel',),
+    CommandType.BULLET: BULLET_LABELS,
+    CommandType.MULTI_BULLET: BULLET_LABELS,
+    CommandType.FIRE_STOCK_BULLET: BULLET_LABELS,
+    CommandType.PARABOLA_BULLET: BULLET_LABELS,
+    CommandType.PIVOT_BULLET: BULLET_LABELS,
+    CommandType.SETTING_HIT: ('_hitAttrLabel',),
+}
+
+def to_frames(seconds):
+    return round(seconds * FPS)
+
+def start_seconds(part, delay=0.0, offset=0.0):
+    # offset is added to _seconds, so it is scaled by _speed too
+    return ((part['_seconds'] or 0.0) + offset) / (part['_speed'] or 1.0) + (delay or 0.0)
+
+def hit_schedule(part):
+    command_type = CommandType(part['commandType'])
+    delay = HIT_DELAY[command_type](part)
+    labels = [part[label] for label in HIT_LABELS[command_type] if part[label]]
+    if command_type == CommandType.MULTI_BULLET:
+        interval = part['_generateDelay'] or 0.0
+        starts = [start_seconds(part, delay, interval * i) for i in range(part['_generateNum'] or 1)]
+    elif command_type == CommandType.FIRE_STOCK_BULLET:
+        starts = [start_seconds(part, delay)] * (part['_bulletNum'] or 1)
+    else:
+        starts = [start_seconds(part, delay)]
+    return [[to_frames(seconds), label] for seconds in starts for label in labels]
+
+def motion_durations(db):
+    # clips by name, for the motion states and animations the actions play
+    durations = {}
+    for meta in (CHARACTER_MOTION, DRAGON_MOTION):
+        if db.check_table(meta.name):
+            for name, duration in db.query_many(f'SELECT name, duration FROM {meta.name}', (), tuple):
+                durations[name.lower()] = (name, duration)
+    return durations
+
+def build_frame_data(action_id, parts, durations):
+    hits = []
+    cancels = []
+    motion = None
+    for part in parts:
+        command_type = CommandType(part['commandType'])
+        if command_type in HIT_DELAY:
+            hits.extend(hit_schedule(part))
+        elif command_type == CommandType.ACTIVE_CANCEL:
+            cancels.append(to_frames(start_seconds(part)))
+        elif motion is None and command_type in (CommandType.PARTS_MOTION, CommandType.ANIMATION):
+            name = part['_motionState'] if command_type == CommandType.PARTS_MOTION else part['_animationName']
+            if name and name.lower() in durations:
+                motion = durations[name.lower()]
+    hits.sort(key=lambda hit: hit[0])
+    return {
+        '_Id': action_id,
+        '_hits': hits or None,
+        '_hitCount': len(hits),
+        '_firstHit': hits[0][0] if hits else None,
+        '_lastHit': hits[-1][0] if hits else None,
+        '_cancelFrame': min(cancels) if cancels else None,
+        '_motion': motion[0] if motion else None,
+        '_motionFrames': to_frames(motion[1]) if motion else None,
+    }
+
+def load_frame_data(db):
+    """Frame data of every action in ActionParts, run after load_actions and the motion loaders."""
+    db.drop_table(ACTION_FRAME_DATA.name)
+    db.create_table(ACTION_FRAME_DATA)
+    durations = motion_durations(db)
+    frame_data = []
+    action_id = None
+    parts = []
+    for part in db.query_many('SELECT * FROM ActionParts ORDER BY _ref, _seq', (), dict):
+        if part['_ref'] != action_id:
+            if parts:
+                frame_data.append(build_frame_data(action_id, parts, durations))
+            action_id = part['_ref']
+            parts = []
+        parts.append(part)
+    if parts:
+        frame_data.append(build_frame_data(action_id, parts, durations))
+    db.insert_many(ACTION_FRAME_DATA.name, frame_data)
+
+if __name__ == '__main__':
+    db = DBManager()
+    load_frame_data(db)
@@ -1,4 +1,5 @@
 import json
+import mmap
 import os
 import re
 from loader.Database import DBManager, DBTableMetadata
@@ -16,6 +17,102 @@ CHARACTER_REF = re.compile(r'[A-Z]{3}_[A-Z]{3}_\d{2}_\d{2}_(\d+)')
 DRAGON_MOTION = DBTableMetadata('DragonMotion', pk='name', field_type=MOTION_FIELDS)
 DRAGON_REF = re.compile(r'D(\d{8})_\d{3}_\d{2}')
 
+# strings, and the brackets that change the nesting; numbers and literals are never looked at
+JSON_TOKEN = re.compile(rb'"((?:[^"\\]|\\.)*)"\s*(:)?|[{}\[\]]')
+JSON_DECODER = json.JSONDecoder()
+CLIP_FIELDS = (('name',), ('m_MuscleClip', 'm_StartTime'), ('m_MuscleClip', 'm_StopTime'))
+
+def scan_json_fields(path, fields):
+    """Values at the key paths in fields, read without parsing the rest of the document.
+
+    The file is scanned for keys and nesting only, and the scan stops once every field is found.
+    A path does not go through lists, fields missing from the document are left out.
+    """
+    # keys are compared as utf-8 bytes, only escaped keys need decoding
+    wanted = {tuple(k.encode('utf-8') for k in field): field for field in fields}
+    found = {}
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return found
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # keys of the open containers, None for the root and for list items
+            containers = []
+            key = None
+            pos = 0
+            while True:
+                token = JSON_TOKEN.search(mm, pos)
+                if token is None:
+                    break
+                pos = token.end()
+                if token.group(2):
+                    key = token.group(1)
+                    if b'\\' in key:
+                        key = json.loads(mm[token.start():token.end(1)+1]).encode('utf-8')
+                    field = tuple(containers[1:]) + (key,)
+                    if field in wanted:
+                        found[wanted[field]] = decode_value(mm, pos)
+                        if len(found) == len(wanted):
+                            break
+                elif token.group(1) is None:
+                    bracket = token.group(0)
+                    if bracket == b'[':
+                        # curve data is mostly long lists of numbers, skip to the end of those in one go
+                        end = skip_number_list(mm, pos)
+                        if end is not None:
+                            pos = end
+                            key = None
+                            continue
+                    if bracket in (b'{', b'['):
+                        containers.append(key)
+                    elif containers:
+                        containers.pop()
+                    # the next container opened is a list item until a key says otherwise
+                    key = None
+    return found
+
+def skip_number_list(mm, pos):
+    # pos is just inside a '[', the end of the list if it only holds numbers and lists of them, else None;
+    # finds are much faster than a token search over the long curve lists
+    depth = 1
+    while True:
+        end = mm.find(b']', pos)
+        if end < 0 or mm.find(b'"', pos, end) >= 0 or mm.find(b'{', pos, end) >= 0:
+            return None
+        nested = mm.find(b'[', pos, end)
+        if nested >= 0:
+            depth += 1
+            pos = nested + 1
+        else:
+            depth -= 1
+            pos = end + 1
+            if depth == 0:
+                return pos
+
+def decode_value(mm, pos, size=256):
+    # the values looked up here are scalars, a short window usually holds them;
+    # a value that runs to the end of the window may be cut short, so the window grows until the value ends in it
+    while True:
+        window = mm[pos:pos+size].decode('utf-8', errors='ignore')
+        try:
+            value, end = JSON_DECODER.raw_decode(window, len(window) - len(window.lstrip()))
+            if end < len(window) or pos + size >= len(mm):
+                return value
+        except json.JSONDecodeError:
+            if pos + size >= len(mm):
+                raise
+        size *= 4
+
+def load_clip_summary(path):
+    """The name and muscle clip times of an AnimationClip dump, nested like the full dump."""
+    fields = scan_json_fields(path, CLIP_FIELDS)
+    return {
+        'name': fields[('name',)],
+        'm_MuscleClip': {
+            'm_StartTime': fields[('m_MuscleClip', 'm_StartTime')],
+            'm_StopTime': fields[('m_MuscleClip', 'm_StopTime')]
+        }
+    }
+
 def build_motion(data, ref_pattern):
     db_data = {}
     db_data['name'] = data['name']
@@ -37,9 +134,7 @@ def load_motion(db, path, meta, ref_pattern):
         for file_name in files:
             file_path = os.path.join(root, file_name)
             try:
-                with open(file_path) as f:
-                    data = json.load(f)
-                    motions.append(build_motion(data, ref_pattern))
+                motions.append(build_motion(load_clip_summary(file_path), ref_pattern))
             except (KeyError, TypeError):
                 pass
     db.insert_many(meta.name, motions)
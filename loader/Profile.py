@@ -0,0 +1,175 @@
+import atexit
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+
+PROFILE_ENV = 'DL_PROFILE'
+PROFILE_TABLE = 'table'
+STATEMENT_WIDTH = 100
+
+WHITESPACE = re.compile(r'\s+')
+PARAM_LIST = re.compile(r'\(\?(?:\s*,\s*\?)+\)')
+SELECT_LIST = re.compile(r'^SELECT (.+?) FROM ')
+
+def normalize_statement(query):
+    # IN lists of any length count as one statement
+    return PARAM_LIST.sub('(?, ...)', WHITESPACE.sub(' ', query).strip())
+
+def short_statement(statement):
+    # column lists of the views are long enough to hide the rest of the statement
+    res = SELECT_LIST.match(statement)
+    if res and res.group(1).count(',') > 2:
+        statement = f'SELECT <{res.group(1).count(",")+1} columns> FROM {statement[res.end():]}'
+    if len(statement) > STATEMENT_WIDTH:
+        statement = statement[:STATEMENT_WIDTH-3] + '...'
+    return statement
+
+class QueryStats:
+    __slots__ = ('count', 'total', 'max', 'rows')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'total_ms': self.total * 1000,
+            'avg_ms': self.total * 1000 / self.count if self.count else 0.0,
+            'max_ms': self.max * 1000,
+            'rows': self.rows
+        }
+
+class QueryProfile:
+    """Per statement query timings and per view get counts of a DBManager.
+
+    output is a path ending in .json to dump JSON there, anything else prints a table to stderr.
+    """
+    def __init__(self, output=PROFILE_TABLE):
+        self.output = output
+        self.statements = {}
+        self.normalized = {}
+        self.views = {}
+
+    def statement(self, query):
+        try:
+            key = self.normalized[query]
+        except KeyError:
+            key = self.normalized[query] = normalize_statement(query)
+        try:
+            return self.statements[key]
+        except KeyError:
+            stats = self.statements[key] = QueryStats()
+            return stats
+
+    def count_view(self, name):
+        self.views[name] = self.views.get(name, 0) + 1
+
+    def as_dict(self):
+        statements = sorted(self.statements.items(), key=lambda x: x[1].total, reverse=True)
+        return {
+            'queries': [dict(statement=k, **v.as_dict()) for k, v in statements],
+            'views': dict(sorted(self.views.items(), key=lambda x: x[1], reverse=True))
+        }
+
+    def format_table(self):
+        lines = [f'{"count":>8} {"total ms":>10} {"avg ms":>8} {"max ms":>8} {"rows":>9}  statement']
+        for entry in self.as_dict()['queries']:
+            statement = short_statement(entry['statement'])
+            lines.append(f'{entry["count"]:>8} {entry["total_ms"]:>10.1f} {entry["avg_ms"]:>8.3f} {entry["max_ms"]:>8.3f} {entry["rows"]:>9}  {statement}')
+        if self.views:
+            lines.append('')
+            lines.append(f'{"gets":>8}  view')
+            for name, count in self.as_dict()['views'].items():
+                lines.append(f'{count:>8}  {name}')
+        return '\n'.join(lines)
+
+    def dump(self):
+        if not self.statements and not self.views:
+            return
+        if self.output and self.output.endswith('.json'):
+            with open(self.output, 'w', encoding='utf-8') as fp:
+                json.dump(self.as_dict(), fp, indent=2)
+        else:
+            print(self.format_table(), file=sys.stderr)
+
+class ProfiledCursor(sqlite3.Cursor):
+    stats = None
+    elapsed = 0.0
+
+    def record(self, query, start, rows=0):
+        self.elapsed = time.perf_counter() - start
+        self.stats = self.connection.profile.statement(query)
+        self.stats.count += 1
+        self.stats.total += self.elapsed
+        self.stats.rows += rows
+        self.stats.max = max(self.stats.max, self.elapsed)
+
+    def fetched(self, start, rows):
+        # fetch time belongs to the statement that produced the rows
+        if self.stats is None:
+            return
+        elapsed = time.perf_counter() - start
+        self.elapsed += elapsed
+        self.stats.total += elapsed
+        self.stats.rows += rows
+        self.stats.max = max(self.stats.max, self.elapsed)
+
+    def execute(self, query, param=()):
+        start = time.perf_counter()
+        res = super().execute(query, param)
+        self.record(query, start, max(self.rowcount, 0))
+        return res
+
+    def executemany(self, query, params):
+        start = time.perf_counter()
+        res = super().executemany(query, params)
+        self.record(query, start, max(self.rowcount, 0))
+        return res
+
+    def fetchone(self):
+        start = time.perf_counter()
+        res = super().fetchone()
+        self.fetched(start, int(res is not None))
+        return res
+
+    def fetchall(self):
+        start = time.perf_counter()
+        res = super().fetchall()
+        self.fetched(start, len(res))
+        return res
+
+class ProfiledConnection(sqlite3.Connection):
+    profile = None
+
+    def cursor(self, factory=ProfiledCursor):
+        return super().cursor(factory)
+
+    def execute(self, query, param=()):
+        return self.cursor().execute(query, param)
+
+    def executemany(self, query, params):
+        return self.cursor().executemany(query, params)
+
+def profile_output(output=None):
+    if output is None:
+        output = os.environ.get(PROFILE_ENV) or None
+    if output in ('0', 'false', 'no'):
+        return None
+    if output in ('1', 'true', 'yes'):
+        return PROFILE_TABLE
+    return output
+
+def start_profile(output):
+    profile = QueryProfile(output)
+    atexit.register(profile.dump)
+    return profile
+
+def add_profile_argument(parser):
+    parser.add_argument('--profile', type=str, nargs='?', const=PROFILE_TABLE, default=None,
+        help=f'print query and view timings at exit, or write them to a .json path (also set by {PROFILE_ENV})')
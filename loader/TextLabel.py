@@ -0,0 +1,182 @@
+import csv
+import hashlib
+import json
+import mmap
+import os
+import struct
+from bisect import bisect_left
+from collections.abc import Mapping
+from functools import lru_cache
+
+# Label store file layout, native byte order:
+# header (magic, version, count)
+# key offsets (count + 1 uint32), value offsets (count + 1 uint32)
+# null bitmap ((count + 7) // 8 bytes, bit set where the label text is NULL)
+# utf-8 keys sorted bytewise, utf-8 values in key order
+MAGIC = b'DLTL'
+VERSION = 2
+# decoded labels kept per store, recent ones only so the store stays small in memory
+CACHE_SIZE = 4096
+HEADER = struct.Struct('=4sII')
+OFFSET = 'I'
+OFFSET_SIZE = struct.calcsize(OFFSET)
+STORE_EXT = '.lbl'
+# with $DL_LABEL_CACHE set, stores are kept in that directory instead of next to their source
+CACHE_ENV = 'DL_LABEL_CACHE'
+
+class SortedKeys:
+    def __init__(self, data, base, offsets):
+        self.data = data
+        self.base = base
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, idx):
+        return self.data[self.base+self.offsets[idx]:self.base+self.offsets[idx+1]]
+
+class TextLabelStore(Mapping):
+    """Read only label id to text mapping backed by a memory mapped store file."""
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count = HEADER.unpack_from(self.mm)
+        if magic != MAGIC or version != VERSION:
+            self.mm.close()
+            raise ValueError(f'{path} is not a label store')
+        view = memoryview(self.mm)
+        start = HEADER.size
+        end = start + (count + 1) * OFFSET_SIZE
+        key_offsets = view[start:end].cast(OFFSET)
+        start, end = end, end + (count + 1) * OFFSET_SIZE
+        self.text_offsets = view[start:end].cast(OFFSET)
+        start, end = end, end + (count + 7) // 8
+        self.nulls = view[start:end]
+        self.ids = SortedKeys(self.mm, end, key_offsets)
+        self.texts = view[end+key_offsets[-1]:]
+        # thread safe, sqlite functions call it from every reader
+        self.cached = lru_cache(CACHE_SIZE)(self.decode)
+
+    def __reduce__(self):
+        # worker processes and snapshots reopen the file instead of copying labels
+        return (self.__class__, (self.path,))
+
+    def find(self, key):
+        if not isinstance(key, str):
+            return -1
+        key = key.encode('utf-8')
+        idx = bisect_left(self.ids, key)
+        if idx < len(self.ids) and self.ids[idx] == key:
+            return idx
+        return -1
+
+    def decode(self, key):
+        idx = self.find(key)
+        if idx < 0:
+            raise KeyError(key)
+        if self.nulls[idx >> 3] & (1 << (idx & 7)):
+            return None
+        return str(self.texts[self.text_offsets[idx]:self.text_offsets[idx+1]], 'utf-8')
+
+    def __getitem__(self, key):
+        try:
+            return self.cached(key)
+        except TypeError:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        return self.find(key) >= 0
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __iter__(self):
+        for idx in range(len(self.ids)):
+            yield str(self.ids[idx], 'utf-8')
+
+    def lookup(self, key):
+        # for sqlite functions, missing labels are NULL like a LEFT JOIN
+        try:
+            return self[key]
+        except KeyError:
+            return None
+
+    def close(self):
+        self.cached.cache_clear()
+        self.ids = self.texts = self.text_offsets = self.nulls = None
+        self.mm.close()
+
+def write_store(path, items):
+    labels = {key.encode('utf-8'): None if value is None else value.encode('utf-8') for key, value in items}
+    keys = sorted(labels)
+    key_offsets = [0]
+    value_offsets = [0]
+    nulls = bytearray((len(keys) + 7) // 8)
+    for idx, key in enumerate(keys):
+        if labels[key] is None:
+            nulls[idx >> 3] |= 1 << (idx & 7)
+            labels[key] = b''
+        key_offsets.append(key_offsets[-1] + len(key))
+        value_offsets.append(value_offsets[-1] + len(labels[key]))
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(keys)))
+        f.write(struct.pack(f'={len(key_offsets)}{OFFSET}', *key_offsets))
+        f.write(struct.pack(f'={len(value_offsets)}{OFFSET}', *value_offsets))
+        f.write(nulls)
+        f.writelines(keys)
+        f.writelines(labels[key] for key in keys)
+    os.replace(tmp_path, path)
+
+def is_fresh(store_path, source_path):
+    try:
+        return os.path.getmtime(store_path) >= os.path.getmtime(source_path)
+    except OSError:
+        return False
+
+def read_csv_labels(path, tabs=True):
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        reader = csv.reader(f, dialect='excel-tab' if tabs else 'excel')
+        next(reader, None)
+        for row in reader:
+            if len(row) > 1 and row[0] != '0':
+                yield row[0], row[1]
+
+def read_json_labels(path):
+    with open(path, encoding='utf-8') as f:
+        for entry in json.load(f):
+            yield entry['_Id'], entry['_Text']
+
+def source_store_path(source_path):
+    cache_dir = os.environ.get(CACHE_ENV)
+    if not cache_dir:
+        return source_path + STORE_EXT
+    # named after the full source path, so sources with the same name get their own store
+    source_path = os.path.abspath(source_path)
+    digest = hashlib.sha1(source_path.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(cache_dir, f'{os.path.basename(source_path)}.{digest}{STORE_EXT}')
+
+def load_store(source_path, read_labels):
+    # the store is rebuilt when the source is newer, labels are held in a dict instead
+    # when the store cannot be written, like next to a source in a read only directory
+    store_path = source_store_path(source_path)
+    if is_fresh(store_path, source_path):
+        try:
+            return TextLabelStore(store_path)
+        except ValueError:
+            # written by an older layout
+            pass
+    try:
+        os.makedirs(os.path.dirname(store_path) or '.', exist_ok=True)
+        write_store(store_path, read_labels(source_path))
+    except OSError:
+        return dict(read_labels(source_path))
+    return TextLabelStore(store_path)
+
+def load_csv_labels(path, tabs=True):
+    return load_store(path, lambda source_path: read_csv_labels(source_path, tabs=tabs))
+
+def load_json_labels(path):
+    return load_store(path, read_json_labels)
@@ -0,0 +1,110 @@
+import io
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image
+
+from loader.AssetStore import detach
+
+PNG = 'png'
+WEBP = 'webp'
+RGBA = 'rgba'
+FORMATS = {PNG: '.png', WEBP: '.webp', RGBA: '.rgba'}
+TEXTURE_EXTS = tuple(FORMATS.values())
+# next to every raw .rgba file, since the bytes alone do not say how to lay them out
+SIDECAR_EXT = '.json'
+
+def open_texture(path):
+    """Opens a texture written by any TextureEncoder format as a PIL image."""
+    if path.endswith(FORMATS[RGBA]):
+        with open(path + SIDECAR_EXT) as f:
+            header = json.load(f)
+        with open(path, 'rb') as f:
+            return Image.frombytes(header['mode'], (header['width'], header['height']), f.read())
+    return Image.open(path)
+
+class TextureEncoder:
+    """Writes extracted textures in one output format.
+    png: compress_level 0-9 (PIL default 6) and optimize, the slowest part of extraction at the defaults
+    webp: lossless, method 0-6 trades speed for size
+    rgba: raw pixels with a json sidecar of width, height and mode, no compression at all
+    With workers, encoding runs in its own thread pool so bundle parsing does not wait on it,
+    call join once the bundles are done to wait for the pending files.
+    With a store (loader.AssetStore) the encoded files go through it and are deduplicated.
+    """
+    def __init__(self, fmt=PNG, compress_level=6, optimize=False, method=4, workers=0, store=None):
+        if fmt not in FORMATS:
+            raise ValueError(f'unknown texture format {fmt}, expected one of {", ".join(FORMATS)}')
+        self.fmt = fmt
+        self.ext = FORMATS[fmt]
+        self.compress_level = compress_level
+        self.optimize = optimize
+        self.method = method
+        self.store = store
+        self.executor = ThreadPoolExecutor(workers) if workers else None
+        # caps the decoded images waiting on the pool
+        self.pending = threading.BoundedSemaphore(workers * 2) if workers else None
+        self.futures = []
+
+    def write(self, dest, data):
+        if self.store is not None:
+            self.store.put(dest, data)
+        else:
+            detach(dest)
+            with open(dest, 'wb') as f:
+                f.write(data)
+
+    def encode(self, img, dest):
+        if self.fmt == RGBA:
+            if img.mode != 'RGBA':
+                img = img.convert('RGBA')
+            header = {'width': img.width, 'height': img.height, 'mode': img.mode}
+            self.write(dest + SIDECAR_EXT, json.dumps(header).encode('utf8'))
+            self.write(dest, img.tobytes())
+            return dest
+        if self.store is None:
+            detach(dest)
+            buffer = dest
+        else:
+            buffer = io.BytesIO()
+        if self.fmt == PNG:
+            img.save(buffer, 'PNG', compress_level=self.compress_level, optimize=self.optimize)
+        else:
+            img.save(buffer, 'WEBP', lossless=True, quality=100, method=self.method)
+        if self.store is not None:
+            self.store.put(dest, buffer.getvalue())
+        return dest
+
+    def save(self, img, dest):
+        """Saves img at dest with the extension of the format, returns the path."""
+        dest = os.path.splitext(dest)[0] + self.ext
+        if self.executor is None:
+            return self.encode(img, dest)
+        self.pending.acquire()
+        future = self.executor.submit(self.encode, img, dest)
+        future.add_done_callback(lambda _: self.pending.release())
+        self.futures.append(future)
+        return dest
+
+    def join(self):
+        futures, self.futures = self.futures, []
+        for future in futures:
+            future.result()
+
+    def close(self):
+        self.join()
+        if self.executor is not None:
+            self.executor.shutdown()
+
+def add_texture_arguments(parser):
+    parser.add_argument('-tex', type=str, help='texture format, png, webp (lossless) or rgba (raw with a sidecar)',
+                        choices=tuple(FORMATS), default=PNG)
+    parser.add_argument('-tex_level', type=int, help='png compress level, 0-9', default=6)
+    parser.add_argument('-tex_optimize', help='png optimize, smallest and slowest', action='store_true')
+    parser.add_argument('-tex_workers', type=int, help='texture encoding threads, 0 encodes inline', default=0)
+
+def texture_encoder_from_args(args, store=None):
+    return TextureEncoder(args.tex, compress_level=args.tex_level, optimize=args.tex_optimize, workers=args.tex_workers,
+                          store=store)
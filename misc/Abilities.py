@@ -2,11 +2,11 @@ import argparse
 import json
 import os
 from dataclasses import dataclass
-from typing import List, Dict, Any, Callable
+from typing import List, Dict, Any, Callable, Mapping
 
-from Actions import get_text_label
 from Common import run_common
 from Mappings import AFFLICTION_TYPES, ABILITY_CONDITION_TYPES
+from TextLabel import get_text_label
 
 
 STAT_ABILITIES = {
@@ -55,7 +55,7 @@ ABILITY_TYPES: Dict[int, Callable[[List[int], str], str]] = {
 }
 
 
-@dataclass
+@dataclass(slots=True)
 class AbilityPart:
     ability_type: int
     ids: List[int]
@@ -73,7 +73,7 @@ class AbilityPart:
                 self.description = ''
 
 
-@dataclass
+@dataclass(slots=True)
 class AbilityData:
     id: int
     event_id: int
@@ -113,7 +113,7 @@ def ability_part(data: Dict[str, Any], suffix: str) -> AbilityPart:
     )
 
 
-def get_ability_data(in_dir: str, label: Dict[str, str]) -> Dict[int, AbilityData]:
+def get_ability_data(in_dir: str, label: Mapping[str, str]) -> Dict[int, AbilityData]:
     with open(os.path.join(in_dir, 'AbilityData.json')) as f:
         data: List[Dict[str, Any]] = json.load(f)
         abilities = {}
@@ -6,19 +6,18 @@ import re
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
-from typing import List, Dict, Callable, Optional, Union, Any
+from typing import List, Dict, Callable, Optional, Union, Any, Iterator, Mapping
 
 from ActionConditions import ActionConditionData, get_action_condition_data
 from Asset_Extract import check_target_path
 from Common import EnhancedJSONEncoder, load_by_id
-from TextLabel import get_text_label
 
 
 def to_frames(duration: float) -> int:
     return round(duration * 60)
 
 
-@dataclass
+@dataclass(slots=True)
 class HitAttributeData:
     id: str
     hit_exec: int
@@ -90,12 +89,34 @@ def parse_hit_attributes(data: dict):
     )
 
 
-def get_hit_attribute_data(in_dir: str) -> Dict[str, HitAttributeData]:
-    return {data[0]: parse_hit_attributes(data[1]) for data in
-            load_by_id(os.path.join(in_dir, 'PlayerActionHitAttribute.json')).items()}
+LV_SUFFIXES = ['LV01', 'LV02', 'LV03', 'LV04']
+LV_LABEL = re.compile('.*LV0[1-4]')
 
 
-@dataclass
+def build_hit_attribute_levels(attributes: Dict[str, HitAttributeData]) -> Dict[str, List[HitAttributeData]]:
+    levels: Dict[str, List[HitAttributeData]] = {}
+    for label in sorted(attributes.keys(), key=lambda k: k[-4:]):
+        if label[-4:] in LV_SUFFIXES:
+            levels.setdefault(label[0:-4], []).append(attributes[label])
+    return levels
+
+
+class HitAttributes(Dict[str, HitAttributeData]):
+    _levels: Optional[Dict[str, List[HitAttributeData]]] = None
+
+    @property
+    def levels(self) -> Dict[str, List[HitAttributeData]]:
+        if self._levels is None:
+            self._levels = build_hit_attribute_levels(self)
+        return self._levels
+
+
+def get_hit_attribute_data(in_dir: str) -> HitAttributes:
+    return HitAttributes((data[0], parse_hit_attributes(data[1])) for data in
+                         load_by_id(os.path.join(in_dir, 'PlayerActionHitAttribute.json')).items())
+
+
+@dataclass(slots=True)
 class Event:
     name: str = ''
     seconds: float = 0.0
@@ -127,7 +148,7 @@ class Event:
                        f'{to_frames(self.default_start)}f'
 
 
-@dataclass
+@dataclass(slots=True)
 class PartsMotion(Event):
     activate_id: int = 0
     motion_state: str = ''
@@ -148,7 +169,7 @@ class PartsMotion(Event):
                f'blend_duration {self.blend_duration:.3f} : {to_frames(self.blend_duration)}f'
 
 
-@dataclass
+@dataclass(slots=True)
 class Hit(Event):
     interval: float = 50.0
     lifetime: Optional[float] = None
@@ -163,7 +184,7 @@ class Hit(Event):
                (f', lifetime {self.lifetime:.3f} : {to_frames(self.lifetime)}f' if self.lifetime else '')
 
 
-@dataclass
+@dataclass(slots=True)
 class ActiveCancel(Event):
     activate_id: int = 0
     action_id: int = 0
@@ -187,7 +208,7 @@ SIGNAL_TYPES = {
 }
 
 
-@dataclass
+@dataclass(slots=True)
 class Signal(Event):
     activate_id: int = 0
     signal_type: int = 0
@@ -406,17 +427,46 @@ def get_action_metadata(in_dir: str) -> Dict[int, PlayerActionMetadata]:
         return metadata
 
 
-def get_actions(in_dir: str, labels: Dict[str, str], metadata: Dict[int, PlayerActionMetadata]) -> Dict[int, Action]:
-    file_filter = re.compile('PlayerAction_[0-9]+\\.json')
-    hit_attrs = get_hit_attribute_data(in_dir)
-    action_conditions = get_action_condition_data(in_dir, labels)
-    actions = {}
-    for root, _, files in os.walk(in_dir):
-        for file_name in [f for f in files if file_filter.match(f) and f.startswith('PlayerAction')]:
-            file_path = os.path.join(root, file_name)
-            action = parse_action(file_path, hit_attrs, action_conditions, metadata)
-            actions[action.id] = action
-    return actions
+class ActionStore(Mapping[int, Action]):
+    FILE_FILTER = re.compile('PlayerAction_([0-9]+)\\.json')
+
+    def __init__(self, in_dir: str, attributes: Dict[str, HitAttributeData],
+                 action_conditions: Dict[int, ActionConditionData], metadata: Dict[int, PlayerActionMetadata]):
+        self.attributes = attributes
+        self.action_conditions = action_conditions
+        self.metadata = metadata
+        self.paths: Dict[int, str] = {}
+        self.parsed: Dict[int, Action] = {}
+        for root, _, files in os.walk(in_dir):
+            for file_name in files:
+                res = self.FILE_FILTER.match(file_name)
+                if res:
+                    self.paths[int(res.group(1))] = os.path.join(root, file_name)
+
+    def __getitem__(self, action_id: int) -> Action:
+        if action_id not in self.parsed:
+            self.parsed[action_id] = parse_action(self.paths[action_id], self.attributes, self.action_conditions,
+                                                  self.metadata)
+        return self.parsed[action_id]
+
+    def __contains__(self, action_id: Any) -> bool:
+        return action_id in self.paths
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.paths)
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+
+def get_actions(in_dir: str, labels: Mapping[str, str], metadata: Dict[int, PlayerActionMetadata],
+                hit_attrs: Optional[Dict[str, HitAttributeData]] = None,
+                action_conditions: Optional[Dict[int, ActionConditionData]] = None) -> ActionStore:
+    if hit_attrs is None:
+        hit_attrs = get_hit_attribute_data(in_dir)
+    if action_conditions is None:
+        action_conditions = get_action_condition_data(in_dir, labels)
+    return ActionStore(in_dir, hit_attrs, action_conditions, metadata)
 
 
 def get_action_and_associated(action: Action, actions: Dict[int, Action], exclude_default_combo: bool = True):
@@ -441,10 +491,9 @@ def get_action_and_associated(action: Action, actions: Dict[int, Action], exclud
 
 
 def attributes_for_label(label: str, attributes: Dict[str, HitAttributeData]) -> List[HitAttributeData]:
-    if re.compile('.*LV0[1-4]').match(label):
-        suffixes = ['LV01', 'LV02', 'LV03', 'LV04']
-        base_name = label[0:-4]
-        return [attributes[base_name + suffix] for suffix in suffixes if base_name + suffix in attributes.keys()]
+    if LV_LABEL.match(label):
+        levels = attributes.levels if isinstance(attributes, HitAttributes) else build_hit_attribute_levels(attributes)
+        return levels.get(label[0:-4], [])
     else:
         return [attributes[label]] if label in attributes.keys() else []
 
@@ -491,17 +540,18 @@ def process_action(in_path: str, out_path: str, mode: str, attributes: Dict[str,
                 f.write(f'{event}\n')
 
 
-def process_actions(in_path: str, out_path: str, mode: str):
+def process_actions(in_path: str, out_path: str, mode: str, session=None):
+    from Session import Session
     extension = {
         'json': '.json',
         'simple': '.txt'
     }[mode]
     file_filter = re.compile('PlayerAction_[0-9]+\\.json')
     if os.path.isdir(in_path):
-        labels = get_text_label(in_path)
-        attributes = get_hit_attribute_data(in_path)
-        metadata = get_action_metadata(in_path)
-        action_conditions = get_action_condition_data(in_path, labels)
+        session = session or Session(in_path)
+        attributes = session.get_hit_attribute_data()
+        metadata = session.get_action_metadata()
+        action_conditions = session.get_action_condition_data()
         for root, _, files in os.walk(in_path):
             for file_name in [f for f in files if file_filter.match(f) and f.startswith('PlayerAction')]:
                 file_in_path = os.path.join(root, file_name)
@@ -510,11 +560,10 @@ def process_actions(in_path: str, out_path: str, mode: str):
     else:
         if os.path.isdir(out_path):
             out_path = os.path.join(out_path, Path(in_path).with_suffix(extension).name)
-        in_dir = Path(in_path).parent
-        labels = get_text_label(in_dir)
-        attributes = get_hit_attribute_data(in_dir)
-        metadata = get_action_metadata(in_dir)
-        action_conditions = get_action_condition_data(in_dir, labels)
+        session = session or Session(str(Path(in_path).parent))
+        attributes = session.get_hit_attribute_data()
+        metadata = session.get_action_metadata()
+        action_conditions = session.get_action_condition_data()
         process_action(in_path, out_path, mode, attributes, action_conditions, metadata)
 
 
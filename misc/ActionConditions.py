@@ -1,14 +1,14 @@
 import argparse
 import os
 from dataclasses import dataclass
-from typing import Dict
+from typing import Dict, Mapping
 
 from Common import run_common, load_by_id
 from Mappings import AFFLICTION_TYPES
 from TextLabel import get_text_label
 
 
-@dataclass
+@dataclass(slots=True)
 class ActionConditionData:
     id: int
     type: str
@@ -124,7 +124,7 @@ class ActionConditionData:
         return (self.id, self.text).__hash__()
 
 
-def parse_action_condition(data: dict, labels: Dict[str, str]) -> ActionConditionData:
+def parse_action_condition(data: dict, labels: Mapping[str, str]) -> ActionConditionData:
     return ActionConditionData(
         id=data['_Id'],
         type=AFFLICTION_TYPES.get(data['_Type'], str(data['_Type'])),
@@ -211,7 +211,7 @@ def parse_action_condition(data: dict, labels: Dict[str, str]) -> ActionConditio
     )
 
 
-def get_action_condition_data(in_dir: str, label: Dict[str, str]) -> Dict[int, ActionConditionData]:
+def get_action_condition_data(in_dir: str, label: Mapping[str, str]) -> Dict[int, ActionConditionData]:
     return {data[0]: parse_action_condition(data[1], label) for data in
             load_by_id(os.path.join(in_dir, 'ActionCondition.json')).items()}
 
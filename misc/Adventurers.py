@@ -2,18 +2,18 @@ import argparse
 import json
 import os
 from dataclasses import dataclass
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, List, Optional, Union, Mapping
 
-from loader.Abilities import get_ability_data, AbilityData, get_ability_and_references
-from loader.ActionConditions import ActionConditionData, get_action_condition_data
-from loader.Actions import get_text_label, \
-    get_actions, Action, get_action_metadata
-from loader.CharacterMotion import AnimationClipData, get_animation_clip_data_by_id
-from loader.Common import run_common
-from loader.Mappings import ELEMENTS, WEAPON_TYPES
-from loader.Mode import get_modes, Mode
-from loader.Skills import Skill, get_skills
-from loader.UniqueCombo import get_unique_combos, UniqueCombo
+from Abilities import AbilityData, get_ability_and_references
+from ActionConditions import ActionConditionData
+from Action import Action
+from CharacterMotion import AnimationClipData
+from Common import run_common
+from Mappings import ELEMENTS, WEAPON_TYPES
+from Mode import Mode
+from Session import Session
+from Skills import Skill
+from UniqueCombo import UniqueCombo
 
 
 @dataclass
@@ -131,7 +131,7 @@ def get_skill_transforms(skill: Skill, skills: Dict[int, Skill]) -> List[Skill]:
     return [skills[sid] for sid in ids]
 
 
-def get_adventurer_data(in_dir: str, label: Dict[str, str]) -> Dict[int, AdventurerData]:
+def get_adventurer_data(in_dir: str, label: Mapping[str, str]) -> Dict[int, AdventurerData]:
     with open(os.path.join(in_dir, 'CharaData.json')) as f:
         data: List[Dict[str, Any]] = json.load(f)
         adventurers = {}
@@ -242,7 +242,7 @@ def gather_adventurer(adventurer_data: AdventurerData, skills: Dict[int, Skill],
     )
 
 
-def get_adventurers(in_dir: str, label: Dict[str, str], skills: Dict[int, Skill], actions: Dict[int, Action],
+def get_adventurers(in_dir: str, label: Mapping[str, str], skills: Dict[int, Skill], actions: Dict[int, Action],
                     action_conditions: Dict[int, ActionConditionData],
                     abilities: Dict[int, AbilityData], combos: Dict[int, UniqueCombo],
                     modes: Dict[int, Mode], animation_clips: Dict[int, Dict[str, AnimationClipData]]) \
@@ -252,23 +252,21 @@ def get_adventurers(in_dir: str, label: Dict[str, str], skills: Dict[int, Skill]
         for adv_id, adv in get_adventurer_data(in_dir, label).items()}
 
 
-def run(in_dir: str) -> Dict[int, Adventurer]:
-    label = get_text_label(in_dir)
-    metadata = get_action_metadata(in_dir)
-    actions = get_actions(in_dir, label, metadata)
-    action_conditions = get_action_condition_data(in_dir, label)
-    abilities = get_ability_data(in_dir, label)
-    skills = get_skills(in_dir, label, actions, abilities)
-    combos = get_unique_combos(in_dir, actions)
-    modes = get_modes(in_dir, actions, skills, combos)
-    animation_clips = get_animation_clip_data_by_id(os.path.join(in_dir, 'characters_motion'))
-    return get_adventurers(in_dir, label, skills, actions, action_conditions, abilities, combos, modes,
-                           animation_clips)
+def run(in_dir: str, session: Optional[Session] = None) -> Dict[int, Adventurer]:
+    session = session or Session(in_dir)
+    return get_adventurers(in_dir, session.get_text_label(), session.get_skills(), session.get_actions(),
+                           session.get_action_condition_data(), session.get_ability_data(),
+                           session.get_unique_combos(), session.get_modes(), session.get_animation_clips())
 
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description='Adventurer Data.')
     parser.add_argument('-i', type=str, help='input dir (from extracting master and actions)', default='./extract')
     parser.add_argument('-o', type=str, help='output dir', default='./out/adventurers')
+    parser.add_argument('-s', type=str, help='session snapshot file, reused if up to date', default=None)
+    parser.add_argument('-c', help='write shared objects once and refer to them by $ref', action='store_true')
     args = parser.parse_args()
-    run_common(args.o, [(f'{adv.id}_{adv.name}', adv) for adv in run(args.i).values()])
+    session = Session.open(args.i, snapshot=args.s)
+    run_common(args.o, [(f'{adv.id}_{adv.name}', adv) for adv in run(args.i, session).values()], compact=args.c)
+    if args.s:
+        session.save_snapshot(args.s)
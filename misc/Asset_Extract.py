@@ -2,6 +2,8 @@ import os
 import argparse
 import errno
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from UnityPy import AssetsManager
 
 def check_target_path(target):
@@ -50,14 +52,49 @@ def write_json(f, data):
 write = write_json
 mono_ext = '.json'
 
+# same formats as loader/TextureEncoder.py, rgba is raw pixels with a json sidecar of width, height and mode
+tex_formats = {'png': '.png', 'webp': '.webp', 'rgba': '.rgba'}
+tex_format = 'png'
+tex_level = 6
+tex_optimize = False
+tex_pool = None
+tex_pending = None
+tex_futures = []
+
+def save_texture(img, dest):
+    if tex_format == 'rgba':
+        if img.mode != 'RGBA':
+            img = img.convert('RGBA')
+        with open(dest + '.json', 'w') as f:
+            json.dump({'width': img.width, 'height': img.height, 'mode': img.mode}, f)
+        with open(dest, 'wb') as f:
+            f.write(img.tobytes())
+    elif tex_format == 'webp':
+        img.save(dest, 'WEBP', lossless=True, quality=100, method=4)
+    else:
+        img.save(dest, 'PNG', compress_level=tex_level, optimize=tex_optimize)
+
+def join_textures():
+    global tex_futures
+    futures, tex_futures = tex_futures, []
+    for future in futures:
+        future.result()
+
 def unpack_Texture2D(data, dest):
     print('Texture2D', dest, flush=True)
     dest, _ = os.path.splitext(dest)
-    dest = dest + '.png'
+    dest = dest + tex_formats[tex_format]
     check_target_path(dest)
 
     img = data.image
-    img.save(dest)
+    if tex_pool is None:
+        save_texture(img, dest)
+    else:
+        # caps the decoded images waiting on the pool
+        tex_pending.acquire()
+        future = tex_pool.submit(save_texture, img, dest)
+        future.add_done_callback(lambda _: tex_pending.release())
+        tex_futures.append(future)
 
 def unpack_MonoBehaviour(data, dest):
     print('MonoBehaviour', dest, flush=True)
@@ -147,11 +184,25 @@ if __name__ == '__main__':
     parser.add_argument('-i', type=str, help='input dir', default='./download')
     parser.add_argument('-o', type=str, help='output dir', default='./extract')
     parser.add_argument('-mode', type=str, help='export format, default json, can also use mono', default='json')
+    parser.add_argument('-tex', type=str, help='texture format, png, webp (lossless) or rgba (raw with a sidecar)',
+                        choices=tuple(tex_formats), default='png')
+    parser.add_argument('-tex_level', type=int, help='png compress level, 0-9', default=6)
+    parser.add_argument('-tex_optimize', help='png optimize, smallest and slowest', action='store_true')
+    parser.add_argument('-tex_workers', type=int, help='texture encoding threads, 0 encodes inline', default=0)
     args = parser.parse_args()
     if args.mode == 'mono':
         write = write_mono
         mono_ext = '.mono'
+    tex_format = args.tex
+    tex_level = args.tex_level
+    tex_optimize = args.tex_optimize
+    if args.tex_workers:
+        tex_pool = ThreadPoolExecutor(args.tex_workers)
+        tex_pending = threading.BoundedSemaphore(args.tex_workers * 2)
     if os.path.isdir(args.i):
         unpack_all_assets(args.i, args.o)
     else:
-        unpack_asset(args.i, args.o)
\ No newline at end of file
+        unpack_asset(args.i, args.o)
+    join_textures()
+    if tex_pool is not None:
+        tex_pool.shutdown()
\ No newline at end of file
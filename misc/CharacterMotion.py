@@ -1,10 +1,12 @@
-import json
 import os
 from dataclasses import dataclass, field
 from typing import Dict, Optional
 
+import LoaderPath  # noqa: F401
+from loader.Motion import CLIP_FIELDS, scan_json_fields
 
-@dataclass
+
+@dataclass(slots=True)
 class AnimationClipData:
     name: str
     startTime: float
@@ -21,13 +23,12 @@ class AnimationClipData:
 
 
 def load_animation_clip_data(in_path: str) -> Optional[AnimationClipData]:
-    with open(in_path) as f:
-        data = json.load(f)
-        return AnimationClipData(
-            name=data['name'],
-            startTime=data['m_MuscleClip']['m_StartTime'],
-            stopTime=data['m_MuscleClip']['m_StopTime']
-        )
+    fields = scan_json_fields(in_path, CLIP_FIELDS)
+    return AnimationClipData(
+        name=fields[('name',)],
+        startTime=fields[('m_MuscleClip', 'm_StartTime')],
+        stopTime=fields[('m_MuscleClip', 'm_StopTime')]
+    )
 
 
 def get_animation_clip_data(in_dir: str) -> Dict[str, AnimationClipData]:
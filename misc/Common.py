@@ -13,9 +13,51 @@ def load_by_id(path: str) -> Dict[Any, Any]:
 
 
 class EnhancedJSONEncoder(json.JSONEncoder):
+    FIELD_NAMES: Dict[type, Tuple[str, ...]] = {}
+
+    def __init__(self, *args, compact: bool = False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.compact = compact
+        self.emitted: Dict[int, Dict[str, Any]] = {}
+        self.refs: Dict[int, int] = {}
+
+    @classmethod
+    def field_names(cls, o) -> Tuple[str, ...]:
+        o_type = type(o)
+        if o_type not in cls.FIELD_NAMES:
+            cls.FIELD_NAMES[o_type] = tuple(f.name for f in dataclasses.fields(o_type))
+        return cls.FIELD_NAMES[o_type]
+
+    def reference(self, o) -> Dict[str, Any]:
+        if id(o) not in self.refs:
+            first = self.emitted[id(o)]
+            fields = first.copy()
+            first.clear()
+            self.refs[id(o)] = first['$id'] = len(self.refs)
+            first.update(fields)
+        return {'$ref': self.refs[id(o)]}
+
+    def walk(self, o):
+        if isinstance(o, dict):
+            return {k: self.walk(v) for k, v in o.items()}
+        if isinstance(o, (list, tuple)):
+            return [self.walk(v) for v in o]
+        if dataclasses.is_dataclass(o) and not isinstance(o, type):
+            if id(o) in self.emitted:
+                return self.reference(o) if self.compact else self.emitted[id(o)]
+            res = self.emitted[id(o)] = {}
+            res.update((name, self.walk(getattr(o, name))) for name in self.field_names(o))
+            return res
+        return o
+
+    def iterencode(self, o, _one_shot=False):
+        self.emitted = {}
+        self.refs = {}
+        return super().iterencode(self.walk(o), _one_shot)
+
     def default(self, o):
-        if dataclasses.is_dataclass(o):
-            return dataclasses.asdict(o)
+        if dataclasses.is_dataclass(o) and not isinstance(o, type):
+            return self.walk(o)
         return super().default(o)
 
 
@@ -24,9 +66,9 @@ def get_valid_filename(s):
     return re.sub(r'(?u)[^-\w.]', '', s)
 
 
-def run_common(out_dir: str, output: List[Tuple[str, Any]]) -> None:
+def run_common(out_dir: str, output: List[Tuple[str, Any]], compact: bool = False) -> None:
     for o in output:
         out_path = os.path.join(out_dir, f"{get_valid_filename(o[0])}.json")
         check_target_path(out_path)
         with open(out_path, 'w+', encoding='utf8') as f:
-            json.dump(o[1], f, indent=2, cls=EnhancedJSONEncoder)
+            json.dump(o[1], f, indent=2, cls=EnhancedJSONEncoder, compact=compact)
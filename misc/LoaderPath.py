@@ -0,0 +1,8 @@
+import os
+import sys
+
+# misc scripts run from this directory, the repository root is added after it so they can
+# import the loader package without its scripts shadowing the ones here
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
@@ -3,7 +3,7 @@ import os
 from dataclasses import dataclass
 from typing import Dict, List, Any, Optional
 
-from Actions import Action, get_action_and_associated
+from Action import Action, get_action_and_associated
 from Skills import Skill
 from UniqueCombo import UniqueCombo
 
@@ -0,0 +1,131 @@
+import os
+import pickle
+import re
+from typing import Dict, Any, Callable, Optional, Tuple, Mapping
+
+from Abilities import AbilityData, get_ability_data
+from Action import ActionStore, HitAttributes, PlayerActionMetadata, get_actions, get_action_metadata, \
+    get_hit_attribute_data
+from ActionConditions import ActionConditionData, get_action_condition_data
+from CharacterMotion import AnimationClipData, get_animation_clip_data_by_id
+from Mode import Mode, get_modes
+from Skills import Skill, get_skills
+from TextLabel import get_text_label
+from UniqueCombo import UniqueCombo, get_unique_combos
+
+SNAPSHOT_VERSION = 2
+SOURCE_FILES = [
+    'TextLabel.json',
+    'PlayerAction.json',
+    'PlayerActionHitAttribute.json',
+    'ActionCondition.json',
+    'AbilityData.json',
+    'SkillData.json',
+    'CharaData.json',
+    'CharaUniqueCombo.json',
+    'CharaModeData.json',
+]
+ACTION_FILE_PATTERN = re.compile(r'PlayerAction_[0-9]+\.json')
+
+
+def tree_stat(path: str, pattern: Optional[re.Pattern] = None) -> Optional[Tuple[int, int, int]]:
+    # count, newest mtime and total size of the files under path, enough to notice an edit, add or removal
+    if not os.path.isdir(path):
+        return None
+    count, newest, size = 0, 0, 0
+    for root, _, files in os.walk(path):
+        for file_name in files:
+            if pattern is not None and not pattern.match(file_name):
+                continue
+            st = os.stat(os.path.join(root, file_name))
+            count += 1
+            newest = max(newest, st.st_mtime_ns)
+            size += st.st_size
+    return count, newest, size
+
+
+class Session:
+    def __init__(self, in_dir: str, motion_dir: Optional[str] = None):
+        self.in_dir = in_dir
+        self.motion_dir = motion_dir or os.path.join(in_dir, 'characters_motion')
+        self.cache: Dict[str, Any] = {}
+
+    def _memo(self, key: str, load: Callable[[], Any]) -> Any:
+        if key not in self.cache:
+            self.cache[key] = load()
+        return self.cache[key]
+
+    def get_text_label(self) -> Mapping[str, str]:
+        return self._memo('text_label', lambda: get_text_label(self.in_dir))
+
+    def get_action_metadata(self) -> Dict[int, PlayerActionMetadata]:
+        return self._memo('action_metadata', lambda: get_action_metadata(self.in_dir))
+
+    def get_hit_attribute_data(self) -> HitAttributes:
+        return self._memo('hit_attributes', lambda: get_hit_attribute_data(self.in_dir))
+
+    def get_action_condition_data(self) -> Dict[int, ActionConditionData]:
+        return self._memo('action_conditions',
+                          lambda: get_action_condition_data(self.in_dir, self.get_text_label()))
+
+    def get_ability_data(self) -> Dict[int, AbilityData]:
+        return self._memo('abilities', lambda: get_ability_data(self.in_dir, self.get_text_label()))
+
+    def get_actions(self) -> ActionStore:
+        return self._memo('actions', lambda: get_actions(self.in_dir, self.get_text_label(),
+                                                         self.get_action_metadata(),
+                                                         hit_attrs=self.get_hit_attribute_data(),
+                                                         action_conditions=self.get_action_condition_data()))
+
+    def get_skills(self) -> Dict[int, Skill]:
+        return self._memo('skills', lambda: get_skills(self.in_dir, self.get_text_label(), self.get_actions(),
+                                                       self.get_ability_data()))
+
+    def get_unique_combos(self) -> Dict[int, UniqueCombo]:
+        return self._memo('unique_combos', lambda: get_unique_combos(self.in_dir, self.get_actions()))
+
+    def get_modes(self) -> Dict[int, Mode]:
+        return self._memo('modes', lambda: get_modes(self.in_dir, self.get_actions(), self.get_skills(),
+                                                     self.get_unique_combos()))
+
+    def get_animation_clips(self) -> Dict[Optional[int], Dict[str, AnimationClipData]]:
+        return self._memo('animation_clips', lambda: get_animation_clip_data_by_id(self.motion_dir))
+
+    def fingerprint(self) -> Dict[str, Optional[Tuple[int, ...]]]:
+        stats: Dict[str, Optional[Tuple[int, ...]]] = {}
+        for file_name in SOURCE_FILES:
+            try:
+                st = os.stat(os.path.join(self.in_dir, file_name))
+                stats[file_name] = (st.st_mtime_ns, st.st_size)
+            except FileNotFoundError:
+                stats[file_name] = None
+        # the cached actions and animation clips are parsed from these
+        stats['actions'] = tree_stat(self.in_dir, ACTION_FILE_PATTERN)
+        stats['motion'] = tree_stat(self.motion_dir)
+        return stats
+
+    def save_snapshot(self, path: str) -> None:
+        snapshot_dir = os.path.dirname(path)
+        if snapshot_dir:
+            os.makedirs(snapshot_dir, exist_ok=True)
+        with open(path, 'wb') as f:
+            pickle.dump((SNAPSHOT_VERSION, self.fingerprint(), self.cache), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def load_snapshot(self, path: str) -> bool:
+        try:
+            with open(path, 'rb') as f:
+                version, fingerprint, cache = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, ValueError):
+            return False
+        if version != SNAPSHOT_VERSION or fingerprint != self.fingerprint():
+            print(f'Ignore stale snapshot {path}')
+            return False
+        self.cache.update(cache)
+        return True
+
+    @classmethod
+    def open(cls, in_dir: str, snapshot: Optional[str] = None, motion_dir: Optional[str] = None) -> 'Session':
+        session = cls(in_dir, motion_dir=motion_dir)
+        if snapshot and os.path.exists(snapshot):
+            session.load_snapshot(snapshot)
+        return session
@@ -2,11 +2,12 @@ import argparse
 import json
 import os
 from dataclasses import dataclass
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, Union, Mapping
 
 from Abilities import AbilityData, get_ability_and_references
-from Actions import Action, get_text_label, get_action_and_associated
+from Action import Action, get_action_and_associated
 from Common import run_common
+from TextLabel import get_text_label
 
 
 @dataclass
@@ -45,7 +46,7 @@ class Skill:
         return (self.id, self.name).__hash__()
 
 
-def get_skill_data(in_dir: str, label: Dict[str, str]) -> Dict[int, SkillData]:
+def get_skill_data(in_dir: str, label: Mapping[str, str]) -> Dict[int, SkillData]:
     with open(os.path.join(in_dir, 'SkillData.json')) as f:
         data: List[Dict[str, Any]] = json.load(f)
         skills = {}
@@ -98,7 +99,7 @@ def gather_skills(skill_data: Dict[int, SkillData], actions: Dict[int, Action],
     return {i: gather_skill(s, actions, abilities) for i, s in skill_data.items()}
 
 
-def get_skills(in_dir: str, label: Dict[str, str], actions: Dict[int, Action], abilities: Dict[int, AbilityData]) -> \
+def get_skills(in_dir: str, label: Mapping[str, str], actions: Dict[int, Action], abilities: Dict[int, AbilityData]) -> \
         Dict[int, Skill]:
     return gather_skills(get_skill_data(in_dir, label), actions, abilities)
 
@@ -1,12 +1,15 @@
 import argparse
 import json
 import os
-from typing import Dict
+from typing import Mapping
 
+import LoaderPath  # noqa: F401
+from loader.TextLabel import load_json_labels, read_json_labels
 
-def get_text_label(in_dir: str) -> Dict[str, str]:
-    with open(os.path.join(in_dir, 'TextLabel.json')) as f:
-        return {entry['_Id']: entry['_Text'] for entry in json.load(f)}
+
+def get_text_label(in_dir: str) -> Mapping[str, str]:
+    # a label store from loader/TextLabel.py, rebuilt when TextLabel.json is newer
+    return load_json_labels(os.path.join(in_dir, 'TextLabel.json'))
 
 
 if __name__ == '__main__':
@@ -15,4 +18,4 @@ if __name__ == '__main__':
     parser.add_argument('-o', type=str, help='output file', default='./out/TextLabel.json')
     args = parser.parse_args()
     with open(args.o, 'w+', encoding='utf8') as f:
-        json.dump(get_text_label(args.i), f, indent=2)
+        json.dump(dict(read_json_labels(os.path.join(args.i, 'TextLabel.json'))), f, indent=2)